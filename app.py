@@ -13,6 +13,11 @@ import tempfile
 import hashlib
 import hmac
 import base64
+import threading
+import bisect
+import sqlite3
+import shutil
+import mmap
 import html
 import json
 import datetime
@@ -20,6 +25,8 @@ import pytz
 import pandas as pd
 import re
 from urllib.parse import urlparse, parse_qs
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 import plotly.graph_objects as go
 import plotly.express as px
@@ -326,9 +333,143 @@ def _clear_query_params() -> None:
     except Exception:
         st.experimental_set_query_params()
 
+# ------------------------------------------
+# Gemini 모델 카탈로그 캐시 (API 키별)
+#   - list_models는 키별로 TTL 동안 1회만 호출하고, 만료 후에는 기존 값을 쓰면서 백그라운드로 갱신합니다.
+#   - 업무별 우선 모델은 카탈로그 버전마다 한 번만 계산합니다.
+# ------------------------------------------
+GEMINI_MODEL_PREFERENCES = {
+    "legal": ["gemini-2.5-pro", "gemini-2.0-flash", "gemini-1.5-pro", "gemini-1.5-flash"],
+    "report": ["gemini-2.5-pro", "gemini-2.0-flash", "gemini-1.5-pro", "gemini-1.5-flash"],
+    "summary": ["gemini-2.5-flash", "gemini-2.0-flash", "gemini-1.5-flash", "gemini-1.5-pro"],
+    "chat": ["gemini-2.5-flash", "gemini-2.0-flash", "gemini-1.5-flash", "gemini-1.5-pro"],
+    "balanced": ["gemini-2.5-flash", "gemini-2.5-pro", "gemini-2.0-flash", "gemini-1.5-pro", "gemini-1.5-flash"],
+}
+GEMINI_MODEL_CATALOG_TTL_SECONDS = 30 * 60
+GEMINI_MODEL_CATALOG_MAX_AGE_SECONDS = 24 * 60 * 60
+
+
+@st.cache_resource
+def _gemini_model_catalog_store() -> dict:
+    """프로세스 전체에서 공유하는 API 키별 모델 카탈로그입니다. 키는 해시로만 보관합니다."""
+    return {"lock": threading.RLock(), "entries": {}}
+
+
+def _gemini_key_fingerprint(api_key: str) -> str:
+    return hashlib.sha256(str(api_key or "").encode("utf-8")).hexdigest()[:24]
+
+
+def _fetch_gemini_generation_models(api_key: str, allow_configured_key: bool = True) -> list[str]:
+    """generateContent를 지원하는 모델 목록을 조회합니다. 키가 잘못되면 예외를 그대로 올립니다.
+
+    조회는 키별 전용 클라이언트로 합니다. 전용 클라이언트를 만들 수 없는 SDK 버전에서는 호출한 세션이
+    이미 genai.configure로 설정해 둔 키로만 조회하고(allow_configured_key=True), 전역 키는 바꾸지 않습니다.
+    genai.configure는 프로세스 전역이라 다른 세션이 쓰는 키를 바꿔 버리기 때문입니다.
+    """
+    try:
+        from google.ai import generativelanguage as glm
+        model_client = glm.ModelServiceClient(client_options={"api_key": api_key})
+        models = list(genai.list_models(client=model_client))
+    except (ImportError, TypeError):
+        if not allow_configured_key:
+            raise RuntimeError("이 SDK 버전은 키별 모델 조회를 지원하지 않아 백그라운드 갱신을 건너뜁니다.")
+        models = list(genai.list_models())
+    return [
+        str(m.name or "").replace("models/", "").strip()
+        for m in models
+        if "generateContent" in getattr(m, "supported_generation_methods", [])
+    ]
+
+
+def _resolve_model_preferences(available_models: list[str]) -> dict[str, str]:
+    """카탈로그 1개 버전에 대해 업무별 선택 모델을 미리 계산합니다."""
+    resolved = {}
+    for task, preferred in GEMINI_MODEL_PREFERENCES.items():
+        choice = ""
+        for target in preferred:
+            choice = next((name for name in available_models if target in name), "")
+            if choice:
+                break
+        resolved[task] = choice or (available_models[0] if available_models else preferred[-1])
+    return resolved
+
+
+def _store_gemini_model_catalog(api_key: str, available_models: list[str]) -> dict:
+    store = _gemini_model_catalog_store()
+    fingerprint = _gemini_key_fingerprint(api_key)
+    with store["lock"]:
+        previous = store["entries"].get(fingerprint, {})
+        entry = {
+            "models": list(available_models),
+            "resolved": _resolve_model_preferences(available_models),
+            "fetched_at": time.time(),
+            "version": int(previous.get("version", 0) or 0) + 1,
+            "refreshing": False,
+        }
+        store["entries"][fingerprint] = entry
+        return entry
+
+
+def _refresh_gemini_model_catalog_async(api_key: str) -> None:
+    store = _gemini_model_catalog_store()
+    fingerprint = _gemini_key_fingerprint(api_key)
+    with store["lock"]:
+        entry = store["entries"].get(fingerprint)
+        if not entry or entry.get("refreshing"):
+            return
+        entry["refreshing"] = True
+
+    def _worker():
+        try:
+            # 백그라운드 스레드는 세션의 전역 키 설정과 무관하므로 키별 전용 클라이언트로만 갱신합니다.
+            _store_gemini_model_catalog(api_key, _fetch_gemini_generation_models(api_key, allow_configured_key=False))
+        except Exception:
+            with store["lock"]:
+                current = store["entries"].get(fingerprint)
+                if current is not None:
+                    current["refreshing"] = False
+
+    threading.Thread(target=_worker, name="gemini-model-catalog-refresh", daemon=True).start()
+
+
+def get_gemini_model_catalog(api_key: str, force_refresh: bool = False) -> dict:
+    """API 키의 모델 카탈로그를 반환합니다.
+
+    TTL 이내면 네트워크 없이 반환하고, TTL이 지났지만 하루 이내면 기존 값을 반환하면서
+    백그라운드로 갱신합니다. 캐시가 없거나 너무 오래되면 동기 조회하며 실패 시 예외를 올립니다.
+    """
+    store = _gemini_model_catalog_store()
+    with store["lock"]:
+        entry = store["entries"].get(_gemini_key_fingerprint(api_key))
+    age = time.time() - float(entry.get("fetched_at", 0) or 0) if entry else None
+    if entry and not force_refresh and age <= GEMINI_MODEL_CATALOG_MAX_AGE_SECONDS:
+        if age > GEMINI_MODEL_CATALOG_TTL_SECONDS:
+            _refresh_gemini_model_catalog_async(api_key)
+        return entry
+    # 동기 조회는 로그인 검증(_validate_and_store_key)이나 get_model처럼 이 키를 이미 configure한 세션에서만 일어납니다.
+    return _store_gemini_model_catalog(api_key, _fetch_gemini_generation_models(api_key))
+
+
+def resolve_gemini_model(task: str = "balanced", api_key: str | None = None) -> str:
+    """업무(legal/report/summary/chat/balanced)별 모델명을 카탈로그 캐시에서 결정합니다."""
+    task = (task or "balanced").lower()
+    if task not in GEMINI_MODEL_PREFERENCES:
+        task = "balanced"
+    if api_key is None:
+        api_key = st.session_state.get("api_key", "")
+    if api_key:
+        try:
+            return get_gemini_model_catalog(api_key)["resolved"][task]
+        except Exception:
+            # 카탈로그 조회 실패 시에도 아래 기본값으로 시도합니다.
+            pass
+    return GEMINI_MODEL_PREFERENCES[task][-1]
+
+
 def _validate_and_store_key(clean_key: str) -> None:
     genai.configure(api_key=clean_key)
-    list(genai.list_models())
+    # 같은 키를 최근에 검증했다면 세션 복구/재로그인 시 list_models를 다시 호출하지 않습니다.
+    get_gemini_model_catalog(clean_key)
     st.session_state["api_key"] = clean_key
     st.session_state["login_error"] = None
     _set_query_param_key(clean_key)
@@ -437,6 +578,118 @@ def init_google_sheet_connection():
     except Exception:
         return None
 
+
+# ------------------------------------------
+# 8-0. 스프레드시트/워크시트 핸들 캐시
+#      - client.open / spreadsheet.worksheet 메타데이터 조회를 프로세스당 1회로 줄입니다.
+#      - 404(삭제·이름변경) 또는 범위 해석 실패 시 해당 핸들만 폐기하고 다음 호출에서 다시 찾습니다.
+# ------------------------------------------
+@st.cache_resource
+def _sheet_handle_registry() -> dict:
+    """모든 세션이 공유하는 스프레드시트/워크시트 핸들 저장소입니다."""
+    return {
+        "lock": threading.RLock(),
+        "client_id": None,
+        "spreadsheets": {},
+        "worksheets": {},
+    }
+
+
+def _sheet_registry_for_client(client) -> dict:
+    """클라이언트가 새로 만들어졌으면 이전 클라이언트에 묶인 핸들을 모두 버립니다."""
+    registry = _sheet_handle_registry()
+    with registry["lock"]:
+        if registry["client_id"] != id(client):
+            registry["spreadsheets"].clear()
+            registry["worksheets"].clear()
+            registry["client_id"] = id(client)
+    return registry
+
+
+def _open_spreadsheet_cached(client, spreadsheet_name: str):
+    """client.open() 결과를 이름별로 재사용합니다."""
+    registry = _sheet_registry_for_client(client)
+    with registry["lock"]:
+        spreadsheet = registry["spreadsheets"].get(spreadsheet_name)
+        if spreadsheet is not None:
+            return spreadsheet
+        spreadsheet = client.open(spreadsheet_name)
+        registry["spreadsheets"][spreadsheet_name] = spreadsheet
+        # 한 번의 메타데이터 조회로 모든 워크시트 핸들을 미리 등록합니다.
+        try:
+            for worksheet in spreadsheet.worksheets():
+                registry["worksheets"][(spreadsheet.id, worksheet.title)] = worksheet
+        except Exception:
+            pass
+        return spreadsheet
+
+
+def _get_worksheet_cached(spreadsheet, title: str):
+    """spreadsheet.worksheet(title)을 캐시합니다. 없으면 기존과 같이 예외를 그대로 올립니다."""
+    registry = _sheet_handle_registry()
+    key = (getattr(spreadsheet, "id", id(spreadsheet)), title)
+    with registry["lock"]:
+        worksheet = registry["worksheets"].get(key)
+        if worksheet is not None:
+            return worksheet
+    # 없는 시트는 캐시하지 않아 다른 세션이 만든 시트도 다음 호출에서 바로 찾습니다.
+    worksheet = spreadsheet.worksheet(title)
+    with registry["lock"]:
+        registry["worksheets"][key] = worksheet
+    return worksheet
+
+
+def _remember_worksheet_handle(spreadsheet, worksheet):
+    """add_worksheet로 새로 만든 시트를 즉시 캐시에 등록합니다."""
+    registry = _sheet_handle_registry()
+    with registry["lock"]:
+        registry["worksheets"][(getattr(spreadsheet, "id", id(spreadsheet)), worksheet.title)] = worksheet
+    return worksheet
+
+
+def _invalidate_sheet_handles(spreadsheet_name: str | None = None, worksheet_title: str | None = None) -> None:
+    """지정한 핸들(또는 전체)을 폐기합니다. 시트 구조가 바뀐 뒤 호출합니다."""
+    registry = _sheet_handle_registry()
+    with registry["lock"]:
+        if spreadsheet_name is None and worksheet_title is None:
+            registry["spreadsheets"].clear()
+            registry["worksheets"].clear()
+            return
+        if worksheet_title is not None:
+            for key in [key for key in registry["worksheets"] if key[1] == worksheet_title]:
+                registry["worksheets"].pop(key, None)
+        if spreadsheet_name is not None and worksheet_title is None:
+            spreadsheet = registry["spreadsheets"].pop(spreadsheet_name, None)
+            if spreadsheet is not None:
+                spreadsheet_id = getattr(spreadsheet, "id", id(spreadsheet))
+                for key in [key for key in registry["worksheets"] if key[0] == spreadsheet_id]:
+                    registry["worksheets"].pop(key, None)
+
+
+def _is_stale_sheet_handle_error(error) -> bool:
+    """캐시된 핸들이 더 이상 유효하지 않다는 뜻의 오류인지 판별합니다."""
+    if gspread is not None:
+        if isinstance(error, (gspread.exceptions.WorksheetNotFound, gspread.exceptions.SpreadsheetNotFound)):
+            return True
+        if isinstance(error, gspread.exceptions.APIError):
+            status = getattr(getattr(error, "response", None), "status_code", None)
+            if status == 404:
+                return True
+        return False
+    # gspread를 쓸 수 없는 환경에서는 API 오류 본문의 상태 문구로만 판별합니다. 임의의 "404" 문자열은 보지 않습니다.
+    text = str(error)
+    return any(token in text for token in ("Requested entity was not found", "'status': 'NOT_FOUND'"))
+
+
+def _forget_stale_sheet_handles(error, spreadsheet_name: str | None = None, worksheet_title: str | None = None) -> None:
+    """오류가 핸들 만료 때문이면 관련 캐시를 비워 다음 요청이 다시 조회하도록 합니다."""
+    if _is_stale_sheet_handle_error(error):
+        if worksheet_title is not None:
+            _invalidate_sheet_handles(worksheet_title=worksheet_title)
+        else:
+            _invalidate_sheet_handles(spreadsheet_name=spreadsheet_name)
+
+
 def _korea_now():
     try:
         kst = pytz.timezone("Asia/Seoul")
@@ -449,10 +702,10 @@ def _campaign_key(dt: datetime.datetime) -> str:
 
 def _ensure_campaign_config_sheet(spreadsheet):
     try:
-        ws = spreadsheet.worksheet("Campaign_Config")
+        ws = _get_worksheet_cached(spreadsheet, "Campaign_Config")
         return ws
     except Exception:
-        ws = spreadsheet.add_worksheet(title="Campaign_Config", rows=200, cols=10)
+        ws = _remember_worksheet_handle(spreadsheet, spreadsheet.add_worksheet(title="Campaign_Config", rows=200, cols=10))
         ws.append_row(["campaign_key", "title", "sheet_name", "start_date"])
         return ws
 
@@ -464,7 +717,7 @@ def _default_campaign_title(dt: datetime.datetime) -> str:
 def _default_campaign_sheet_name(dt: datetime.datetime, spreadsheet=None) -> str:
     if spreadsheet is not None and dt.year == 2026 and dt.month == 1:
         try:
-            spreadsheet.worksheet("2026_윤리경영_실천서약")
+            _get_worksheet_cached(spreadsheet, "2026_윤리경영_실천서약")
             return "2026_윤리경영_실천서약"
         except Exception:
             pass
@@ -509,45 +762,648 @@ def set_current_campaign_info(spreadsheet, title: str | None = None, sheet_name:
     cfg_ws.update(f"B{row_idx}:D{row_idx}", [[new_title, new_sheet, new_start]])
     return {"key": key, "title": new_title, "sheet_name": new_sheet, "start_date": new_start}
 
+# ------------------------------------------
+# 8-0-1. 공용 HTTP 클라이언트
+#        - Apps Script·Drive 요청은 프로세스 공용 Session 하나를 사용해 호스트별 연결을 재사용합니다.
+#        - 사용자가 입력한 외부 URL 수집은 쿠키를 저장하지 않는 별도 Session을 써서 사용자 간 쿠키가 섞이지 않게 합니다.
+#        - 서버가 보낸 Retry-After는 HTTP_RETRY_AFTER_MAX_SECONDS까지만 따릅니다.
+#        - 연결 실패와 GET의 429/5xx만 자동 재시도합니다(업로드 POST는 중복 저장 위험으로 재전송하지 않음).
+#        - 엔드포인트별 호출 수·오류 수·지연시간을 모아 관리자 화면에 표시합니다.
+# ------------------------------------------
+HTTP_DEFAULT_TIMEOUT = (6, 30)
+HTTP_POOL_MAXSIZE = 16
+HTTP_LATENCY_WINDOW = 50
+HTTP_RETRY_AFTER_MAX_SECONDS = 10.0
+
+
+@st.cache_resource
+def _http_client_state() -> dict:
+    from http.cookiejar import DefaultCookiePolicy
+    from urllib3.util.retry import Retry
+
+    class _CappedRetry(Retry):
+        def get_retry_after(self, response):
+            retry_after = super().get_retry_after(response)
+            if retry_after is None:
+                return None
+            return min(max(0.0, retry_after), HTTP_RETRY_AFTER_MAX_SECONDS)
+
+    retry = _CappedRetry(
+        total=3,
+        connect=2,
+        read=0,
+        status=2,
+        backoff_factor=0.6,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset({"GET", "HEAD"}),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = requests.adapters.HTTPAdapter(pool_connections=8, pool_maxsize=HTTP_POOL_MAXSIZE, max_retries=retry)
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+
+    web_adapter = requests.adapters.HTTPAdapter(pool_connections=8, pool_maxsize=HTTP_POOL_MAXSIZE, max_retries=retry)
+    web_session = requests.Session()
+    web_session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+    web_session.mount("https://", web_adapter)
+    web_session.mount("http://", web_adapter)
+    return {"session": session, "web_session": web_session, "lock": threading.Lock(), "stats": {}}
+
+
+def _http_record_latency(endpoint: str, elapsed_ms: float, ok: bool) -> None:
+    state = _http_client_state()
+    with state["lock"]:
+        stats = state["stats"].setdefault(
+            endpoint,
+            {"calls": 0, "errors": 0, "total_ms": 0.0, "max_ms": 0.0, "last_ms": 0.0, "recent": []},
+        )
+        stats["calls"] += 1
+        stats["errors"] += 0 if ok else 1
+        stats["total_ms"] += elapsed_ms
+        stats["max_ms"] = max(stats["max_ms"], elapsed_ms)
+        stats["last_ms"] = elapsed_ms
+        stats["recent"].append(elapsed_ms)
+        if len(stats["recent"]) > HTTP_LATENCY_WINDOW:
+            del stats["recent"][0]
+
+
+def http_request(method: str, url: str, endpoint: str, cookieless: bool = False, **kwargs):
+    """공용 Session으로 요청하고 endpoint 이름으로 지연시간을 기록합니다. 예외는 그대로 올립니다.
+
+    cookieless=True면 쿠키를 저장·전송하지 않는 웹 수집용 Session을 씁니다.
+    """
+    kwargs.setdefault("timeout", HTTP_DEFAULT_TIMEOUT)
+    started = time.perf_counter()
+    ok = False
+    try:
+        session = _http_client_state()["web_session" if cookieless else "session"]
+        response = session.request(method, url, **kwargs)
+        ok = response.status_code < 500
+        return response
+    finally:
+        _http_record_latency(endpoint, (time.perf_counter() - started) * 1000.0, ok)
+
+
+def http_latency_snapshot() -> list[dict]:
+    """엔드포인트별 호출 통계(최근 구간 p50/p95 포함)를 표 형태로 반환합니다."""
+    state = _http_client_state()
+    rows = []
+    with state["lock"]:
+        items = [(endpoint, dict(stats, recent=list(stats["recent"]))) for endpoint, stats in state["stats"].items()]
+    for endpoint, stats in sorted(items):
+        recent = sorted(stats["recent"])
+        calls = max(1, stats["calls"])
+        rows.append({
+            "엔드포인트": endpoint,
+            "호출수": stats["calls"],
+            "오류수": stats["errors"],
+            "평균(ms)": round(stats["total_ms"] / calls, 1),
+            "최근 p50(ms)": round(recent[len(recent) // 2], 1) if recent else 0.0,
+            "최근 p95(ms)": round(recent[min(len(recent) - 1, int(len(recent) * 0.95))], 1) if recent else 0.0,
+            "최대(ms)": round(stats["max_ms"], 1),
+            "직전(ms)": round(stats["last_ms"], 1),
+        })
+    return rows
+
+
+# ------------------------------------------
+# 8-0-2. 앱 전용 임시 디렉터리
+#        - 저널·AI 답변 캐시·사진 캐시/대기함은 공용 임시폴더 아래 smart_work_agent/에 둡니다.
+#        - 같은 서버의 다른 계정이 읽지 못하도록 모든 하위 디렉터리를 소유자 전용(0o700)으로 만듭니다.
+# ------------------------------------------
+APP_TEMP_ROOT = os.path.join(tempfile.gettempdir(), "smart_work_agent")
+
+
+def _ensure_private_dir(path: str) -> str:
+    """APP_TEMP_ROOT부터 path까지 디렉터리를 0o700으로 만들고(이미 있으면 권한을 좁힘) path를 반환합니다."""
+    relative = os.path.relpath(path, APP_TEMP_ROOT)
+    targets = [APP_TEMP_ROOT]
+    if relative.startswith(".."):
+        targets = [path]
+    elif relative != ".":
+        for part in relative.split(os.sep):
+            targets.append(os.path.join(targets[-1], part))
+    for target in targets:
+        os.makedirs(target, mode=0o700, exist_ok=True)
+        try:
+            os.chmod(target, 0o700)
+        except OSError:
+            pass
+    return path
+
+
+# ------------------------------------------
+# 8-1. 제출 대기열 (write-behind)
+#      - 서약/교육 제출은 로컬 SQLite 저널에 먼저 기록하고 즉시 완료로 응답합니다.
+#      - 백그라운드 전송기가 시트별로 모아 append_rows 1회로 반영하며, 분당 쓰기·읽기 예산을 따로 지킵니다.
+#      - (문서, 시트, 멱등키) 기본키로 같은 제출이 두 번 쌓이지 않고, 결과가 불확실했던 묶음은
+#        전송 전에 시트의 식별 컬럼을 확인해 이미 반영된 행을 건너뜁니다.
+# ------------------------------------------
+WRITE_BEHIND_DB_PATH = os.path.join(APP_TEMP_ROOT, "write_behind.sqlite3")
+WRITE_BEHIND_BATCH_SIZE = 200
+WRITE_BEHIND_WRITES_PER_MINUTE = 40
+WRITE_BEHIND_READS_PER_MINUTE = 40
+WRITE_BEHIND_IDLE_SECONDS = 2.0
+WRITE_BEHIND_INFLIGHT_TIMEOUT_SECONDS = 300
+WRITE_BEHIND_MAX_BACKOFF_SECONDS = 60.0
+# 저널 테이블 구조가 바뀌면 1씩 올리고 _write_behind_migrate에서 기존 행을 옮깁니다.
+# v1: 기본키 (sheet_name, idem_key) → v2: 다른 문서의 같은 이름 시트와 섞이지 않도록 (spreadsheet, sheet_name, idem_key)
+WRITE_BEHIND_SCHEMA_VERSION = 2
+WRITE_BEHIND_COLUMNS = (
+    "spreadsheet", "sheet_name", "idem_key", "headers_json", "row_json", "dedupe_json",
+    "status", "uncertain", "attempts", "last_error", "created_at", "claimed_at",
+)
+
+
+class _WriteBehindQuotaError(Exception):
+    """Google Sheets 쓰기 한도(429)로 전송을 잠시 미뤄야 할 때 사용합니다."""
+
+
+def _is_sheet_quota_error(error) -> bool:
+    error_text = str(error)
+    return any(token in error_text for token in ("429", "Quota exceeded", "RESOURCE_EXHAUSTED"))
+
+
+def _write_behind_connect():
+    _ensure_private_dir(os.path.dirname(WRITE_BEHIND_DB_PATH))
+    conn = sqlite3.connect(WRITE_BEHIND_DB_PATH, timeout=15, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    if conn.execute("PRAGMA user_version").fetchone()[0] < WRITE_BEHIND_SCHEMA_VERSION:
+        try:
+            _write_behind_migrate(conn)
+        except Exception:
+            conn.close()
+            raise
+    return conn
+
+
+def _write_behind_create_table(conn) -> None:
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS pending_rows (
+            spreadsheet TEXT NOT NULL,
+            sheet_name TEXT NOT NULL,
+            idem_key TEXT NOT NULL,
+            headers_json TEXT NOT NULL,
+            row_json TEXT NOT NULL,
+            dedupe_json TEXT NOT NULL,
+            status TEXT NOT NULL DEFAULT 'pending',
+            uncertain INTEGER NOT NULL DEFAULT 0,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            last_error TEXT NOT NULL DEFAULT '',
+            created_at REAL NOT NULL,
+            claimed_at REAL NOT NULL DEFAULT 0,
+            PRIMARY KEY (spreadsheet, sheet_name, idem_key)
+        )
+        """
+    )
+
+
+def _write_behind_migrate(conn) -> None:
+    """이전 버전 저널을 현재 구조로 옮깁니다. 여러 프로세스가 동시에 열어도 한 번만 옮기도록 쓰기 잠금 안에서 다시 확인합니다."""
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        if conn.execute("PRAGMA user_version").fetchone()[0] < WRITE_BEHIND_SCHEMA_VERSION:
+            legacy = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'pending_rows'"
+            ).fetchone()
+            if legacy:
+                conn.execute("ALTER TABLE pending_rows RENAME TO pending_rows_legacy")
+            _write_behind_create_table(conn)
+            if legacy:
+                columns = ", ".join(WRITE_BEHIND_COLUMNS)
+                conn.execute(f"INSERT OR IGNORE INTO pending_rows ({columns}) SELECT {columns} FROM pending_rows_legacy")
+                conn.execute("DROP TABLE pending_rows_legacy")
+            conn.execute(f"PRAGMA user_version = {WRITE_BEHIND_SCHEMA_VERSION}")
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+
+
+def enqueue_sheet_append(spreadsheet_name: str, sheet_name: str, headers: list, row_map: dict, idem_key: str, dedupe_headers: list) -> bool:
+    """행 1건을 대기열에 기록합니다. 같은 멱등키가 이미 있으면 False를 반환합니다.
+
+    디스크 오류 등으로 기록하지 못하면 예외를 그대로 올려 호출부가 동기 저장으로 전환하게 합니다.
+    """
+    conn = _write_behind_connect()
+    try:
+        cursor = conn.execute(
+            "INSERT OR IGNORE INTO pending_rows (spreadsheet, sheet_name, idem_key, headers_json, row_json, dedupe_json, created_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (
+                spreadsheet_name,
+                sheet_name,
+                str(idem_key),
+                json.dumps(list(headers), ensure_ascii=False),
+                json.dumps(row_map, ensure_ascii=False, default=str),
+                json.dumps(list(dedupe_headers), ensure_ascii=False),
+                time.time(),
+            ),
+        )
+        inserted = cursor.rowcount > 0
+    finally:
+        conn.close()
+    if inserted:
+        _write_behind_worker()["wake"].set()
+    return inserted
+
+
+def write_behind_queue_status() -> dict:
+    """관리자 화면용 대기열 요약(시트별 대기 건수, 마지막 오류)을 반환합니다."""
+    status = {"pending": {}, "retrying": 0, "last_error": "", "last_flush_at": ""}
+    worker = _write_behind_worker()
+    status["last_error"] = worker.get("last_error", "")
+    status["last_flush_at"] = worker.get("last_flush_at", "")
+    try:
+        conn = _write_behind_connect()
+    except Exception as error:
+        status["last_error"] = f"대기열 저장소를 열 수 없습니다: {error}"
+        return status
+    try:
+        for sheet_name, count in conn.execute("SELECT sheet_name, COUNT(*) FROM pending_rows GROUP BY sheet_name"):
+            status["pending"][sheet_name] = int(count)
+        status["retrying"] = int(conn.execute("SELECT COUNT(*) FROM pending_rows WHERE attempts > 0").fetchone()[0])
+    finally:
+        conn.close()
+    return status
+
+
+def _write_behind_take_budget(call_times: list, per_minute: int) -> None:
+    """최근 60초 호출 횟수가 예산을 넘으면 가장 오래된 호출이 창 밖으로 나갈 때까지 기다립니다."""
+    while True:
+        now = time.time()
+        while call_times and now - call_times[0] >= 60:
+            call_times.pop(0)
+        if len(call_times) < per_minute:
+            call_times.append(now)
+            return
+        time.sleep(max(0.5, 60 - (now - call_times[0])))
+
+
+def _write_behind_take_write_budget(worker: dict) -> None:
+    _write_behind_take_budget(worker["write_times"], WRITE_BEHIND_WRITES_PER_MINUTE)
+
+
+def _write_behind_take_read_budget(worker: dict) -> None:
+    """Sheets는 읽기와 쓰기 한도를 따로 세므로 헤더·식별 컬럼 조회는 읽기 예산에서 차감합니다."""
+    _write_behind_take_budget(worker["read_times"], WRITE_BEHIND_READS_PER_MINUTE)
+
+
+def _write_behind_open_worksheet(spreadsheet_name: str, sheet_name: str, headers: list):
+    client = init_google_sheet_connection()
+    if not client:
+        raise RuntimeError("구글 시트 연결 실패 (Secrets 확인)")
+    spreadsheet = _open_spreadsheet_cached(client, spreadsheet_name)
+    try:
+        return _get_worksheet_cached(spreadsheet, sheet_name)
+    except Exception:
+        ws = spreadsheet.add_worksheet(title=sheet_name, rows=3000, cols=max(len(headers) + 2, 10))
+        ws.append_row(list(headers))
+        return _remember_worksheet_handle(spreadsheet, ws)
+
+
+def _write_behind_existing_keys(ws, sheet_headers: list, dedupe_headers: list) -> set:
+    """식별 컬럼만 읽어 이미 시트에 있는 (값, ...) 조합을 모읍니다."""
+    ranges = []
+    for header in dedupe_headers:
+        if header not in sheet_headers:
+            return set()
+        letter = _column_letter(sheet_headers.index(header) + 1)
+        ranges.append(f"{letter}2:{letter}")
+    columns = ws.batch_get(ranges)
+    values = []
+    for column in columns:
+        values.append([str(cell[0]).strip() if cell else "" for cell in column])
+    length = max((len(column) for column in values), default=0)
+    keys = set()
+    for index in range(length):
+        keys.add(tuple(column[index] if index < len(column) else "" for column in values))
+    return keys
+
+
+def _write_behind_flush_once(worker: dict) -> bool:
+    """시트 1개 분량의 대기 행을 전송합니다. 전송할 행이 있었으면 True를 반환합니다."""
+    conn = _write_behind_connect()
+    try:
+        now = time.time()
+        # 같은 저널을 쓰는 다른 프로세스와 같은 행을 동시에 가져가지 않도록 조회와 선점을 한 쓰기 트랜잭션으로 묶습니다.
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                "UPDATE pending_rows SET status = 'pending', uncertain = 1 WHERE status = 'inflight' AND claimed_at < ?",
+                (now - WRITE_BEHIND_INFLIGHT_TIMEOUT_SECONDS,),
+            )
+            head = conn.execute(
+                "SELECT spreadsheet, sheet_name FROM pending_rows WHERE status = 'pending' ORDER BY created_at LIMIT 1"
+            ).fetchone()
+            if not head:
+                conn.execute("COMMIT")
+                return False
+            spreadsheet_name, sheet_name = head
+            claimed = conn.execute(
+                "SELECT idem_key, headers_json, row_json, dedupe_json, uncertain FROM pending_rows "
+                "WHERE status = 'pending' AND spreadsheet = ? AND sheet_name = ? ORDER BY created_at LIMIT ?",
+                (spreadsheet_name, sheet_name, WRITE_BEHIND_BATCH_SIZE),
+            ).fetchall()
+            keys = [item[0] for item in claimed]
+            conn.executemany(
+                "UPDATE pending_rows SET status = 'inflight', claimed_at = ? "
+                "WHERE spreadsheet = ? AND sheet_name = ? AND idem_key = ? AND status = 'pending'",
+                [(now, spreadsheet_name, sheet_name, key) for key in keys],
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+    finally:
+        conn.close()
+    claim_token = now
+
+    def _finish(sql: str, params: list) -> None:
+        finish_conn = _write_behind_connect()
+        try:
+            finish_conn.executemany(sql, params)
+        finally:
+            finish_conn.close()
+
+    try:
+        headers = json.loads(claimed[0][1])
+        ws = _write_behind_open_worksheet(spreadsheet_name, sheet_name, headers)
+        _write_behind_take_read_budget(worker)
+        current_headers = [str(h).strip() for h in ws.row_values(1)]
+        sheet_headers = list(current_headers) or list(headers)
+        for header in headers:
+            if header not in sheet_headers:
+                sheet_headers.append(header)
+        if current_headers and sheet_headers != current_headers:
+            # 새 열은 헤더 행에도 먼저 기록해야 다음 전송·조회가 같은 열 순서를 봅니다.
+            _ensure_worksheet_grid_capacity(ws, required_cols=len(sheet_headers))
+            _write_behind_take_write_budget(worker)
+            _sheet_patch_rows(ws, sheet_headers, {1: {header: header for header in sheet_headers[len(current_headers):]}})
+
+        already_present = set()
+        if any(item[4] for item in claimed):
+            dedupe_headers = json.loads(claimed[0][3])
+            _write_behind_take_read_budget(worker)
+            already_present = _write_behind_existing_keys(ws, sheet_headers, dedupe_headers)
+
+        values = []
+        skipped = []
+        for idem_key, _headers_json, row_json, dedupe_json, uncertain in claimed:
+            row_map = json.loads(row_json)
+            if uncertain and already_present:
+                dedupe_headers = json.loads(dedupe_json)
+                marker = tuple(str(row_map.get(header, "")).strip() for header in dedupe_headers)
+                if marker in already_present:
+                    skipped.append(idem_key)
+                    continue
+            values.append([row_map.get(header, "") for header in sheet_headers])
+
+        if values:
+            _write_behind_take_write_budget(worker)
+            ws.append_rows(values, value_input_option="USER_ENTERED")
+    except Exception as error:
+        _forget_stale_sheet_handles(error, spreadsheet_name=spreadsheet_name)
+        quota = _is_sheet_quota_error(error)
+        # 429는 반영되지 않은 것이 확실하므로 그대로 재시도하고, 그 밖의 오류(시간초과 등)는
+        # 일부 반영 가능성이 있으므로 다음 전송 전에 시트를 확인하도록 표시합니다.
+        _finish(
+            "UPDATE pending_rows SET status = 'pending', attempts = attempts + 1, last_error = ?, "
+            "uncertain = CASE WHEN ? THEN uncertain ELSE 1 END "
+            "WHERE spreadsheet = ? AND sheet_name = ? AND idem_key = ? AND status = 'inflight' AND claimed_at = ?",
+            [(str(error)[:500], 1 if quota else 0, spreadsheet_name, sheet_name, key, claim_token) for key in keys],
+        )
+        worker["last_error"] = str(error)
+        if quota:
+            raise _WriteBehindQuotaError(str(error)) from error
+        raise
+
+    _finish(
+        "DELETE FROM pending_rows WHERE spreadsheet = ? AND sheet_name = ? AND idem_key = ? AND status = 'inflight' AND claimed_at = ?",
+        [(spreadsheet_name, sheet_name, key, claim_token) for key in keys],
+    )
+    worker["last_error"] = ""
+    worker["last_flush_at"] = _korea_now().strftime("%Y-%m-%d %H:%M:%S")
+    return True
+
+
+def _write_behind_loop(worker: dict) -> None:
+    backoff = 0.0
+    while True:
+        worker["wake"].wait(timeout=backoff or WRITE_BEHIND_IDLE_SECONDS)
+        worker["wake"].clear()
+        try:
+            if _write_behind_flush_once(worker):
+                worker["wake"].set()
+            backoff = 0.0
+        except _WriteBehindQuotaError:
+            backoff = min(WRITE_BEHIND_MAX_BACKOFF_SECONDS, max(2.0, backoff * 2))
+        except Exception as error:
+            worker["last_error"] = str(error)
+            backoff = min(WRITE_BEHIND_MAX_BACKOFF_SECONDS, max(5.0, backoff * 2))
+
+
+@st.cache_resource
+def _write_behind_worker() -> dict:
+    """프로세스당 1개의 백그라운드 전송기를 띄웁니다. 재시작 시 남은 저널부터 이어서 전송합니다."""
+    worker = {"wake": threading.Event(), "write_times": [], "read_times": [], "last_error": "", "last_flush_at": ""}
+    thread = threading.Thread(target=_write_behind_loop, args=(worker,), name="sheet-write-behind", daemon=True)
+    thread.start()
+    worker["thread"] = thread
+    worker["wake"].set()
+    return worker
+
+
+def _append_row_with_quota_retry(sheet, row: list, attempts: int = 5):
+    """대기열을 쓸 수 없을 때의 동기 저장 경로입니다. 429는 점증 대기 후 재시도합니다."""
+    last_error = None
+    for attempt in range(attempts):
+        try:
+            return sheet.append_row(row, value_input_option="USER_ENTERED")
+        except Exception as append_error:
+            last_error = append_error
+            if _is_sheet_quota_error(append_error):
+                time.sleep(1.2 * (attempt + 1))
+                continue
+            raise
+    raise _WriteBehindQuotaError(str(last_error))
+
+
+# ------------------------------------------
+# 8-1-1. 서약 캠페인별 중복 참여 색인
+#        - 캠페인 시트의 사번/성명 두 컬럼만 1회 읽어 프로세스 공용 집합으로 보관합니다.
+#        - 이후에는 마지막으로 읽은 행 다음부터만(행 수 증분) 주기적으로 따라잡고,
+#          행 삭제로 시트가 줄어든 것이 보이면 색인을 다시 만듭니다.
+# ------------------------------------------
+AUDIT_DEDUPE_REFRESH_SECONDS = 30
+AUDIT_EXCEPTION_EMP_ID = "00000000"
+
+
+@st.cache_resource
+def _audit_dedupe_state() -> dict:
+    """캠페인 시트 이름별 중복 참여 색인 저장소입니다."""
+    return {"lock": threading.RLock(), "sheets": {}}
+
+
+def _audit_dedupe_add(entry: dict, emp_id, name) -> None:
+    emp_id_str = str(emp_id or "").strip()
+    if not emp_id_str:
+        return
+    if emp_id_str == AUDIT_EXCEPTION_EMP_ID:
+        entry["exception_names"].add(str(name or "").strip())
+    else:
+        entry["emp_ids"].add(emp_id_str)
+
+
+def _audit_dedupe_sync(sheet, sheet_name: str, force: bool = False) -> dict:
+    """색인을 시트의 마지막 행까지 따라잡게 합니다. 새로고침 주기 안에서는 API를 호출하지 않습니다.
+
+    시트 읽기는 잠금 밖에서 하고, 마지막으로 색인한 행을 1행 겹쳐 읽어 행 삭제로 시트가 줄었거나
+    행이 당겨졌으면 색인을 처음부터 다시 만듭니다(삭제된 참여 기록이 계속 중복으로 막히지 않도록).
+    """
+    state = _audit_dedupe_state()
+    ws_key = _worksheet_key(sheet)
+    with state["lock"]:
+        entry = state["sheets"].get(sheet_name)
+        if entry is not None and entry["ws_key"] != ws_key:
+            entry = None
+        if entry is not None and not force and time.time() - entry["synced_at"] < AUDIT_DEDUPE_REFRESH_SECONDS:
+            return entry
+
+    if entry is None:
+        headers = [str(value or "").strip() for value in sheet.row_values(1)]
+        fresh_entry = {
+            "ws_key": ws_key,
+            "emp_col": _column_letter(headers.index("사번") + 1) if "사번" in headers else "B",
+            "name_col": _column_letter(headers.index("성명") + 1) if "성명" in headers else "C",
+            "next_row": 2,
+            "emp_ids": set(),
+            "exception_names": set(),
+            "last_signature": None,
+            "version": 0,
+            "synced_at": 0.0,
+        }
+        with state["lock"]:
+            entry = state["sheets"].get(sheet_name)
+            if entry is None or entry["ws_key"] != ws_key:
+                entry = fresh_entry
+                state["sheets"][sheet_name] = entry
+
+    def _cell(column_values, offset):
+        if offset < len(column_values) and column_values[offset]:
+            return str(column_values[offset][0] or "").strip()
+        return ""
+
+    for _attempt in range(2):
+        with state["lock"]:
+            start_row = entry["next_row"]
+            version = entry["version"]
+        read_from = start_row - 1 if start_row > 2 else 2
+        emp_values, name_values = sheet.batch_get([
+            f"{entry['emp_col']}{read_from}:{entry['emp_col']}",
+            f"{entry['name_col']}{read_from}:{entry['name_col']}",
+        ])
+        with state["lock"]:
+            if state["sheets"].get(sheet_name) is not entry or entry["version"] != version:
+                # 다른 세션이 그사이 같은 색인을 갱신했으므로 그 결과를 씁니다.
+                return state["sheets"].get(sheet_name) or entry
+            row_total = max(len(emp_values), len(name_values))
+            skip = start_row - read_from
+            if skip:
+                overlap = (_cell(emp_values, 0), _cell(name_values, 0))
+                expected = entry["last_signature"]
+                if row_total < skip or (expected is not None and overlap != expected):
+                    entry["emp_ids"] = set()
+                    entry["exception_names"] = set()
+                    entry["next_row"] = 2
+                    entry["last_signature"] = None
+                    entry["version"] += 1
+                    continue
+            for offset in range(skip, row_total):
+                signature = (_cell(emp_values, offset), _cell(name_values, offset))
+                _audit_dedupe_add(entry, *signature)
+                entry["last_signature"] = signature
+            entry["next_row"] = read_from + max(row_total, skip)
+            entry["version"] += 1
+            entry["synced_at"] = time.time()
+        break
+    return entry
+
+
+def _audit_duplicate_message(entry: dict, emp_id_str: str, name_str: str) -> str | None:
+    if emp_id_str == AUDIT_EXCEPTION_EMP_ID:
+        # 예외 사번(00000000)인 경우: 사번과 성명이 모두 같아야 중복
+        if name_str in entry["exception_names"]:
+            return f"'{name_str}'님은 이미 '00000000' 사번으로 참여하셨습니다."
+    elif emp_id_str in entry["emp_ids"]:
+        # 일반 사번인 경우: 사번만 같아도 중복 처리
+        return f"사번 {emp_id_str}은(는) 이미 참여한 기록이 있습니다."
+    return None
+
+
+def _invalidate_audit_dedupe(sheet_name: str | None = None) -> None:
+    state = _audit_dedupe_state()
+    with state["lock"]:
+        if sheet_name is None:
+            state["sheets"].clear()
+        else:
+            state["sheets"].pop(sheet_name, None)
+
+
 def save_audit_result(emp_id, name, unit, dept, answer, sheet_name):
     client = init_google_sheet_connection()
     if not client:
         return False, "구글 시트 연결 실패 (Secrets 확인)"
     try:
-        spreadsheet = client.open("Audit_Result_2026")
+        spreadsheet = _open_spreadsheet_cached(client, "Audit_Result_2026")
         try:
-            sheet = spreadsheet.worksheet(sheet_name)
+            sheet = _get_worksheet_cached(spreadsheet, sheet_name)
         except Exception:
-            sheet = spreadsheet.add_worksheet(title=sheet_name, rows=2000, cols=10)
+            sheet = _remember_worksheet_handle(spreadsheet, spreadsheet.add_worksheet(title=sheet_name, rows=2000, cols=10))
             sheet.append_row(["저장시간", "사번", "성명", "총괄/본부/단", "부서", "답변", "비고"])
 
         # ==========================================
         # ✅ 중복 검증 로직 개선 (사번 + 성명 조합)
+        #    - 전체 행(get_all_records)을 매번 읽지 않고 캠페인별 색인 집합으로 판정합니다.
+        #    - 아직 시트에 반영되지 않은 대기열 행은 대기열의 멱등키(사번, 예외 사번은 사번+성명)가 막습니다.
         # ==========================================
-        all_records = sheet.get_all_records()
         emp_id_str = str(emp_id).strip()
         name_str = str(name).strip()
 
-        for record in all_records:
-            # 시트의 사번과 성명 데이터를 가져옴
-            existing_emp_id = str(record.get("사번", "")).strip()
-            existing_name = str(record.get("성명", "")).strip()
-
-            if emp_id_str == "00000000":
-                # 예외 사번(00000000)인 경우: 사번과 성명이 모두 같아야 중복
-                if existing_emp_id == "00000000" and existing_name == name_str:
-                    return False, f"'{name_str}'님은 이미 '00000000' 사번으로 참여하셨습니다."
-            else:
-                # 일반 사번인 경우: 사번만 같아도 중복 처리
-                if existing_emp_id == emp_id_str:
-                    return False, f"사번 {emp_id_str}은(는) 이미 참여한 기록이 있습니다."
+        entry = _audit_dedupe_sync(sheet, sheet_name)
+        duplicate_message = _audit_duplicate_message(entry, emp_id_str, name_str)
+        if duplicate_message:
+            return False, duplicate_message
         # ==========================================
 
         korea_tz = pytz.timezone("Asia/Seoul")
         now = datetime.datetime.now(korea_tz).strftime("%Y-%m-%d %H:%M:%S")
-        sheet.append_row([now, emp_id, name, unit, dept, answer, "완료"])
+        row = [now, emp_id, name, unit, dept, answer, "완료"]
+        headers = ["저장시간", "사번", "성명", "총괄/본부/단", "부서", "답변", "비고"]
+        idem_key = f"{emp_id_str}|{name_str}" if emp_id_str == AUDIT_EXCEPTION_EMP_ID else emp_id_str
+        try:
+            queued = enqueue_sheet_append("Audit_Result_2026", sheet_name, headers, dict(zip(headers, row)), idem_key, ["사번", "성명"])
+        except Exception:
+            # 동기 저장 직전에는 다른 프로세스가 방금 추가한 행까지 확인합니다.
+            entry = _audit_dedupe_sync(sheet, sheet_name, force=True)
+            duplicate_message = _audit_duplicate_message(entry, emp_id_str, name_str)
+            if duplicate_message:
+                return False, duplicate_message
+            _append_row_with_quota_retry(sheet, row)
+            queued = True
+        if not queued:
+            return False, _audit_duplicate_message({"emp_ids": {emp_id_str}, "exception_names": {name_str}}, emp_id_str, name_str)
+
+        with _audit_dedupe_state()["lock"]:
+            _audit_dedupe_add(entry, emp_id_str, name_str)
         return True, "성공"
     except Exception as e:
+        _forget_stale_sheet_handles(e, spreadsheet_name="Audit_Result_2026")
+        _invalidate_audit_dedupe(sheet_name)
         return False, str(e)
 
 def _clean_model_name(model_name: str) -> str:
@@ -557,33 +1413,7 @@ def _clean_model_name(model_name: str) -> str:
 
 def _select_available_model(task: str = "balanced") -> str:
     """업무 성격별 우선 모델을 선택하되, 계정에서 지원하지 않으면 자동 fallback 합니다."""
-    task = (task or "balanced").lower()
-    preference_map = {
-        "legal": ["gemini-2.5-pro", "gemini-2.0-flash", "gemini-1.5-pro", "gemini-1.5-flash"],
-        "report": ["gemini-2.5-pro", "gemini-2.0-flash", "gemini-1.5-pro", "gemini-1.5-flash"],
-        "summary": ["gemini-2.5-flash", "gemini-2.0-flash", "gemini-1.5-flash", "gemini-1.5-pro"],
-        "chat": ["gemini-2.5-flash", "gemini-2.0-flash", "gemini-1.5-flash", "gemini-1.5-pro"],
-        "balanced": ["gemini-2.5-flash", "gemini-2.5-pro", "gemini-2.0-flash", "gemini-1.5-pro", "gemini-1.5-flash"],
-    }
-    preferred = preference_map.get(task, preference_map["balanced"])
-
-    try:
-        available_models = [
-            _clean_model_name(m.name)
-            for m in genai.list_models()
-            if "generateContent" in getattr(m, "supported_generation_methods", [])
-        ]
-        for target in preferred:
-            for model_name in available_models:
-                if target in model_name:
-                    return model_name
-        if available_models:
-            return available_models[0]
-    except Exception:
-        # list_models 실패 시에도 아래 기본값으로 시도합니다.
-        pass
-
-    return preferred[-1]
+    return resolve_gemini_model(task)
 
 
 def get_model(task: str = "balanced", temperature: float = 0.2):
@@ -637,39 +1467,243 @@ def _extract_grounding_sources(response) -> list[dict]:
     return sources[:8]
 
 
-def generate_ai_response(content, task: str = "balanced", use_search: bool = False, temperature: float = 0.2):
-    """공통 AI 호출 함수: 검색 보강 요청 시 Google Search Grounding을 우선 시도하고 실패하면 일반 생성으로 fallback 합니다."""
+# ------------------------------------------
+# AI 응답 캐시
+#   - (모델명, 업무, temperature, 프롬프트, 첨부파일 해시)의 SHA-256을 키로 최종 답변 텍스트를 SQLite에 보관합니다.
+#   - 검색 보강(use_search) 요청은 최신 정보가 필요하므로 캐시를 읽지도 쓰지도 않습니다.
+#   - 보관 기간(AI_RESPONSE_CACHE_TTL_SECONDS)이 지나거나 개수 상한을 넘으면 가장 오래 쓰지 않은 답변부터 지웁니다.
+# ------------------------------------------
+AI_RESPONSE_CACHE_DB_PATH = os.path.join(APP_TEMP_ROOT, "ai_response_cache.sqlite3")
+AI_RESPONSE_CACHE_TTL_SECONDS = 7 * 24 * 3600
+AI_RESPONSE_CACHE_MAX_ENTRIES = 500
+
+
+def _ai_cache_connect():
+    _ensure_private_dir(os.path.dirname(AI_RESPONSE_CACHE_DB_PATH))
+    conn = sqlite3.connect(AI_RESPONSE_CACHE_DB_PATH, timeout=15, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS ai_responses (
+            cache_key TEXT PRIMARY KEY,
+            model TEXT NOT NULL,
+            task TEXT NOT NULL,
+            answer TEXT NOT NULL,
+            created_at REAL NOT NULL,
+            last_used_at REAL NOT NULL
+        )
+        """
+    )
+    return conn
+
+
+class _AIMediaRef:
+    """업로드 전의 첨부파일을 내용 해시로 나타냅니다. 캐시 확인을 위해 파일을 먼저 올리지 않아도 됩니다."""
+
+    def __init__(self, uploaded_file):
+        self.sha256_hash = hashlib.sha256(uploaded_file.getvalue()).hexdigest()
+
+
+def _ai_cache_key(model_name: str, task: str, temperature: float, content) -> str:
+    """프롬프트 텍스트와 첨부파일 해시를 순서대로 묶어 캐시 키를 만듭니다."""
+    digest = hashlib.sha256()
+    digest.update(f"{_clean_model_name(model_name)}\x00{task}\x00{float(temperature):.3f}".encode("utf-8"))
+    parts = content if isinstance(content, (list, tuple)) else [content]
+    for part in parts:
+        digest.update(b"\x00")
+        if isinstance(part, str):
+            digest.update(b"text:" + part.encode("utf-8"))
+            continue
+        # genai.upload_file로 올린 파일은 업로드마다 이름이 바뀌므로 내용 해시를 우선 사용합니다(_AIMediaRef는 로컬 해시).
+        file_hash = getattr(part, "sha256_hash", b"") or b""
+        if isinstance(file_hash, bytes):
+            file_hash = file_hash.hex()
+        digest.update(f"file:{file_hash or getattr(part, 'name', '') or repr(part)}".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _ai_cache_get(cache_key: str) -> tuple[str, float] | None:
+    """유효한 캐시 답변과 생성 시각을 반환합니다. 없거나 만료됐으면 None."""
+    now_ts = time.time()
+    try:
+        conn = _ai_cache_connect()
+        try:
+            row = conn.execute(
+                "SELECT answer, created_at FROM ai_responses WHERE cache_key = ? AND created_at >= ?",
+                (cache_key, now_ts - AI_RESPONSE_CACHE_TTL_SECONDS),
+            ).fetchone()
+            if row:
+                conn.execute("UPDATE ai_responses SET last_used_at = ? WHERE cache_key = ?", (now_ts, cache_key))
+            return (row[0], float(row[1])) if row else None
+        finally:
+            conn.close()
+    except sqlite3.Error:
+        return None
+
+
+def _ai_cache_put(cache_key: str, model_name: str, task: str, answer: str) -> None:
+    if not answer:
+        return
+    now_ts = time.time()
+    try:
+        conn = _ai_cache_connect()
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO ai_responses (cache_key, model, task, answer, created_at, last_used_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (cache_key, _clean_model_name(model_name), task, answer, now_ts, now_ts),
+            )
+            conn.execute("DELETE FROM ai_responses WHERE created_at < ?", (now_ts - AI_RESPONSE_CACHE_TTL_SECONDS,))
+            conn.execute(
+                "DELETE FROM ai_responses WHERE cache_key IN ("
+                "SELECT cache_key FROM ai_responses ORDER BY last_used_at DESC LIMIT -1 OFFSET ?)",
+                (AI_RESPONSE_CACHE_MAX_ENTRIES,),
+            )
+        finally:
+            conn.close()
+    except sqlite3.Error:
+        pass
+
+
+class _CachedAIResponse:
+    """캐시된 답변을 Gemini 응답처럼 다룰 수 있게 감쌉니다. 스트리밍 표시 경로에서는 한 조각으로 나옵니다."""
+    def __init__(self, text: str, created_at: float):
+        self.text = text
+        self.created_at = created_at
+
+    def __iter__(self):
+        yield self
+
+
+class _RecordingAIResponse:
+    """스트리밍 응답을 그대로 흘려보내면서 텍스트를 모았다가, 끝까지 받으면 캐시에 저장합니다."""
+    def __init__(self, response, cache_key: str, model_name: str, task: str):
+        self._response = response
+        self._cache_key = cache_key
+        self._model_name = model_name
+        self._task = task
+
+    def __iter__(self):
+        parts: list[str] = []
+        for chunk in self._response:
+            parts.append(_extract_response_text(chunk))
+            yield chunk
+        _ai_cache_put(self._cache_key, self._model_name, self._task, "".join(parts))
+
+    def __getattr__(self, name):
+        return getattr(self._response, name)
+
+
+def generate_ai_response(
+    content,
+    task: str = "balanced",
+    use_search: bool = False,
+    temperature: float = 0.2,
+    stream: bool = False,
+    use_cache: bool = False,
+    refresh_cache: bool = False,
+    cache_content=None,
+):
+    """공통 AI 호출 함수: 검색 보강 요청 시 Google Search Grounding을 우선 시도하고 실패하면 일반 생성으로 fallback 합니다.
+
+    stream=True이면 첫 조각이 도착하는 즉시 응답 객체를 돌려주며, render_ai_response가 조각 단위로 화면에 씁니다.
+    use_cache=True이면 검색 보강이 없는 요청에 한해 같은 입력의 이전 답변을 재사용하고, refresh_cache=True이면
+    캐시를 읽지 않고 새로 생성한 답변으로 덮어씁니다. cache_content를 주면 content 대신 그것으로 캐시 키를
+    만듭니다(업로드한 첨부 대신 _AIMediaRef를 넣어 lookup_ai_response_cache와 같은 키를 쓰기 위함).
+    """
     model = get_model(task=task, temperature=temperature)
     search_warning = None
 
+    cache_key = ""
+    model_name = str(getattr(model, "model_name", "") or "")
+    if use_cache and not use_search:
+        cache_key = _ai_cache_key(model_name, task, temperature, content if cache_content is None else cache_content)
+        cached = None if refresh_cache else _ai_cache_get(cache_key)
+        if cached:
+            return _CachedAIResponse(*cached), False, None
+
     if use_search:
         # google-generativeai 구버전/신버전 호환을 위해 두 가지 표기를 순차 시도합니다.
         for tool_name in ("google_search_retrieval", "google_search"):
             try:
-                response = model.generate_content(content, tools=tool_name)
+                response = model.generate_content(content, tools=tool_name, stream=stream)
                 return response, True, None
             except Exception as e:
                 search_warning = str(e)
 
-    response = model.generate_content(content)
+    response = model.generate_content(content, stream=stream)
+    if cache_key:
+        if stream:
+            response = _RecordingAIResponse(response, cache_key, model_name, task)
+        else:
+            _ai_cache_put(cache_key, model_name, task, _extract_response_text(response))
     return response, False, search_warning
 
 
-def render_ai_response(response, grounded: bool = False, warning: str | None = None) -> None:
-    """AI 결과와 검색 출처를 공통 UI로 출력합니다."""
-    answer = _extract_response_text(response)
-    if answer:
-        st.markdown(answer)
+def lookup_ai_response_cache(content, task: str = "balanced", temperature: float = 0.2):
+    """generate_ai_response(use_cache=True)가 저장한 답변이 있으면 응답 객체로, 없으면 None을 반환합니다.
+
+    음성처럼 업로드가 오래 걸리는 첨부는 _AIMediaRef로 먼저 확인해 캐시가 있으면 업로드를 건너뜁니다.
+    """
+    model = get_model(task=task, temperature=temperature)
+    model_name = str(getattr(model, "model_name", "") or "")
+    cached = _ai_cache_get(_ai_cache_key(model_name, task, temperature, content))
+    return _CachedAIResponse(*cached) if cached else None
+
+
+def _iter_ai_response_text(response, sources: list[dict]):
+    """스트리밍 응답의 텍스트 조각을 순서대로 내보내고, 조각마다 붙어 오는 검색 출처를 sources에 모읍니다."""
+    for chunk in response:
+        for source in _extract_grounding_sources(chunk):
+            if not any(existing.get("uri") == source["uri"] for existing in sources):
+                sources.append(source)
+        text = _extract_response_text(chunk)
+        if text:
+            yield text
+
+
+def _stream_ai_response(response, sources: list[dict]) -> str:
+    """스트리밍 응답을 st.write_stream으로 도착하는 대로 표시하고, 완성된 텍스트를 반환합니다."""
+    streamed = st.write_stream(_iter_ai_response_text(response, sources))
+    answer = streamed if isinstance(streamed, str) else "".join(str(part) for part in (streamed or []))
+    # 마지막 조각에만 붙는 출처도 있으므로 누적된 응답에서 한 번 더 모읍니다.
+    for source in _extract_grounding_sources(response):
+        if not any(existing.get("uri") == source["uri"] for existing in sources):
+            sources.append(source)
+    del sources[8:]
+    return answer
+
+
+def render_ai_response(response, grounded: bool = False, warning: str | None = None, stream: bool = False) -> str:
+    """AI 결과와 검색 출처를 공통 UI로 출력하고 최종 답변 텍스트를 반환합니다.
+
+    stream=True이면 generate_ai_response(stream=True)의 응답을 조각 단위로 표시합니다.
+    """
+    sources: list[dict] = []
+    if stream:
+        answer = _stream_ai_response(response, sources)
     else:
+        answer = _extract_response_text(response)
+        if answer:
+            st.markdown(answer)
+        sources = _extract_grounding_sources(response)
+    if not answer:
         st.warning("AI 응답 텍스트를 추출하지 못했습니다. 입력 자료나 모델 응답 제한 여부를 확인해 주세요.")
+    elif isinstance(response, _CachedAIResponse):
+        cached_at = datetime.datetime.fromtimestamp(response.created_at, pytz.timezone("Asia/Seoul"))
+        st.caption(
+            f"♻️ 같은 자료·옵션의 이전 분석 결과({cached_at.strftime('%Y-%m-%d %H:%M')})를 재사용했습니다. "
+            "새로 분석하려면 '새로 생성'을 선택해 주세요."
+        )
 
-    sources = _extract_grounding_sources(response)
     if grounded and sources:
         with st.expander("🔎 검색 기반 참고 출처", expanded=False):
             for i, src in enumerate(sources, 1):
                 st.markdown(f"{i}. [{src['title']}]({src['uri']})")
     elif warning:
         st.caption("ℹ️ 검색 보강 호출이 실패하여 일반 AI 분석으로 대체되었습니다. 패키지 버전 또는 API 권한을 확인해 주세요.")
+    return answer
 
 
 def truncate_text(text: str, limit: int = 45000) -> str:
@@ -679,46 +1713,286 @@ def truncate_text(text: str, limit: int = 45000) -> str:
     return text[:limit] + "\n\n[※ 입력 자료가 길어 앞부분 기준으로 일부만 반영되었습니다.]"
 
 
-def read_file(uploaded_file):
-    content = ""
+# ------------------------------------------
+# 프롬프트 입력 분량 배분 (토큰 기준)
+#   - 한국어는 글자 수와 토큰 수의 비율이 영문과 크게 달라, 입력 한도를 토큰으로 계산합니다.
+#   - 토큰 수는 모델의 count_tokens를 우선 쓰고, 실패하면 로컬 추정치를 씁니다. 결과는 내용 해시별로 캐시합니다.
+#   - 여러 자료는 우선순위 순으로 한도를 나누고, 각 자료의 최소 보장분은 먼저 떼어 둡니다.
+# ------------------------------------------
+PROMPT_INPUT_TOKEN_BUDGETS = {"legal": 64000, "report": 64000, "summary": 48000, "chat": 12000}
+PROMPT_TOKEN_COUNT_MIN_CHARS = 2000
+PROMPT_TOKEN_CACHE_MAX_ENTRIES = 2000
+_HANGUL_OR_CJK_PATTERN = re.compile(r"[ᄀ-ᇿ㄰-㆏가-힣一-鿿]")
+
+
+@st.cache_resource
+def _prompt_token_cache_state() -> dict:
+    return {"lock": threading.Lock(), "counts": {}}
+
+
+def estimate_prompt_tokens(text: str) -> int:
+    """로컬 토큰 추정치: 한글·한자는 글자당 약 0.8토큰, 그 밖의 문자는 약 3.5자당 1토큰으로 계산합니다."""
+    text = str(text or "")
+    wide = len(_HANGUL_OR_CJK_PATTERN.findall(text))
+    narrow = len(text) - wide
+    return int(wide * 0.8 + narrow / 3.5) + 1
+
+
+def count_prompt_tokens(text: str, model=None) -> tuple[int, str]:
+    """(토큰 수, 산정 방식)을 반환합니다. 짧은 텍스트나 모델 호출 실패 시에는 로컬 추정치를 씁니다."""
+    text = str(text or "")
+    if not text:
+        return 0, "없음"
+    if model is None or len(text) < PROMPT_TOKEN_COUNT_MIN_CHARS:
+        return estimate_prompt_tokens(text), "추정"
+    model_name = _clean_model_name(str(getattr(model, "model_name", "") or ""))
+    key = f"{model_name}:{hashlib.sha256(text.encode('utf-8')).hexdigest()}"
+    state = _prompt_token_cache_state()
+    with state["lock"]:
+        cached = state["counts"].get(key)
+    if cached is not None:
+        return cached, "모델"
     try:
-        name = uploaded_file.name.lower()
-        if name.endswith(".txt"):
-            raw = uploaded_file.getvalue()
-            for enc in ("utf-8", "cp949", "euc-kr"):
-                try:
-                    content = raw.decode(enc)
+        tokens = int(model.count_tokens(text).total_tokens)
+    except Exception:
+        return estimate_prompt_tokens(text), "추정"
+    with state["lock"]:
+        if len(state["counts"]) >= PROMPT_TOKEN_CACHE_MAX_ENTRIES:
+            state["counts"].pop(next(iter(state["counts"])))
+        state["counts"][key] = tokens
+    return tokens, "모델"
+
+
+def _fit_text_to_tokens(text: str, budget: int, measured_tokens: int) -> str:
+    """budget 토큰 안에 들어가도록 앞부분을 남기고 줄 경계에서 자릅니다."""
+    if measured_tokens <= budget:
+        return text
+    if budget <= 0:
+        return "[※ 입력 분량 한도로 이 자료는 반영하지 못했습니다.]"
+    keep_chars = int(len(text) * budget / max(measured_tokens, 1) * 0.97)
+    cut = text[:keep_chars]
+    line_break = cut.rfind("\n")
+    if line_break > keep_chars * 0.8:
+        cut = cut[:line_break]
+    return cut + "\n\n[※ 입력 자료가 길어 앞부분 기준으로 일부만 반영되었습니다.]"
+
+
+def assemble_prompt_sections(task: str, sections: list[dict], fixed_text: str = "", model=None) -> tuple[dict, list[dict]]:
+    """자료 구간별 토큰 한도를 정하고 (이름별 반영 텍스트, 배분 내역)을 반환합니다.
+
+    sections 항목: name, label, text, priority(작을수록 우선), min_tokens(선택)
+    """
+    budget = PROMPT_INPUT_TOKEN_BUDGETS.get(task, PROMPT_INPUT_TOKEN_BUDGETS["legal"])
+    fixed_tokens, _fixed_method = count_prompt_tokens(fixed_text, model)
+    available = max(budget - fixed_tokens, 0)
+
+    measured = {}
+    for section in sections:
+        measured[section["name"]] = count_prompt_tokens(section.get("text", ""), model)
+
+    ordered = sorted(sections, key=lambda section: section.get("priority", 9))
+    # 1단계: 우선순위가 낮은 자료도 최소 보장분은 먼저 확보합니다.
+    allocation = {}
+    for section in ordered:
+        need = measured[section["name"]][0]
+        reserve = min(need, int(section.get("min_tokens", 0) or 0), available)
+        allocation[section["name"]] = reserve
+        available -= reserve
+    # 2단계: 남은 한도를 우선순위 순으로 필요한 만큼 더 줍니다.
+    for section in ordered:
+        need = measured[section["name"]][0]
+        extra = min(need - allocation[section["name"]], available)
+        allocation[section["name"]] += extra
+        available -= extra
+
+    fitted = {}
+    decisions = []
+    for section in sections:
+        tokens, method = measured[section["name"]]
+        granted = allocation[section["name"]]
+        fitted[section["name"]] = _fit_text_to_tokens(section.get("text", ""), granted, tokens)
+        decisions.append({
+            "자료": section.get("label", section["name"]),
+            "우선순위": section.get("priority", 9),
+            "필요 토큰": tokens,
+            "배정 토큰": granted,
+            "산정 방식": method,
+            "반영": "전체" if granted >= tokens else ("제외" if granted <= 0 and tokens else "앞부분만"),
+        })
+    decisions.append({
+        "자료": "지시문·작성 원칙",
+        "우선순위": 0,
+        "필요 토큰": fixed_tokens,
+        "배정 토큰": fixed_tokens,
+        "산정 방식": _fixed_method,
+        "반영": "전체",
+    })
+    return fitted, decisions
+
+
+def render_prompt_budget(task: str, decisions: list[dict]) -> None:
+    """토큰 배분 내역을 접이식 표로 보여 줍니다. 잘린 자료가 있으면 제목에 표시합니다."""
+    if not decisions:
+        return
+    budget = PROMPT_INPUT_TOKEN_BUDGETS.get(task, PROMPT_INPUT_TOKEN_BUDGETS["legal"])
+    used = sum(int(row["배정 토큰"]) for row in decisions)
+    trimmed = [row["자료"] for row in decisions if row["반영"] != "전체"]
+    title = f"🧮 입력 분량 배분 · 약 {used:,} / {budget:,} 토큰"
+    if trimmed:
+        title += f" · 일부 반영: {', '.join(trimmed)}"
+    with st.expander(title, expanded=False):
+        st.dataframe(pd.DataFrame(decisions), use_container_width=True, hide_index=True)
+        st.caption("'추정'은 로컬 계산값이며, '모델'은 Gemini count_tokens로 측정한 값입니다.")
+
+
+def _select_chat_history(history: list[dict], budget: int) -> list[dict]:
+    """최근 대화부터 토큰 한도 안에서 거꾸로 채워 시간순으로 반환합니다."""
+    selected = []
+    remaining = budget
+    for message in reversed(history or []):
+        cost = estimate_prompt_tokens(str(message.get("content", "")))
+        if cost > remaining:
+            break
+        selected.append(message)
+        remaining -= cost
+    return list(reversed(selected))
+
+
+# ------------------------------------------
+# 첨부 문서 텍스트 추출
+#   - 추출 결과는 파일 내용 SHA-256 기준으로 프로세스 공용 캐시에 보관하므로 같은 파일을 다시 올려도 재추출하지 않습니다.
+#   - PDF는 필요한 분량(max_chars)에 도달할 때까지만 페이지를 읽고, 더 필요해지면 이어서 읽습니다.
+#   - 여러 파일은 스레드 풀에서 동시에 추출합니다.
+# ------------------------------------------
+TEXT_EXTRACT_CACHE_MAX_CHARS = 30_000_000
+TEXT_EXTRACT_WORKERS = 4
+
+
+@st.cache_resource
+def _text_extract_cache_state() -> dict:
+    # entries는 삽입 순서를 LRU 순서로 씁니다(조회 시 맨 뒤로 다시 넣음).
+    return {"lock": threading.Lock(), "entries": {}, "chars": 0}
+
+
+def _text_extract_entry_text(entry: dict) -> str:
+    """캐시 항목의 본문입니다. PDF는 페이지 목록만 보관하므로 읽을 때 합칩니다."""
+    if entry["pages"]:
+        return "".join(entry["pages"]).strip()
+    return entry["text"]
+
+
+def _text_extract_cache_store(key: str, entry: dict) -> None:
+    state = _text_extract_cache_state()
+    with state["lock"]:
+        previous = state["entries"].pop(key, None)
+        if previous:
+            state["chars"] -= previous["chars"]
+        state["entries"][key] = entry
+        state["chars"] += entry["chars"]
+        while state["chars"] > TEXT_EXTRACT_CACHE_MAX_CHARS and len(state["entries"]) > 1:
+            oldest_key = next(iter(state["entries"]))
+            state["chars"] -= state["entries"].pop(oldest_key)["chars"]
+
+
+def _extract_document_text(file_name: str, data: bytes, max_chars: int | None = None) -> str | None:
+    """파일 bytes에서 텍스트를 추출합니다. UI를 건드리지 않으므로 작업 스레드에서 호출할 수 있습니다."""
+    from io import BytesIO
+
+    name = str(file_name or "").lower()
+    if not data:
+        return None
+    key = f"{hashlib.sha256(data).hexdigest()}:{os.path.splitext(name)[1]}"
+    state = _text_extract_cache_state()
+    with state["lock"]:
+        entry = state["entries"].pop(key, None)
+        if entry:
+            state["entries"][key] = entry
+    if entry and (entry["complete"] or (max_chars is not None and entry["chars"] >= max_chars)):
+        return _text_extract_entry_text(entry) or None
+
+    try:
+        if name.endswith(".pdf"):
+            reader = PyPDF2.PdfReader(BytesIO(data))
+            pages = list(entry["pages"]) if entry else []
+            extracted_chars = sum(len(page) for page in pages)
+            for idx in range(len(pages), len(reader.pages)):
+                if max_chars is not None and extracted_chars >= max_chars:
                     break
-                except Exception:
-                    continue
-        elif name.endswith(".pdf"):
-            reader = PyPDF2.PdfReader(uploaded_file)
-            for idx, page in enumerate(reader.pages, 1):
-                page_text = page.extract_text() or ""
-                content += f"\n\n[Page {idx}]\n{page_text}"
-        elif name.endswith(".docx"):
-            doc = Document(uploaded_file)
-            content = "\n".join([para.text for para in doc.paragraphs if para.text])
-        elif name.endswith(".csv"):
-            df = pd.read_csv(uploaded_file)
-            content = df.head(200).to_markdown(index=False)
-        elif name.endswith((".xlsx", ".xls")):
-            df = pd.read_excel(uploaded_file)
-            content = df.head(200).to_markdown(index=False)
+                page_text = f"\n\n[Page {idx + 1}]\n{reader.pages[idx].extract_text() or ''}"
+                pages.append(page_text)
+                extracted_chars += len(page_text)
+            content = "".join(pages)
+            complete = len(pages) >= len(reader.pages)
+        else:
+            pages = []
+            complete = True
+            content = ""
+            if name.endswith(".txt"):
+                for enc in ("utf-8", "cp949", "euc-kr"):
+                    try:
+                        content = data.decode(enc)
+                        break
+                    except Exception:
+                        continue
+            elif name.endswith(".docx"):
+                doc = Document(BytesIO(data))
+                content = "\n".join([para.text for para in doc.paragraphs if para.text])
+            elif name.endswith(".csv"):
+                df = pd.read_csv(BytesIO(data))
+                content = df.head(200).to_markdown(index=False)
+            elif name.endswith((".xlsx", ".xls")):
+                df = pd.read_excel(BytesIO(data))
+                content = df.head(200).to_markdown(index=False)
+    except Exception:
+        return None
+
+    text = content.strip() if content else ""
+    if pages:
+        # PDF는 이어 읽기에 쓸 페이지 목록만 보관해 같은 본문을 두 벌 들고 있지 않습니다.
+        entry = {"text": "", "pages": pages, "complete": complete, "chars": sum(len(page) for page in pages)}
+    else:
+        entry = {"text": text, "pages": [], "complete": complete, "chars": len(text)}
+    _text_extract_cache_store(key, entry)
+    return text or None
+
+
+def read_file(uploaded_file, max_chars: int | None = None):
+    """업로드 파일의 텍스트를 반환합니다. max_chars를 주면 PDF는 그 분량까지만 페이지를 읽습니다."""
+    try:
+        data = uploaded_file.getvalue()
     except Exception:
         return None
-    return content.strip() if content else None
+    return _extract_document_text(getattr(uploaded_file, "name", ""), data, max_chars)
+
+
+def read_multiple_files(files, max_each: int | None = 12000) -> str:
+    """여러 파일을 감사보고서/법률검토 프롬프트에 안전하게 합칩니다.
 
+    max_each=None이면 파일별로 자르지 않습니다. 이 경우 condense_long_document로 전체 분량을 다룹니다.
+    파일 추출은 동시에 진행하되, 결과는 업로드 순서대로 합칩니다.
+    """
+    files = list(files or [])
+    if not files:
+        return ""
+    payloads = []
+    for f in files:
+        try:
+            payloads.append((getattr(f, "name", "uploaded"), f.getvalue()))
+        except Exception:
+            payloads.append((getattr(f, "name", "uploaded"), b""))
+    with ThreadPoolExecutor(
+        max_workers=max(1, min(TEXT_EXTRACT_WORKERS, len(payloads))), thread_name_prefix="text-extract"
+    ) as pool:
+        bodies = list(pool.map(lambda payload: _extract_document_text(payload[0], payload[1], max_each), payloads))
 
-def read_multiple_files(files, max_each: int = 12000) -> str:
-    """여러 파일을 감사보고서/법률검토 프롬프트에 안전하게 합칩니다."""
     chunks = []
-    for f in files or []:
-        body = read_file(f)
+    for (file_name, _data), body in zip(payloads, bodies):
         if body:
-            chunks.append(f"\n\n===== 파일: {getattr(f, 'name', 'uploaded')} =====\n{truncate_text(body, max_each)}")
+            if max_each is not None:
+                body = truncate_text(body, max_each)
+            chunks.append(f"\n\n===== 파일: {file_name} =====\n{body}")
         else:
-            chunks.append(f"\n\n===== 파일: {getattr(f, 'name', 'uploaded')} =====\n[텍스트 추출 실패 또는 지원되지 않는 형식]")
+            chunks.append(f"\n\n===== 파일: {file_name} =====\n[텍스트 추출 실패 또는 지원되지 않는 형식]")
     return "\n".join(chunks).strip()
 
 
@@ -802,7 +2076,7 @@ def get_web_content(url):
         headers = {
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 Chrome/120 Safari/537.36"
         }
-        response = requests.get(url, headers=headers, timeout=20)
+        response = http_request("GET", url, "web.fetch", cookieless=True, headers=headers, timeout=20)
         response.raise_for_status()
         soup = BeautifulSoup(response.text, "html.parser")
         for tag in soup(["script", "style", "noscript", "header", "footer", "nav", "aside"]):
@@ -852,7 +2126,7 @@ def build_legal_review_prompt(content: str, analysis_depth: str, doc_type: str,
 - 문서에 없는 사실, 최신 법령 확인 필요사항, 외부 변호사 검토 필요사항
 
 [입력 문서]
-{truncate_text(content, 55000)}
+{content}
 """
 
 
@@ -893,18 +2167,19 @@ def build_audit_report_prompt(mode: str, case_title: str, case_scope: str, repor
 ## 5. 추가 확인 필요사항
 
 [감사 자료]
-{truncate_text(materials, 50000)}
+{materials}
 
 [회사 규정/판단 기준]
-{truncate_text(regulations_text, 25000)}
+{regulations_text}
 
 [참고 보고서 형식]
-{truncate_text(refs_text, 15000)}
+{refs_text}
 """
 
 
 def build_chat_prompt(user_input: str, history: list[dict], mode: str) -> str:
-    recent = history[-10:] if history else []
+    # 최근 대화는 개수 대신 토큰 한도(PROMPT_INPUT_TOKEN_BUDGETS["chat"]) 안에서 최대한 담습니다.
+    recent = _select_chat_history(history or [], PROMPT_INPUT_TOKEN_BUDGETS["chat"])
     history_text = "\n".join([f"{m.get('role')}: {m.get('content')}" for m in recent])
     return f"""[시스템 역할]
 당신은 대한민국 기업 감사실을 지원하는 Professional Legal & Audit Assistant입니다.
@@ -951,17 +2226,237 @@ def build_summary_prompt(summary_mode: str, output_style: str, source_hint: str,
 ## 5. 원문 한계 및 추가 확인사항
 
 [입력 내용]
-{truncate_text(body_text, 55000)}
+{body_text}
 """
 
 # ==========================================
-# ✅ (요청 2) 사번 검증 유틸
+# ✅ 장문 자료 분할 분석 (map-reduce)
+#    - 한 번에 넣을 수 있는 분량을 넘는 자료는 [Page n]·제n조·파일 구분선 경계에서 구간으로 나눕니다.
+#    - 구간별 핵심 메모를 동시에(최대 LONG_DOC_MAP_WORKERS개) 생성한 뒤, 메모를 모아 기존 프롬프트로 최종 분석합니다.
+#    - 모은 메모가 다시 한도를 넘으면 메모 묶음을 한 번 더 요약합니다(최대 LONG_DOC_MAX_LEVELS단계).
+#    - 짧은 자료는 그대로 반환하므로 기존 단일 호출 흐름과 같습니다.
 # ==========================================
-def validate_emp_id(emp_id: str) -> tuple[bool, str]:
-    """
-    규칙:
-    - 기본: 8자리 숫자, '10'으로 시작 (10******)
-    - 예외: 사번 미부여자는 '00000000' 허용(제출 가능)
+LONG_DOC_CHUNK_CHARS = 36000
+LONG_DOC_MAP_WORKERS = 4
+LONG_DOC_NOTE_CHARS = 3500
+LONG_DOC_MAX_LEVELS = 3
+LONG_DOC_BOUNDARY_PATTERN = re.compile(r"(?=\[Page \d+\]|^[ \t]*제\s*\d+\s*조(?:의\s*\d+)?|^\s*={5} 파일:)", re.M)
+
+LONG_DOC_MAP_INSTRUCTIONS = {
+    "legal": (
+        "이 구간의 조항을 빠짐없이 훑어 리스크가 있거나 협의가 필요한 조항만 골라, "
+        "조항 번호/페이지, 원문 요지, 문제점, 개선 방향을 항목별로 적으세요. 문제가 없는 조항은 제목만 나열하세요."
+    ),
+    "report": (
+        "이 구간에서 확인되는 사실관계(일시·장소·당사자·행위·금액), 증거자료, 진술 간 차이, 쟁점을 "
+        "출처(파일명/페이지)와 함께 항목별로 적으세요. 자료에 없는 내용은 추정하지 마세요."
+    ),
+    "regulation": (
+        "이 구간에서 감사 판단·징계·조치의 기준이 되는 조항만 골라 조항 번호와 요지를 적으세요."
+    ),
+    "summary": (
+        "이 구간의 핵심 사실, 날짜, 기관·당사자, 수치, 주장과 의견을 구분해 항목별로 적으세요."
+    ),
+    "merge": (
+        "이 구간은 원문 여러 구간의 분석 메모를 모은 것입니다. 중복을 합치되 각 항목의 구간 표시(구간 번호·Page·조문)는 "
+        "그대로 남기고, 리스크·쟁점·수치·날짜는 빠뜨리지 말고 항목별로 다시 정리하세요."
+    ),
+}
+
+
+def _long_doc_segments(text: str) -> list[str]:
+    """페이지·조문·파일 경계로 자르고, 경계가 없는 긴 구간은 문단 → 글자 수 순으로 다시 자릅니다."""
+    segments: list[str] = []
+    for part in LONG_DOC_BOUNDARY_PATTERN.split(text):
+        if not part.strip():
+            continue
+        if len(part) <= LONG_DOC_CHUNK_CHARS:
+            segments.append(part)
+            continue
+        buffer = ""
+        for paragraph in re.split(r"(?<=\n)\n+", part):
+            while len(paragraph) > LONG_DOC_CHUNK_CHARS:
+                if buffer:
+                    segments.append(buffer)
+                    buffer = ""
+                segments.append(paragraph[:LONG_DOC_CHUNK_CHARS])
+                paragraph = paragraph[LONG_DOC_CHUNK_CHARS:]
+            if len(buffer) + len(paragraph) > LONG_DOC_CHUNK_CHARS and buffer:
+                segments.append(buffer)
+                buffer = ""
+            buffer += paragraph + "\n"
+        if buffer.strip():
+            segments.append(buffer)
+    return segments
+
+
+def split_long_document(text: str, max_chars: int = LONG_DOC_CHUNK_CHARS) -> list[str]:
+    """경계 단위 구간을 순서대로 max_chars 이내 묶음으로 합칩니다."""
+    chunks: list[str] = []
+    current = ""
+    for segment in _long_doc_segments(str(text or "")):
+        if current and len(current) + len(segment) > max_chars:
+            chunks.append(current.strip())
+            current = ""
+        current += segment
+    if current.strip():
+        chunks.append(current.strip())
+    return chunks
+
+
+def _long_doc_chunk_label(chunk: str, index: int, total: int) -> str:
+    pages = re.findall(r"\[Page (\d+)\]", chunk)
+    articles = re.findall(r"^[ \t]*(제\s*\d+\s*조(?:의\s*\d+)?)", chunk, re.M)
+    label = f"구간 {index}/{total}"
+    if pages:
+        label += f" · Page {pages[0]}" + (f"–{pages[-1]}" if pages[-1] != pages[0] else "")
+    if articles:
+        label += f" · {articles[0].replace(' ', '')}" + (f"~{articles[-1].replace(' ', '')}" if len(articles) > 1 else "")
+    return label
+
+
+def build_long_doc_map_prompt(kind: str, chunk: str, label: str, context: str = "") -> str:
+    instruction = LONG_DOC_MAP_INSTRUCTIONS.get(kind, LONG_DOC_MAP_INSTRUCTIONS["summary"])
+    return f"""[역할]
+당신은 기업 감사실의 자료 분석 보조자입니다. 긴 자료의 일부 구간만 전달되며, 최종 분석은 다른 단계에서 합쳐서 수행합니다.
+
+[분석 맥락]
+{context or "(별도 맥락 없음)"}
+
+[작업]
+{instruction}
+- 분량은 {LONG_DOC_NOTE_CHARS}자 이내의 메모로 작성하고, 서론·결론 문장은 쓰지 마세요.
+- 구간 경계에서 잘린 문장은 '앞/뒤 구간과 연결 확인 필요'로 표시하세요.
+
+[자료 구간: {label}]
+{chunk}
+"""
+
+
+def _long_doc_map_notes(
+    chunks: list[str],
+    labels: list[str],
+    kind: str,
+    task: str,
+    temperature: float,
+    context: str,
+    refresh_cache: bool,
+) -> list[str]:
+    """구간별 메모를 동시에 만들어 구간 순서대로 반환합니다. 실패한 구간은 원문 앞부분으로 채웁니다."""
+    # 모델 선택과 세션 상태 접근은 화면 스레드에서 끝내고, 작업 스레드에서는 생성 호출만 합니다.
+    model = get_model(task=task, temperature=temperature)
+    model_name = str(getattr(model, "model_name", "") or "")
+    prompts = [build_long_doc_map_prompt(kind, chunk, label, context) for chunk, label in zip(chunks, labels)]
+
+    def _map_one(prompt: str) -> str:
+        cache_key = _ai_cache_key(model_name, f"{task}:map:{kind}", temperature, prompt)
+        cached = None if refresh_cache else _ai_cache_get(cache_key)
+        if cached:
+            return cached[0]
+        last_error = None
+        for attempt in range(2):
+            try:
+                note = _extract_response_text(model.generate_content(prompt))
+                if note:
+                    _ai_cache_put(cache_key, model_name, f"{task}:map:{kind}", note)
+                    return note
+            except Exception as error:
+                last_error = error
+                time.sleep(1.0 * (attempt + 1))
+        raise RuntimeError(str(last_error or "빈 응답"))
+
+    notes: list[str] = [""] * len(chunks)
+    progress = st.progress(0.0, text=f"긴 자료를 {len(chunks)}개 구간으로 나누어 분석하고 있습니다...")
+    with ThreadPoolExecutor(max_workers=min(LONG_DOC_MAP_WORKERS, len(chunks)), thread_name_prefix="long-doc-map") as pool:
+        futures = {pool.submit(_map_one, prompt): position for position, prompt in enumerate(prompts)}
+        for done, future in enumerate(as_completed(futures), 1):
+            position = futures[future]
+            try:
+                notes[position] = future.result()
+            except Exception as error:
+                # 메모 생성에 실패한 구간은 원문 앞부분이라도 최종 분석에 넘겨 공백으로 남지 않게 합니다.
+                notes[position] = (
+                    f"[구간 분석 실패: {error} · 원문 일부]\n{chunks[position][:LONG_DOC_NOTE_CHARS]}"
+                )
+            progress.progress(done / len(chunks), text=f"구간 분석 {done}/{len(chunks)} 완료")
+    progress.empty()
+    return notes
+
+
+def _long_doc_group_blocks(blocks: list[str], max_chars: int = LONG_DOC_CHUNK_CHARS) -> list[list[int]]:
+    """메모 블록 번호를 순서대로 max_chars 이내 묶음으로 나눕니다."""
+    groups: list[list[int]] = []
+    size = 0
+    for position, block in enumerate(blocks):
+        if groups and size + len(block) <= max_chars:
+            groups[-1].append(position)
+            size += len(block) + 2
+        else:
+            groups.append([position])
+            size = len(block)
+    return groups
+
+
+def condense_long_document(
+    text: str,
+    kind: str,
+    limit: int,
+    task: str = "balanced",
+    temperature: float = 0.1,
+    context: str = "",
+    refresh_cache: bool = False,
+) -> tuple[str, int]:
+    """limit보다 긴 자료를 구간별 메모로 압축해 (프롬프트에 넣을 본문, 구간 수)를 반환합니다.
+
+    limit 이하이면 원문과 0을 그대로 돌려줍니다. 모은 메모가 limit을 넘으면 메모 묶음을 다시 요약하며,
+    그래도 넘으면 그 사실을 머리말에 밝힙니다. 구간 분석은 같은 입력이면 AI 응답 캐시를 재사용합니다.
+    """
+    text = str(text or "")
+    if len(text) <= limit:
+        return text, 0
+    chunks = split_long_document(text)
+    if len(chunks) <= 1:
+        return text, 0
+
+    labels = [_long_doc_chunk_label(chunk, index, len(chunks)) for index, chunk in enumerate(chunks, 1)]
+    notes = _long_doc_map_notes(chunks, labels, kind, task, temperature, context, refresh_cache)
+    blocks = [f"### [{label}]\n{note.strip()}" for label, note in zip(labels, notes)]
+    block_labels = list(labels)
+
+    levels = 1
+    while levels < LONG_DOC_MAX_LEVELS and len("\n\n".join(blocks)) > limit:
+        groups = _long_doc_group_blocks(blocks)
+        if len(groups) >= len(blocks):
+            break
+        group_texts = ["\n\n".join(blocks[position] for position in group) for group in groups]
+        group_labels = [
+            f"메모 묶음 {index}/{len(groups)} · {block_labels[group[0]]}"
+            + (f" ~ {block_labels[group[-1]]}" if len(group) > 1 else "")
+            for index, group in enumerate(groups, 1)
+        ]
+        notes = _long_doc_map_notes(group_texts, group_labels, "merge", task, temperature, context, refresh_cache)
+        blocks = [f"### [{label}]\n{note.strip()}" for label, note in zip(group_labels, notes)]
+        block_labels = group_labels
+        levels += 1
+
+    condensed = "\n\n".join(blocks)
+    header = f"[※ 원문 {len(text):,}자를 {len(chunks)}개 구간으로 나누어 구간별 분석 메모를 작성했습니다"
+    if levels > 1:
+        header += f"(메모가 길어 {levels}단계로 다시 요약)"
+    header += ". 메모는 원문을 요약한 것이라 세부 문구는 생략될 수 있으니, 구간 표시(Page/조문)를 근거 위치로 인용하세요."
+    if len(condensed) > limit:
+        header += " 메모 분량이 입력 한도를 넘어 뒷부분 구간은 일부만 전달될 수 있습니다."
+    return f"{header}]\n\n{condensed}", len(chunks)
+
+
+# ==========================================
+# ✅ (요청 2) 사번 검증 유틸
+# ==========================================
+def validate_emp_id(emp_id: str) -> tuple[bool, str]:
+    """
+    규칙:
+    - 기본: 8자리 숫자, '10'으로 시작 (10******)
+    - 예외: 사번 미부여자는 '00000000' 허용(제출 가능)
     """
     s = (emp_id or "").strip()
 
@@ -997,19 +2492,15 @@ JUNE_TRAINING_HEADERS = [
 
 
 def save_june_compliance_training_result(record: dict) -> tuple[bool, str]:
-    """6월 컴플라이언스 인식제고 교육 수료 내역을 Google Sheet에 저장합니다."""
+    """6월 컴플라이언스 인식제고 교육 수료 내역을 제출 대기열에 기록합니다.
+
+    시트 반영은 백그라운드 전송기가 묶음으로 처리하며, 수료ID를 멱등키로 사용해 재시도 시에도 행이 중복되지 않습니다.
+    """
     client = init_google_sheet_connection()
     if not client:
         return False, "구글 시트 연결 실패 (Secrets 확인)"
 
     try:
-        spreadsheet = client.open("Audit_Result_2026")
-        try:
-            sheet = spreadsheet.worksheet(JUNE_TRAINING_SHEET_NAME)
-        except Exception:
-            sheet = spreadsheet.add_worksheet(title=JUNE_TRAINING_SHEET_NAME, rows=3000, cols=len(JUNE_TRAINING_HEADERS) + 2)
-            sheet.append_row(JUNE_TRAINING_HEADERS)
-
         # ✅ 동시 수료 제출 안정화: 저장 직전 전체 데이터 읽기(get_all_records)를 하지 않습니다.
         # 1,000명 동시 접속 상황에서 읽기 요청 한도(429)를 유발하던 중복검사는 운영 종료 후 Google Sheet에서 사번 기준으로 확인합니다.
         emp_id_str = str(record.get("사번", "")).strip()
@@ -1041,20 +2532,33 @@ def save_june_compliance_training_result(record: dict) -> tuple[bool, str]:
             record.get("이벤트추첨대상", "대상"),
             record.get("비고", ""),
         ]
-        last_error = None
-        for attempt in range(5):
-            try:
-                sheet.append_row(row, value_input_option="USER_ENTERED")
-                return True, "6월 컴플라이언스 인식제고 교육 수료 내역이 저장되었습니다."
-            except Exception as append_error:
-                last_error = append_error
-                msg = str(append_error)
-                if "429" in msg or "Quota exceeded" in msg or "RESOURCE_EXHAUSTED" in msg:
-                    time.sleep(1.2 * (attempt + 1))
-                    continue
-                raise
-        return False, f"Google Sheet 저장 요청이 일시적으로 집중되어 저장하지 못했습니다. 잠시 후 현재 화면에서 다시 제출해 주세요. ({last_error})"
+        try:
+            enqueue_sheet_append(
+                "Audit_Result_2026",
+                JUNE_TRAINING_SHEET_NAME,
+                JUNE_TRAINING_HEADERS,
+                dict(zip(JUNE_TRAINING_HEADERS, row)),
+                completion_id,
+                ["수료ID"],
+            )
+            return True, "6월 컴플라이언스 인식제고 교육 수료 내역이 저장되었습니다."
+        except Exception:
+            pass
+
+        # 대기열(로컬 디스크)을 쓸 수 없는 환경에서는 기존처럼 바로 시트에 저장합니다.
+        spreadsheet = _open_spreadsheet_cached(client, "Audit_Result_2026")
+        try:
+            sheet = _get_worksheet_cached(spreadsheet, JUNE_TRAINING_SHEET_NAME)
+        except Exception:
+            sheet = _remember_worksheet_handle(spreadsheet, spreadsheet.add_worksheet(title=JUNE_TRAINING_SHEET_NAME, rows=3000, cols=len(JUNE_TRAINING_HEADERS) + 2))
+            sheet.append_row(JUNE_TRAINING_HEADERS)
+        try:
+            _append_row_with_quota_retry(sheet, row)
+        except _WriteBehindQuotaError as quota_error:
+            return False, f"Google Sheet 저장 요청이 일시적으로 집중되어 저장하지 못했습니다. 잠시 후 현재 화면에서 다시 제출해 주세요. ({quota_error})"
+        return True, "6월 컴플라이언스 인식제고 교육 수료 내역이 저장되었습니다."
     except Exception as e:
+        _forget_stale_sheet_handles(e, spreadsheet_name="Audit_Result_2026")
         return False, str(e)
 
 # ==========================================
@@ -1570,25 +3074,113 @@ def _column_letter(column_number: int) -> str:
     return letters
 
 
+def _sheet_patch_rows(ws, headers: list[str], patches: dict[int, dict]) -> int:
+    """행 번호별 {헤더: 값} 패치를 batch_update 1회로 반영하고 반영한 셀 수를 반환합니다.
+
+    시트에 없는 헤더는 건너뛰며, 같은 행에서 이어지는 열은 하나의 범위로 묶습니다.
+    여러 행의 패치도 한 요청으로 보내므로 일부 열만 바뀐 채 남는 일이 없습니다.
+    """
+    data = []
+    cell_count = 0
+    for row_no in sorted(patches):
+        cells = sorted(
+            (headers.index(header) + 1, value)
+            for header, value in (patches[row_no] or {}).items()
+            if header in headers
+        )
+        run: list[tuple[int, object]] = []
+        for column, value in cells + [(None, None)]:
+            if run and (column is None or column != run[-1][0] + 1):
+                start_letter = _column_letter(run[0][0])
+                end_letter = _column_letter(run[-1][0])
+                data.append({
+                    "range": f"{start_letter}{row_no}:{end_letter}{row_no}",
+                    "values": [[item[1] for item in run]],
+                })
+                cell_count += len(run)
+                run = []
+            if column is not None:
+                run.append((column, value))
+    if data:
+        ws.batch_update(data, value_input_option="USER_ENTERED")
+    return cell_count
+
+
+def _sheet_delete_rows_bulk(ws, row_numbers) -> int:
+    """여러 행을 연속 구간으로 묶어 deleteDimension 요청 1회(batchUpdate)로 삭제합니다.
+
+    구간은 아래쪽부터 보내므로 같은 요청 안에서 앞선 삭제가 뒤 구간의 행번호를 바꾸지 않습니다.
+    """
+    rows = sorted({int(row) for row in row_numbers if int(row) >= 2})
+    if not rows:
+        return 0
+    spans: list[list[int]] = []
+    for row in rows:
+        if spans and row == spans[-1][1] + 1:
+            spans[-1][1] = row
+        else:
+            spans.append([row, row])
+    requests_body = [
+        {
+            "deleteDimension": {
+                "range": {
+                    "sheetId": ws.id,
+                    "dimension": "ROWS",
+                    "startIndex": start - 1,
+                    "endIndex": end,
+                }
+            }
+        }
+        for start, end in reversed(spans)
+    ]
+    ws.spreadsheet.batch_update({"requests": requests_body})
+    return len(rows)
+
+
+def _worksheet_key(ws) -> str:
+    """프로세스 캐시에서 워크시트를 구분하는 키입니다. 시트 ID는 문서 안에서만 고유하므로 문서 ID를 함께 씁니다."""
+    spreadsheet = getattr(ws, "spreadsheet", None)
+    spreadsheet_id = str(getattr(spreadsheet, "id", "") or "")
+    sheet_id = str(getattr(ws, "id", "") or getattr(ws, "title", "") or id(ws))
+    return f"{spreadsheet_id}:{sheet_id}" if spreadsheet_id else sheet_id
+
+
+def _refresh_worksheet_grid(ws) -> tuple[int, int]:
+    """시트 메타데이터를 다시 읽어 실제 행·열 크기를 반환합니다. 캐시된 핸들의 크기는 열린 시점 값이기 때문입니다."""
+    try:
+        metadata = ws.spreadsheet.fetch_sheet_metadata()
+        for sheet in metadata.get("sheets", []):
+            properties = sheet.get("properties", {})
+            if properties.get("sheetId") != ws.id:
+                continue
+            if isinstance(getattr(ws, "_properties", None), dict):
+                ws._properties.update(properties)
+            grid = properties.get("gridProperties", {})
+            return int(grid.get("rowCount", 0) or 0), int(grid.get("columnCount", 0) or 0)
+    except Exception:
+        pass
+    return int(getattr(ws, "row_count", 0) or 0), int(getattr(ws, "col_count", 0) or 0)
+
+
 def _ensure_worksheet_grid_capacity(ws, required_rows: int = 1, required_cols: int = 1):
     """Google Sheet의 행·열 크기를 저장에 필요한 만큼 자동 확장합니다.
 
     기존 시트가 과거 버전의 열 수로 생성되어 있어도 새 측정항목이 추가되면
     헤더를 쓰기 전에 필요한 열까지 자동으로 늘립니다.
+    크기는 모자란 만큼만 add_rows/add_cols로 늘리며, 다른 사용자가 추가한 행이 지워지지 않도록 절대 줄이지 않습니다.
     """
-    current_rows = int(getattr(ws, "row_count", 0) or 0)
-    current_cols = int(getattr(ws, "col_count", 0) or 0)
-    target_rows = max(current_rows, int(required_rows or 1))
-    target_cols = max(current_cols, int(required_cols or 1))
-
-    if target_rows == current_rows and target_cols == current_cols:
+    required_rows = int(required_rows or 1)
+    required_cols = int(required_cols or 1)
+    cached_rows = int(getattr(ws, "row_count", 0) or 0)
+    cached_cols = int(getattr(ws, "col_count", 0) or 0)
+    if cached_rows >= required_rows and cached_cols >= required_cols:
         return ws
 
-    try:
-        ws.resize(rows=target_rows, cols=target_cols)
-    except TypeError:
-        # 일부 gspread 버전의 위치 인자 방식도 지원합니다.
-        ws.resize(target_rows, target_cols)
+    current_rows, current_cols = _refresh_worksheet_grid(ws)
+    if required_rows > current_rows:
+        ws.add_rows(required_rows - current_rows)
+    if required_cols > current_cols:
+        ws.add_cols(required_cols - current_cols)
     return ws
 
 
@@ -1620,12 +3212,7 @@ def _rewrite_power_sheet_in_standard_order(ws) -> list[str]:
         raise RuntimeError(f"기존 Google Sheets 데이터를 읽지 못했습니다: {read_error}")
 
     current_headers = [str(value or "").strip() for value in (values[0] if values else [])]
-    standard_headers = POWER_INSPECTION_HEADERS.copy()
-    extra_headers = [
-        header for header in current_headers
-        if header and header not in standard_headers
-    ]
-    target_headers = standard_headers + extra_headers
+    target_headers = _power_target_headers(current_headers)
 
     # 이미 정확한 표준 순서이면 불필요한 전체 재작성을 하지 않습니다.
     if current_headers == target_headers:
@@ -1714,16 +3301,44 @@ def _rewrite_power_sheet_in_standard_order(ws) -> list[str]:
     return target_headers
 
 
-def _ensure_power_inspection_sheet(spreadsheet):
-    try:
-        ws = spreadsheet.worksheet(POWER_INSPECTION_SHEET_NAME)
-    except Exception:
-        ws = spreadsheet.add_worksheet(
-            title=POWER_INSPECTION_SHEET_NAME,
-            rows=10000,
-            cols=max(len(POWER_INSPECTION_HEADERS) + 5, 100),
-        )
+# 표준 헤더(POWER_INSPECTION_HEADERS)나 열 순서 규칙이 바뀌면 1씩 올립니다.
+# 저장 경로는 이 버전으로 검증된 시트에 대해 헤더 1행만 확인하고 전체 재작성은 하지 않습니다.
+POWER_INSPECTION_SCHEMA_VERSION = 1
+
+
+@st.cache_resource
+def _power_schema_state() -> dict:
+    """프로세스별 '스키마 검증 완료' 표시입니다. {_worksheet_key(ws): (version, headers)}"""
+    return {"lock": threading.RLock(), "verified": {}}
+
+
+def _power_target_headers(current_headers: list[str]) -> list[str]:
+    """표준 열 + 표준에 없는 기존 사용자 정의 열(오른쪽 끝 보존)을 반환합니다."""
+    standard_headers = POWER_INSPECTION_HEADERS.copy()
+    extra_headers = [
+        header for header in current_headers
+        if header and header not in standard_headers
+    ]
+    return standard_headers + extra_headers
+
+
+def _mark_power_schema_verified(ws, headers: list[str]) -> None:
+    state = _power_schema_state()
+    with state["lock"]:
+        state["verified"][_worksheet_key(ws)] = (POWER_INSPECTION_SCHEMA_VERSION, list(headers))
+
+
+def _power_schema_verified_headers(ws) -> list[str] | None:
+    state = _power_schema_state()
+    with state["lock"]:
+        entry = state["verified"].get(_worksheet_key(ws))
+    if not entry or entry[0] != POWER_INSPECTION_SCHEMA_VERSION:
+        return None
+    return list(entry[1])
+
 
+def _migrate_power_inspection_worksheet(ws) -> list[str]:
+    """전체 재배열·격자 확장·헤더 서식을 한 번에 적용하는 스키마 마이그레이션입니다."""
     # 데이터 유무와 관계없이 기존 행을 헤더명으로 안전하게 재매핑하여
     # 삼상전류 R → S → T → N 표준 순서를 실제 시트에 즉시 적용합니다.
     current_headers = _rewrite_power_sheet_in_standard_order(ws)
@@ -1747,7 +3362,63 @@ def _ensure_power_inspection_sheet(spreadsheet):
     except Exception:
         pass
 
-    return ws, current_headers
+    _mark_power_schema_verified(ws, current_headers)
+    # 열 순서가 바뀌었을 수 있으므로 이력 색인은 다음 조회에서 다시 만듭니다.
+    _invalidate_power_history_index()
+    return current_headers
+
+
+def _open_power_inspection_worksheet(spreadsheet) -> tuple[object, bool]:
+    """정밀점검 시트를 찾고, 없으면 새로 만듭니다. (시트, 새로 생성 여부)"""
+    try:
+        return _get_worksheet_cached(spreadsheet, POWER_INSPECTION_SHEET_NAME), False
+    except Exception:
+        ws = spreadsheet.add_worksheet(
+            title=POWER_INSPECTION_SHEET_NAME,
+            rows=10000,
+            cols=max(len(POWER_INSPECTION_HEADERS) + 5, 100),
+        )
+        _remember_worksheet_handle(spreadsheet, ws)
+        return ws, True
+
+
+def migrate_power_inspection_sheet_schema(spreadsheet=None) -> tuple[bool, str]:
+    """배포 직후 또는 관리자 버튼으로 1회 실행하는 정밀점검 시트 스키마 점검/재배열입니다."""
+    if spreadsheet is None:
+        client = init_google_sheet_connection()
+        if not client:
+            return False, "구글 시트 연결 실패: Streamlit Secrets의 gcp_service_account 설정을 확인하세요."
+        try:
+            spreadsheet = _open_spreadsheet_cached(client, POWER_INSPECTION_SPREADSHEET_NAME)
+        except Exception as error:
+            _forget_stale_sheet_handles(error, spreadsheet_name=POWER_INSPECTION_SPREADSHEET_NAME)
+            return False, f"스프레드시트를 열지 못했습니다: {error}"
+    try:
+        ws, _ = _open_power_inspection_worksheet(spreadsheet)
+        headers = _migrate_power_inspection_worksheet(ws)
+        return True, f"정밀점검 시트 스키마 v{POWER_INSPECTION_SCHEMA_VERSION} 검증 완료 · 열 {len(headers)}개"
+    except Exception as error:
+        _forget_stale_sheet_handles(error, worksheet_title=POWER_INSPECTION_SHEET_NAME)
+        return False, f"정밀점검 시트 스키마 점검 실패: {error}"
+
+
+def _ensure_power_inspection_sheet(spreadsheet):
+    """저장 경로용: 검증된 시트는 헤더 1행만 확인하고, 어긋난 경우에만 마이그레이션합니다."""
+    ws, created = _open_power_inspection_worksheet(spreadsheet)
+    if created:
+        return ws, _migrate_power_inspection_worksheet(ws)
+
+    current_headers = [str(value or "").strip() for value in ws.row_values(1)]
+    verified_headers = _power_schema_verified_headers(ws)
+    if verified_headers is not None and current_headers == verified_headers:
+        return ws, current_headers
+
+    # 프로세스 재시작 직후에도 헤더가 이미 표준 순서이면 재작성 없이 검증 표시만 남깁니다.
+    if current_headers and current_headers == _power_target_headers(current_headers):
+        _mark_power_schema_verified(ws, current_headers)
+        return ws, current_headers
+
+    return ws, _migrate_power_inspection_worksheet(ws)
 
 
 def _extract_appended_row_number(append_response) -> int | None:
@@ -2270,7 +3941,7 @@ def save_power_inspection_result(payload: dict, photos: list | None = None) -> t
         completed_count = expected_count - len(missing_items)
         completion_rate = round((completed_count / expected_count) * 100, 1)
 
-        spreadsheet = client.open(POWER_INSPECTION_SPREADSHEET_NAME)
+        spreadsheet = _open_spreadsheet_cached(client, POWER_INSPECTION_SPREADSHEET_NAME)
         ws, sheet_headers = _ensure_power_inspection_sheet(spreadsheet)
 
         now = _korea_now()
@@ -2283,6 +3954,7 @@ def save_power_inspection_result(payload: dict, photos: list | None = None) -> t
         # FIELD-SAFE: 사진은 선택사항입니다. 사진 장애가 측정값 전송 자체를 막지 않도록 분리합니다.
         photo_ids: list[str] = []
         photo_names: list[str] = []
+        photo_job_dir = ""
         power_photo_failures: list[str] = []
         power_photo_upload_allowed = bool(photos)
 
@@ -2290,28 +3962,18 @@ def save_power_inspection_result(payload: dict, photos: list | None = None) -> t
             power_photo_failures.append("사진 업로드 설정을 사용할 수 없습니다.")
             power_photo_upload_allowed = False
 
-        if photos and power_photo_upload_allowed:
-            preflight_ok, preflight_message = _worklog_apps_script_healthcheck()
-            if not preflight_ok:
-                power_photo_failures.append(f"사진 연결 사전진단 실패: {preflight_message}")
-                power_photo_upload_allowed = False
-
         if power_photo_upload_allowed:
-            for photo_index, photo in enumerate(photos, 1):
-                capture_stamp = _photo_capture_timestamp(photo, fallback_dt=now)
-                compressed, _safe_name, mime_type, photo_error = _worklog_compress_image(photo)
-                if not compressed:
-                    power_photo_failures.append(f"{photo_index}번째 사진 처리 실패: {photo_error}")
-                    continue
-                drive_name = f"정밀점검_{capture_stamp}_{inspection_id}_{photo_index:02d}.jpg"
-                photo_ok, drive_meta, upload_error = _worklog_upload_drive_image(
-                    compressed, drive_name, mime_type
-                )
-                if not photo_ok:
-                    power_photo_failures.append(f"{photo_index}번째 사진 저장 실패: {upload_error}")
-                    continue
-                photo_ids.append(str(drive_meta.get("id", "") or ""))
-                photo_names.append(str(drive_meta.get("name", drive_name) or drive_name))
+            photo_job_dir, photo_ids, photo_names, upload_failures = _worklog_stage_or_upload_photos(
+                "power",
+                inspection_id,
+                POWER_INSPECTION_SPREADSHEET_NAME,
+                ws.title,
+                "점검ID",
+                photos,
+                lambda photo_index, capture_stamp: f"정밀점검_{capture_stamp}_{inspection_id}_{photo_index:02d}.jpg",
+                now,
+            )
+            power_photo_failures.extend(upload_failures)
 
         row_map = {
             "저장일시": saved_at,
@@ -2388,13 +4050,23 @@ def save_power_inspection_result(payload: dict, photos: list | None = None) -> t
                 raise
 
         if append_response is None:
-            if photo_ids:
+            if photo_job_dir:
+                _worklog_outbox_discard(photo_job_dir)
+            elif photo_ids:
                 try:
                     _worklog_trash_drive_files(photo_ids)
                 except Exception:
                     pass
             return False, f"저장 요청이 집중되어 전송하지 못했습니다. 다시 전송해 주세요. ({last_error})", ""
 
+        if photo_job_dir:
+            _worklog_outbox_commit(photo_job_dir)
+
+        try:
+            _note_power_history_append(ws, sheet_headers, _extract_appended_row_number(append_response), row_map)
+        except Exception:
+            pass
+
         # 최종 표준 순서(R/S/T/N)에서도 N상 전류가 실제 저장됐는지 확인합니다.
         if phase_type == "삼상":
             n_phase_value = row_map.get("삼상전류_N(A)", "")
@@ -2412,65 +4084,130 @@ def save_power_inspection_result(payload: dict, photos: list | None = None) -> t
                     f"관리자에게 확인해 주세요. ({n_phase_error})"
                 ), inspection_id
 
-        photo_message = f" · 현장사진 {len(photo_ids)}/{len(photos)}장 Drive 저장" if photos else ""
+        if photo_job_dir and photo_ids:
+            photo_message = f" · 현장사진 {len(photo_ids)}/{len(photos)}장 업로드 대기(자동 전송)"
+        else:
+            photo_message = f" · 현장사진 {len(photo_ids)}/{len(photos)}장 Drive 저장" if photos else ""
         if power_photo_failures:
             photo_message += f" · ⚠️ 사진 {len(photos) - len(photo_ids)}장은 미첨부"
         return True, f"측정값과 N상 전류가 Google Sheets에 정상 저장되었습니다.{photo_message}", inspection_id
     except Exception as e:
+        _forget_stale_sheet_handles(e, spreadsheet_name=POWER_INSPECTION_SPREADSHEET_NAME)
         try:
-            if "photo_ids" in locals() and photo_ids:
+            if "photo_job_dir" in locals() and photo_job_dir:
+                staged_manifest = _worklog_outbox_read_manifest(photo_job_dir)
+                if staged_manifest and staged_manifest.get("status") == "staged":
+                    _worklog_outbox_discard(photo_job_dir)
+            elif "photo_ids" in locals() and photo_ids:
                 _worklog_trash_drive_files(photo_ids)
         except Exception:
             pass
         return False, str(e), ""
 
 
-def load_recent_power_inspection(mother: str, local: str, within_days: int = 60) -> tuple[bool, str, dict]:
-    """동일 모국·국소의 최근 측정값을 찾아 입력폼 재사용용으로 반환합니다."""
-    client = init_google_sheet_connection()
-    if not client:
-        return False, "구글 시트 연결 실패: Secrets 설정을 확인하세요.", {}
-    if mother not in POWER_STATION_MAP or local not in POWER_STATION_MAP.get(mother, []):
-        return False, "먼저 모국과 국소를 정확히 선택해 주세요.", {}
+# ------------------------------------------
+# 정밀점검 이력 색인: (모국, 국소) → [(저장일시, 행번호), ...] 저장일시 오름차순
+#   - 최초 1회는 저장일시·모국·국소 3개 열만 좁게 읽어 색인을 만듭니다.
+#   - 이후에는 마지막으로 색인한 행 다음부터만 읽고, 이 프로세스의 저장은 append 직후 바로 반영합니다.
+#   - 조회 시에는 필요한 k개 행만 batch_get으로 가져옵니다.
+# ------------------------------------------
+POWER_HISTORY_INDEX_COLUMNS = ("저장일시", "모국", "국소")
 
-    try:
-        spreadsheet = client.open(POWER_INSPECTION_SPREADSHEET_NAME)
-        try:
-            ws = spreadsheet.worksheet(POWER_INSPECTION_SHEET_NAME)
-        except Exception:
-            return False, "아직 저장된 전원 정밀점검 기록이 없습니다.", {}
 
-        values = ws.get_all_values()
-        if len(values) < 2:
-            return False, "아직 저장된 전원 정밀점검 기록이 없습니다.", {}
+@st.cache_resource
+def _power_history_index_state() -> dict:
+    return {"lock": threading.RLock(), "ws_key": None, "headers": [], "next_row": 2, "by_station": {}, "last_signature": None}
 
-        headers = values[0]
-        now_naive = _korea_now().replace(tzinfo=None)
-        cutoff = now_naive - datetime.timedelta(days=max(1, int(within_days)))
-        for row in reversed(values[1:]):
-            record = {headers[index]: row[index] if index < len(row) else "" for index in range(len(headers))}
-            if str(record.get("모국", "")).strip() != mother or str(record.get("국소", "")).strip() != local:
-                continue
-            saved_text = str(record.get("저장일시", "")).strip()
-            try:
-                saved_dt = datetime.datetime.strptime(saved_text, "%Y-%m-%d %H:%M:%S")
-            except Exception:
-                continue
-            if saved_dt < cutoff:
-                continue
-            return True, f"최근 측정값을 불러왔습니다. ({saved_text})", record
-        return False, f"최근 {within_days}일 이내 동일 국소의 저장 기록이 없습니다.", {}
-    except Exception as e:
-        return False, str(e), {}
 
+def _invalidate_power_history_index() -> None:
+    state = _power_history_index_state()
+    with state["lock"]:
+        state["ws_key"] = None
+        state["headers"] = []
+        state["next_row"] = 2
+        state["by_station"] = {}
+        state["last_signature"] = None
 
-def list_power_inspection_history(
-    mother: str,
-    local: str,
-    within_days: int = 183,
-    max_records: int = 100,
-) -> tuple[bool, str, list[dict]]:
-    """동일 모국·국소의 과거 측정기록을 최신순으로 반환합니다."""
+
+def _power_history_index_add(state: dict, saved_text: str, mother: str, local: str, row_number: int) -> None:
+    saved_text = str(saved_text or "").strip()
+    try:
+        datetime.datetime.strptime(saved_text, "%Y-%m-%d %H:%M:%S")
+    except Exception:
+        return
+    key = (str(mother or "").strip(), str(local or "").strip())
+    bisect.insort(state["by_station"].setdefault(key, []), (saved_text, int(row_number)))
+
+
+def _sync_power_history_index(ws) -> dict:
+    """색인을 시트의 마지막 행까지 따라잡게 합니다. 새 행이 없으면 마지막 색인 행 1행만 읽습니다."""
+    state = _power_history_index_state()
+    with state["lock"]:
+        ws_key = _worksheet_key(ws)
+        if state["ws_key"] != ws_key or not state["headers"]:
+            headers = [str(value or "").strip() for value in ws.row_values(1)]
+            state["ws_key"] = ws_key
+            state["headers"] = headers
+            state["next_row"] = 2
+            state["by_station"] = {}
+            state["last_signature"] = None
+
+        headers = state["headers"]
+        if not all(column in headers for column in POWER_HISTORY_INDEX_COLUMNS):
+            return state
+
+        letters = [_column_letter(headers.index(column) + 1) for column in POWER_HISTORY_INDEX_COLUMNS]
+
+        def _cell(column_values, offset):
+            if offset < len(column_values) and column_values[offset]:
+                return column_values[offset][0]
+            return ""
+
+        for _attempt in range(2):
+            start_row = state["next_row"]
+            # 마지막으로 색인한 행을 1행 겹쳐 읽어, 수동 삭제로 행이 당겨졌거나 데이터 끝이 줄었는지 확인합니다.
+            read_from = start_row - 1 if start_row > 2 else 2
+            saved_col, mother_col, local_col = ws.batch_get([f"{letter}{read_from}:{letter}" for letter in letters])
+            row_total = max(len(saved_col), len(mother_col), len(local_col))
+            skip = start_row - read_from
+            if skip:
+                overlap = (_cell(saved_col, 0), _cell(mother_col, 0), _cell(local_col, 0))
+                expected = state.get("last_signature")
+                if row_total < skip or (expected is not None and overlap != expected):
+                    # 시트의 실제 끝이 next_row보다 앞이거나 행이 밀렸으므로 색인 전체를 다시 만듭니다.
+                    state["next_row"] = 2
+                    state["by_station"] = {}
+                    state["last_signature"] = None
+                    continue
+                state["last_signature"] = overlap
+            for offset in range(skip, row_total):
+                signature = (_cell(saved_col, offset), _cell(mother_col, offset), _cell(local_col, offset))
+                _power_history_index_add(state, *signature, read_from + offset)
+                state["last_signature"] = signature
+            state["next_row"] = read_from + max(row_total, skip)
+            break
+        return state
+
+
+def _note_power_history_append(ws, sheet_headers: list[str], row_number: int | None, row_map: dict) -> None:
+    """이 프로세스에서 append한 행을 전체 재조회 없이 색인에 반영합니다."""
+    if row_number is None:
+        return
+    state = _power_history_index_state()
+    with state["lock"]:
+        if state["ws_key"] != _worksheet_key(ws) or state["headers"] != list(sheet_headers):
+            return
+        # 다른 프로세스가 사이에 추가한 행이 있으면 다음 조회의 증분 읽기에 맡깁니다.
+        if state["next_row"] != row_number:
+            return
+        _power_history_index_add(state, row_map.get("저장일시", ""), row_map.get("모국", ""), row_map.get("국소", ""), row_number)
+        # 시트에 표시되는 값은 서식이 적용될 수 있으므로, 다음 동기화에서 겹쳐 읽은 값을 기준으로 삼습니다.
+        state["last_signature"] = None
+        state["next_row"] = row_number + 1
+
+
+def _query_power_history(mother: str, local: str, within_days: int, max_records: int) -> tuple[bool, str, list[dict]]:
+    """색인으로 동일 모국·국소의 기간 내 기록을 최신순으로 최대 max_records건 반환합니다."""
     client = init_google_sheet_connection()
     if not client:
         return False, "구글 시트 연결 실패: Secrets 설정을 확인하세요.", []
@@ -2478,48 +4215,78 @@ def list_power_inspection_history(
         return False, "먼저 모국과 국소를 정확히 선택해 주세요.", []
 
     try:
-        spreadsheet = client.open(POWER_INSPECTION_SPREADSHEET_NAME)
+        spreadsheet = _open_spreadsheet_cached(client, POWER_INSPECTION_SPREADSHEET_NAME)
         try:
-            ws = spreadsheet.worksheet(POWER_INSPECTION_SHEET_NAME)
+            ws = _get_worksheet_cached(spreadsheet, POWER_INSPECTION_SHEET_NAME)
         except Exception:
             return False, "아직 저장된 전원 정밀점검 기록이 없습니다.", []
 
-        values = ws.get_all_values()
-        if len(values) < 2:
-            return False, "아직 저장된 전원 정밀점검 기록이 없습니다.", []
-
-        headers = values[0]
         now_naive = _korea_now().replace(tzinfo=None)
         cutoff = now_naive - datetime.timedelta(days=max(1, int(within_days)))
-        records: list[dict] = []
+        cutoff_text = cutoff.strftime("%Y-%m-%d %H:%M:%S")
+        limit = max(1, int(max_records))
+
+        # 관리자가 시트에서 행을 직접 삭제해 색인이 어긋난 경우 한 번 재구성 후 다시 조회합니다.
+        for attempt in range(2):
+            state = _sync_power_history_index(ws)
+            with state["lock"]:
+                headers = list(state["headers"])
+                entries = list(state["by_station"].get((mother, local), []))
+                indexed_rows = state["next_row"] - 2
+            if not headers or indexed_rows <= 0:
+                return False, "아직 저장된 전원 정밀점검 기록이 없습니다.", []
+
+            row_numbers = []
+            for saved_text, row_number in reversed(entries):
+                if saved_text < cutoff_text:
+                    break
+                row_numbers.append(row_number)
+                if len(row_numbers) >= limit:
+                    break
+            if not row_numbers:
+                return False, f"최근 {within_days}일 이내 동일 국소의 저장 기록이 없습니다.", []
+
+            last_col = _column_letter(len(headers))
+            fetched = ws.batch_get([f"A{row_number}:{last_col}{row_number}" for row_number in row_numbers])
+            records: list[dict] = []
+            for value_range in fetched:
+                row = value_range[0] if value_range else []
+                records.append({
+                    headers[index]: row[index] if index < len(row) else ""
+                    for index in range(len(headers))
+                })
+            consistent = all(
+                str(record.get("모국", "")).strip() == mother and str(record.get("국소", "")).strip() == local
+                for record in records
+            )
+            if consistent:
+                return True, f"과거 측정기록 {len(records)}건을 조회했습니다.", records
+            _invalidate_power_history_index()
+        return False, "정밀점검 이력 색인을 재구성했지만 기록이 일치하지 않습니다. 잠시 후 다시 조회해 주세요.", []
+    except Exception as e:
+        _forget_stale_sheet_handles(e, spreadsheet_name=POWER_INSPECTION_SPREADSHEET_NAME)
+        if _is_stale_sheet_handle_error(e):
+            _invalidate_power_history_index()
+        return False, str(e), []
 
-        for row in reversed(values[1:]):
-            record = {
-                headers[index]: row[index] if index < len(row) else ""
-                for index in range(len(headers))
-            }
-            if str(record.get("모국", "")).strip() != mother:
-                continue
-            if str(record.get("국소", "")).strip() != local:
-                continue
 
-            saved_text = str(record.get("저장일시", "")).strip()
-            try:
-                saved_dt = datetime.datetime.strptime(saved_text, "%Y-%m-%d %H:%M:%S")
-            except Exception:
-                continue
-            if saved_dt < cutoff:
-                continue
+def load_recent_power_inspection(mother: str, local: str, within_days: int = 60) -> tuple[bool, str, dict]:
+    """동일 모국·국소의 최근 측정값을 찾아 입력폼 재사용용으로 반환합니다."""
+    ok, message, records = _query_power_history(mother, local, within_days, max_records=1)
+    if not ok:
+        return False, message, {}
+    record = records[0]
+    return True, f"최근 측정값을 불러왔습니다. ({str(record.get('저장일시', '')).strip()})", record
 
-            records.append(record)
-            if len(records) >= max(1, int(max_records)):
-                break
 
-        if not records:
-            return False, f"최근 {within_days}일 이내 동일 국소의 저장 기록이 없습니다.", []
-        return True, f"과거 측정기록 {len(records)}건을 조회했습니다.", records
-    except Exception as e:
-        return False, str(e), []
+def list_power_inspection_history(
+    mother: str,
+    local: str,
+    within_days: int = 183,
+    max_records: int = 100,
+) -> tuple[bool, str, list[dict]]:
+    """동일 모국·국소의 과거 측정기록을 최신순으로 반환합니다."""
+    return _query_power_history(mother, local, within_days, max_records)
 
 
 def _set_power_state_from_record(record: dict) -> None:
@@ -3038,6 +4805,7 @@ def _build_power_payload_from_state(final_confirmed: bool = False) -> dict:
 
 
 def _reset_power_inspection() -> None:
+    _worklog_drop_photo_queue("power_photo_queue")
     for key in list(st.session_state.keys()):
         if key.startswith("power_") or key.startswith("_ui_power_"):
             del st.session_state[key]
@@ -3417,7 +5185,7 @@ WORK_LOG_HISTORY_HEADERS = [
 ]
 WORK_LOG_USER_HEADERS = [
     "사용자ID", "이름", "사번", "PIN_SALT", "PIN_HASH", "PIN변경필요", "활성", "최근로그인", "최근PIN변경일시",
-    "QUICK_SALT", "QUICK_HASH", "QUICK설정일시",
+    "QUICK_SALT", "QUICK_HASH", "QUICK설정일시", "QUICK_LOCATOR",
 ]
 WORK_LOG_DELETE_AUDIT_HEADERS = [
     "삭제일시", "기록ID", "작성자ID", "작성자", "삭제자ID", "삭제자", "공개범위", "사진수",
@@ -3430,6 +5198,8 @@ WORK_LOG_VISIBILITY_OPTIONS = ["공개", "비공개"]
 # 최초 인증 후에는 "영문+숫자 혼합 4자리 간편 접속코드"를 설정하여 이후 접속에 사용합니다.
 # 6자리 개인 PIN은 간편 접속코드를 잊었을 때 사용하는 복구용 인증수단으로 유지합니다.
 # PIN과 간편 접속코드는 모두 평문으로 저장하지 않고, 사용자별 salt/PBKDF2-SHA256 해시만 저장합니다.
+# 간편 접속코드는 서버 비밀키 HMAC 값(QUICK_LOCATOR)을 함께 저장해 후보 사용자를 한 번에 찾고,
+# 해당 사용자 1명에 대해서만 PBKDF2 검증을 수행합니다.
 WORK_LOG_INITIAL_PIN = "000000"
 WORK_LOG_USER_BOOTSTRAP = [
     {"사용자ID": "U001", "이름": "정청운", "사번": "10001713", "PIN_SALT": "de28394a671befb76a8fd8ec1b904d72", "PIN_HASH": "8fb388bf36dd783aeda3bbfd362b5b035df14ef1d11b64bb078085e521a4f295"},
@@ -3589,6 +5359,69 @@ def _worklog_hash_pin(pin: str, salt_hex: str) -> str:
     ).hex()
 
 
+def _worklog_quick_locator_secret() -> bytes:
+    """QUICK_LOCATOR용 서버 비밀키입니다. 별도 Secrets가 없으면 서비스 계정 개인키에서 파생합니다."""
+    secret = str(_worklog_secret_value("work_log_quick_locator_secret", "") or "").strip()
+    if secret:
+        return secret.encode("utf-8")
+    try:
+        private_key = str(st.secrets["gcp_service_account"].get("private_key", "") or "")
+    except Exception:
+        private_key = ""
+    if not private_key:
+        return b""
+    return hashlib.sha256(f"worklog-quick-locator|{private_key}".encode("utf-8")).digest()
+
+
+def _worklog_quick_locator(normalized_code: str) -> str:
+    """간편 접속코드의 조회용 HMAC 값입니다. 비밀키가 바뀌면 접두 key id로 구분합니다."""
+    secret = _worklog_quick_locator_secret()
+    if not secret or not normalized_code:
+        return ""
+    key_id = hashlib.sha256(secret).hexdigest()[:8]
+    digest = hmac.new(secret, normalized_code.encode("utf-8"), hashlib.sha256).hexdigest()
+    return f"{key_id}:{digest}"
+
+
+def _worklog_quick_code_matches(record: dict, normalized_code: str) -> bool:
+    expected_hash = str(record.get("QUICK_HASH", "") or "").strip().lower()
+    salt_hex = str(record.get("QUICK_SALT", "") or "").strip()
+    if not expected_hash or not salt_hex:
+        return False
+    actual_hash = _worklog_hash_pin(normalized_code, salt_hex).lower()
+    return bool(actual_hash) and hmac.compare_digest(expected_hash, actual_hash)
+
+
+def _worklog_find_quick_code_owners(rows: list, normalized_code: str, eligible) -> list:
+    """QUICK_LOCATOR 색인으로 후보를 찾고 후보에 대해서만 PBKDF2를 검증합니다.
+
+    현재 비밀키로 만든 locator가 없는 과거 계정만 기존 방식으로 전수 비교하며,
+    이런 계정은 다음 로그인 때 locator가 채워지므로 점점 줄어듭니다.
+    """
+    locator = _worklog_quick_locator(normalized_code)
+    key_prefix = locator.split(":", 1)[0] + ":" if locator else ""
+    by_locator: dict[str, list] = {}
+    legacy = []
+    for row_no, record in rows:
+        if not eligible(record):
+            continue
+        if not str(record.get("QUICK_HASH", "") or "").strip():
+            continue
+        stored_locator = str(record.get("QUICK_LOCATOR", "") or "").strip()
+        if key_prefix and stored_locator.startswith(key_prefix):
+            by_locator.setdefault(stored_locator, []).append((row_no, record))
+        else:
+            legacy.append((row_no, record))
+
+    candidates = by_locator.get(locator, []) if locator else []
+    matches = [(row_no, record) for row_no, record in candidates if _worklog_quick_code_matches(record, normalized_code)]
+    matches.extend(
+        (row_no, record) for row_no, record in legacy
+        if _worklog_quick_code_matches(record, normalized_code)
+    )
+    return matches
+
+
 def _worklog_ensure_headers(worksheet, desired_headers: list[str]) -> list[str]:
     """기존 열 순서를 보존한 채 필요한 헤더만 맨 뒤에 추가합니다."""
     try:
@@ -3609,22 +5442,22 @@ def _worklog_ensure_headers(worksheet, desired_headers: list[str]) -> list[str]:
                 worksheet.add_cols(needed_cols - current_cols)
         except Exception:
             pass
-        for header in missing:
-            headers.append(header)
-            worksheet.update_cell(1, len(headers), header)
+        headers.extend(missing)
+        _sheet_patch_rows(worksheet, headers, {1: {header: header for header in missing}})
     return headers
 
 
 def _worklog_ensure_user_sheet(spreadsheet):
     """개인인증 사용자 시트를 생성하고, 최초 PIN 미변경 계정은 공통 임시 PIN 000000으로 안전하게 동기화합니다."""
     try:
-        ws = spreadsheet.worksheet(WORK_LOG_USER_SHEET_NAME)
+        ws = _get_worksheet_cached(spreadsheet, WORK_LOG_USER_SHEET_NAME)
     except Exception:
         ws = spreadsheet.add_worksheet(
             title=WORK_LOG_USER_SHEET_NAME,
             rows=1000,
             cols=max(len(WORK_LOG_USER_HEADERS) + 2, 12),
         )
+        _remember_worksheet_handle(spreadsheet, ws)
         ws.append_row(WORK_LOG_USER_HEADERS, value_input_option="USER_ENTERED")
 
     headers = _worklog_ensure_headers(ws, WORK_LOG_USER_HEADERS)
@@ -3637,6 +5470,8 @@ def _worklog_ensure_user_sheet(spreadsheet):
             if value:
                 existing_rows[value] = (row_no, row)
 
+    new_rows: list[list] = []
+    pin_patches: dict[int, dict] = {}
     for bootstrap in WORK_LOG_USER_BOOTSTRAP:
         employee_no = bootstrap["사번"]
         existing = existing_rows.get(employee_no)
@@ -3648,10 +5483,7 @@ def _worklog_ensure_user_sheet(spreadsheet):
                 "최근로그인": "",
                 "최근PIN변경일시": "",
             }
-            ws.append_row(
-                [row_map.get(header, "") for header in headers],
-                value_input_option="USER_ENTERED",
-            )
+            new_rows.append([row_map.get(header, "") for header in headers])
             continue
 
         row_no, row = existing
@@ -3666,10 +5498,18 @@ def _worklog_ensure_user_sheet(spreadsheet):
                 "PIN_HASH": bootstrap["PIN_HASH"],
                 "PIN변경필요": "Y",
             }
-            for header, value in initial_updates.items():
-                if header in headers and str(row_map.get(header, "") or "") != str(value):
-                    ws.update_cell(row_no, headers.index(header) + 1, value)
+            changed = {
+                header: value
+                for header, value in initial_updates.items()
+                if str(row_map.get(header, "") or "") != str(value)
+            }
+            if changed:
+                pin_patches[row_no] = changed
 
+    if pin_patches:
+        _sheet_patch_rows(ws, headers, pin_patches)
+    if new_rows:
+        ws.append_rows(new_rows, value_input_option="USER_ENTERED")
     return ws
 
 def _worklog_read_user_by_employee(employee_no: str) -> tuple[object | None, dict, int | None]:
@@ -3682,7 +5522,7 @@ def _worklog_read_user_by_employee(employee_no: str) -> tuple[object | None, dic
     if not client:
         return None, {}, None
     try:
-        spreadsheet = client.open(WORK_LOG_SPREADSHEET_NAME)
+        spreadsheet = _open_spreadsheet_cached(client, WORK_LOG_SPREADSHEET_NAME)
         ws = _worklog_ensure_user_sheet(spreadsheet)
         values = ws.get_all_values()
         if not values:
@@ -3700,7 +5540,8 @@ def _worklog_read_user_by_employee(employee_no: str) -> tuple[object | None, dic
                 }
                 return ws, record, row_no
         return ws, {}, None
-    except Exception:
+    except Exception as error:
+        _forget_stale_sheet_handles(error, spreadsheet_name=WORK_LOG_SPREADSHEET_NAME)
         return None, {}, None
 
 
@@ -3730,7 +5571,7 @@ def _worklog_read_all_users():
     if not client:
         return None, [], []
     try:
-        spreadsheet = client.open(WORK_LOG_SPREADSHEET_NAME)
+        spreadsheet = _open_spreadsheet_cached(client, WORK_LOG_SPREADSHEET_NAME)
         ws = _worklog_ensure_user_sheet(spreadsheet)
         values = ws.get_all_values()
         if not values:
@@ -3746,12 +5587,13 @@ def _worklog_read_all_users():
             }
             rows.append((row_no, record))
         return ws, headers, rows
-    except Exception:
+    except Exception as error:
+        _forget_stale_sheet_handles(error, spreadsheet_name=WORK_LOG_SPREADSHEET_NAME)
         return None, [], []
 
 
 def _worklog_quick_code_is_duplicate(code: str, exclude_employee_no: str = "") -> bool:
-    """다른 활성 사용자와 동일한 간편 접속코드인지 해시 비교로 확인합니다."""
+    """다른 활성 사용자와 동일한 간편 접속코드인지 QUICK_LOCATOR 색인 + 후보 해시 비교로 확인합니다."""
     ok, _, normalized = _worklog_validate_quick_code(code)
     if not ok:
         return False
@@ -3760,20 +5602,13 @@ def _worklog_quick_code_is_duplicate(code: str, exclude_employee_no: str = "") -
     if ws is None:
         return False
 
-    for _, record in rows:
+    def _eligible(record: dict) -> bool:
         employee_no = re.sub(r"\D", "", str(record.get("사번", "") or ""))
         if exclude_employee_no and employee_no == exclude_employee_no:
-            continue
-        if str(record.get("활성", "Y") or "Y").strip().upper() not in {"Y", "YES", "TRUE", "1", "활성"}:
-            continue
-        expected_hash = str(record.get("QUICK_HASH", "") or "").strip().lower()
-        salt_hex = str(record.get("QUICK_SALT", "") or "").strip()
-        if not expected_hash or not salt_hex:
-            continue
-        actual_hash = _worklog_hash_pin(normalized, salt_hex).lower()
-        if actual_hash and hmac.compare_digest(expected_hash, actual_hash):
-            return True
-    return False
+            return False
+        return str(record.get("활성", "Y") or "Y").strip().upper() in {"Y", "YES", "TRUE", "1", "활성"}
+
+    return bool(_worklog_find_quick_code_owners(rows, normalized, _eligible))
 
 
 def _worklog_set_quick_code(employee_no: str, quick_code: str, confirm_code: str) -> tuple[bool, str]:
@@ -3803,10 +5638,9 @@ def _worklog_set_quick_code(employee_no: str, quick_code: str, confirm_code: str
             "QUICK_SALT": salt_hex,
             "QUICK_HASH": quick_hash,
             "QUICK설정일시": _korea_now().strftime("%Y-%m-%d %H:%M:%S"),
+            "QUICK_LOCATOR": _worklog_quick_locator(normalized),
         }
-        for header, value in updates.items():
-            if header in headers:
-                ws.update_cell(row_no, headers.index(header) + 1, value)
+        _sheet_patch_rows(ws, headers, {row_no: updates})
         return True, "간편 접속코드가 설정되었습니다. 다음 접속부터는 이 4자리 코드만 입력하면 됩니다."
     except Exception as error:
         return False, f"간편 접속코드 저장 실패: {error}"
@@ -3862,10 +5696,9 @@ def _worklog_complete_first_auth_setup(
             "QUICK_SALT": quick_salt,
             "QUICK_HASH": quick_hash,
             "QUICK설정일시": now_text,
+            "QUICK_LOCATOR": _worklog_quick_locator(normalized_quick),
         }
-        for header, value in updates.items():
-            if header in headers:
-                ws.update_cell(row_no, headers.index(header) + 1, value)
+        _sheet_patch_rows(ws, headers, {row_no: updates})
         return True, "개인 인증 설정이 완료되었습니다. 다음 접속부터는 4자리 간편 접속코드만 입력하면 됩니다."
     except Exception as error:
         return False, f"최초 인증정보 설정 실패: {error}"
@@ -3887,21 +5720,14 @@ def _worklog_authenticate_quick_code(quick_code: str) -> tuple[bool, str, dict]:
     if ws is None:
         return False, "사용자 인증정보를 불러오지 못했습니다.", {}
 
-    matches = []
-    for row_no, record in rows:
+    def _eligible(record: dict) -> bool:
         if str(record.get("활성", "Y") or "Y").strip().upper() not in {"Y", "YES", "TRUE", "1", "활성"}:
-            continue
+            return False
         # 최초 000000 단계가 끝나지 않은 계정은 간편 로그인 대상에서 제외합니다.
         must_change = str(record.get("PIN변경필요", "N") or "N").strip().upper() in {"Y", "YES", "TRUE", "1"}
-        if must_change:
-            continue
-        expected_hash = str(record.get("QUICK_HASH", "") or "").strip().lower()
-        salt_hex = str(record.get("QUICK_SALT", "") or "").strip()
-        if not expected_hash or not salt_hex:
-            continue
-        actual_hash = _worklog_hash_pin(normalized, salt_hex).lower()
-        if actual_hash and hmac.compare_digest(expected_hash, actual_hash):
-            matches.append((row_no, record))
+        return not must_change
+
+    matches = _worklog_find_quick_code_owners(rows, normalized, _eligible)
 
     if len(matches) != 1:
         failures = int(st.session_state.get("worklog_login_failures", 0) or 0) + 1
@@ -3926,12 +5752,12 @@ def _worklog_authenticate_quick_code(quick_code: str) -> tuple[bool, str, dict]:
     st.session_state["worklog_login_failures"] = 0
     st.session_state["worklog_login_locked_until"] = 0
     try:
-        if "최근로그인" in headers:
-            ws.update_cell(
-                row_no,
-                headers.index("최근로그인") + 1,
-                _korea_now().strftime("%Y-%m-%d %H:%M:%S"),
-            )
+        login_updates = {"최근로그인": _korea_now().strftime("%Y-%m-%d %H:%M:%S")}
+        # locator가 없거나 이전 비밀키로 만든 계정은 이번 인증 성공 시점에 채워 둡니다.
+        locator = _worklog_quick_locator(normalized)
+        if locator and str(record.get("QUICK_LOCATOR", "") or "").strip() != locator:
+            login_updates["QUICK_LOCATOR"] = locator
+        _sheet_patch_rows(ws, headers, {row_no: login_updates})
     except Exception:
         pass
     return True, f"{user['name']}님으로 간편 인증되었습니다.", user
@@ -3982,12 +5808,7 @@ def _worklog_authenticate_user(employee_no: str, pin: str) -> tuple[bool, str, d
 
     try:
         headers = [str(value).strip() for value in ws.row_values(1)]
-        if "최근로그인" in headers:
-            ws.update_cell(
-                row_no,
-                headers.index("최근로그인") + 1,
-                _korea_now().strftime("%Y-%m-%d %H:%M:%S"),
-            )
+        _sheet_patch_rows(ws, headers, {row_no: {"최근로그인": _korea_now().strftime("%Y-%m-%d %H:%M:%S")}})
     except Exception:
         pass
 
@@ -4028,9 +5849,7 @@ def _worklog_change_pin(employee_no: str, new_pin: str, confirm_pin: str) -> tup
             "PIN변경필요": "N",
             "최근PIN변경일시": _korea_now().strftime("%Y-%m-%d %H:%M:%S"),
         }
-        for header, value in updates.items():
-            if header in headers:
-                ws.update_cell(row_no, headers.index(header) + 1, value)
+        _sheet_patch_rows(ws, headers, {row_no: updates})
         return True, "복구용 개인 PIN이 변경되었습니다."
     except Exception as error:
         return False, f"PIN 변경 실패: {error}"
@@ -4243,8 +6062,10 @@ def _worklog_follow_apps_script_response(first_response, timeout: int = 30):
         if "script.googleusercontent.com" not in redirect_host:
             return None, f"예상하지 않은 리디렉션 주소입니다: {redirect_host or '확인 불가'}"
         try:
-            response = requests.get(
+            response = http_request(
+                "GET",
                 redirect_url,
+                "apps_script.redirect",
                 timeout=timeout,
                 allow_redirects=True,
                 headers={
@@ -4274,8 +6095,10 @@ def _worklog_apps_script_healthcheck() -> tuple[bool, str]:
 
     # 1) 익명 GET 확인
     try:
-        get_first = requests.get(
+        get_first = http_request(
+            "GET",
             upload_url,
+            "apps_script.health_get",
             timeout=20,
             allow_redirects=False,
             headers={
@@ -4314,8 +6137,10 @@ def _worklog_apps_script_healthcheck() -> tuple[bool, str]:
     }
     probe_bytes = json.dumps(probe_payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
     try:
-        post_first = requests.post(
+        post_first = http_request(
+            "POST",
             upload_url,
+            "apps_script.health_post",
             data=probe_bytes,
             headers={
                 "Content-Type": "text/plain; charset=utf-8",
@@ -4391,23 +6216,25 @@ def _worklog_drive_access_token() -> str:
 def _worklog_ensure_sheets(spreadsheet):
     """WORK LOG 본문/상태이력 시트를 생성하고 기존 열 순서를 보존한 채 신규 헤더를 보장합니다."""
     try:
-        ws = spreadsheet.worksheet(WORK_LOG_SHEET_NAME)
+        ws = _get_worksheet_cached(spreadsheet, WORK_LOG_SHEET_NAME)
     except Exception:
         ws = spreadsheet.add_worksheet(
             title=WORK_LOG_SHEET_NAME,
             rows=10000,
             cols=max(len(WORK_LOG_HEADERS) + 4, 24),
         )
+        _remember_worksheet_handle(spreadsheet, ws)
         ws.append_row(WORK_LOG_HEADERS, value_input_option="USER_ENTERED")
 
     try:
-        history_ws = spreadsheet.worksheet(WORK_LOG_HISTORY_SHEET_NAME)
+        history_ws = _get_worksheet_cached(spreadsheet, WORK_LOG_HISTORY_SHEET_NAME)
     except Exception:
         history_ws = spreadsheet.add_worksheet(
             title=WORK_LOG_HISTORY_SHEET_NAME,
             rows=20000,
             cols=max(len(WORK_LOG_HISTORY_HEADERS) + 4, 16),
         )
+        _remember_worksheet_handle(spreadsheet, history_ws)
         history_ws.append_row(WORK_LOG_HISTORY_HEADERS, value_input_option="USER_ENTERED")
 
     _worklog_ensure_headers(ws, WORK_LOG_HEADERS)
@@ -4454,21 +6281,121 @@ def _worklog_is_heif_file(uploaded_file) -> bool:
     )
 
 
-def _worklog_photo_health_cached(max_age_seconds: int = 120) -> tuple[bool, str]:
-    """Apps Script/Drive 연결을 짧게 캐시해 모바일에서 반복 네트워크 점검을 줄입니다."""
-    cache = st.session_state.get("worklog_photo_health_cache")
-    now_ts = time.time()
-    if isinstance(cache, dict):
-        cached_at = float(cache.get("at", 0) or 0)
-        if now_ts - cached_at <= max_age_seconds:
-            return bool(cache.get("ok")), str(cache.get("message", "") or "")
-    ok, message = _worklog_apps_script_healthcheck()
-    st.session_state["worklog_photo_health_cache"] = {
-        "at": now_ts,
-        "ok": bool(ok),
-        "message": str(message or ""),
+# ------------------------------------------
+# 사진 연결 상태 (healthy / degraded / down)
+#   - 실제 업로드 결과로 상태를 갱신하므로 저장할 때마다 GET+POST 사전진단을 하지 않습니다.
+#   - 상태가 없으면(unknown) 1회만 동기 진단하고, 오래되면 백그라운드에서 다시 진단합니다.
+# ------------------------------------------
+WORK_LOG_PHOTO_HEALTH_STALE_SECONDS = {"healthy": 900, "degraded": 120, "down": 60}
+WORK_LOG_PHOTO_HEALTH_DOWN_AFTER_FAILURES = 3
+
+
+@st.cache_resource
+def _worklog_photo_health_state() -> dict:
+    return {
+        "lock": threading.Lock(),
+        "state": "unknown",
+        "message": "",
+        "updated_at": 0.0,
+        "consecutive_failures": 0,
+        "probing": False,
     }
-    return bool(ok), str(message or "")
+
+
+def _worklog_photo_health_set(state_name: str, message: str, failures: int | None = None) -> None:
+    health = _worklog_photo_health_state()
+    with health["lock"]:
+        health["state"] = state_name
+        health["message"] = str(message or "")
+        health["updated_at"] = time.time()
+        if failures is not None:
+            health["consecutive_failures"] = failures
+
+
+def _worklog_photo_health_record_failure(error: str) -> None:
+    """업로드·진단 실패 1회를 반영합니다. 설정·권한 오류는 바로 down, 일시 오류는 연속 누적 시 down입니다.
+
+    실패 횟수 증가와 상태 변경을 한 잠금 안에서 처리해 동시에 실패한 스레드가 횟수를 덮어쓰지 않게 합니다.
+    """
+    permanent = any(marker in str(error) for marker in WORK_LOG_PHOTO_PERMANENT_ERROR_MARKERS)
+    health = _worklog_photo_health_state()
+    with health["lock"]:
+        health["consecutive_failures"] += 1
+        failures = health["consecutive_failures"]
+        health["state"] = "down" if permanent or failures >= WORK_LOG_PHOTO_HEALTH_DOWN_AFTER_FAILURES else "degraded"
+        health["message"] = str(error or "")
+        health["updated_at"] = time.time()
+
+
+def _worklog_photo_health_record_upload(ok: bool, error: str = "") -> None:
+    """실제 업로드 결과를 상태에 반영합니다."""
+    if ok:
+        _worklog_photo_health_set("healthy", "최근 사진 업로드 성공", failures=0)
+        return
+    _worklog_photo_health_record_failure(error)
+
+
+def _worklog_photo_health_probe() -> tuple[bool, str]:
+    """진단 1회 결과를 반영합니다. 일시 실패 1회로는 down으로 바꾸지 않습니다."""
+    ok, message = _worklog_apps_script_healthcheck()
+    if ok:
+        _worklog_photo_health_set("healthy", message, failures=0)
+    else:
+        _worklog_photo_health_record_failure(message)
+    return ok, message
+
+
+def _worklog_photo_health_probe_async() -> None:
+    health = _worklog_photo_health_state()
+    with health["lock"]:
+        if health["probing"]:
+            return
+        health["probing"] = True
+
+    def _run() -> None:
+        try:
+            _worklog_photo_health_probe()
+        except Exception:
+            pass
+        finally:
+            with health["lock"]:
+                health["probing"] = False
+
+    threading.Thread(target=_run, name="worklog-photo-health", daemon=True).start()
+
+
+def _worklog_photo_health() -> tuple[str, str]:
+    """현재 사진 연결 상태와 사유를 반환합니다. unknown일 때만 네트워크 진단을 기다립니다."""
+    health = _worklog_photo_health_state()
+    with health["lock"]:
+        state_name = health["state"]
+        message = health["message"]
+        age = time.time() - health["updated_at"]
+    if state_name == "unknown":
+        _worklog_photo_health_probe()
+        with health["lock"]:
+            return health["state"], health["message"]
+    if age > WORK_LOG_PHOTO_HEALTH_STALE_SECONDS.get(state_name, 120):
+        _worklog_photo_health_probe_async()
+    return state_name, message
+
+
+def _worklog_photo_upload_gate() -> tuple[bool, str]:
+    """저장 직전 사진 업로드 진행 여부를 판단합니다. down이 아니면 업로드를 시도합니다."""
+    state_name, message = _worklog_photo_health()
+    if state_name == "down":
+        return False, message or "사진 연결이 일시적으로 불안정합니다."
+    return True, message
+
+
+def _worklog_photo_health_cached() -> tuple[bool, str]:
+    """사진 큐 화면용 연결 상태입니다. 프로세스 공용 상태를 사용하므로 세션마다 진단하지 않습니다."""
+    state_name, message = _worklog_photo_health()
+    if state_name == "healthy":
+        return True, f"사진 연결 정상 · PHOTO ENGINE {WORK_LOG_PHOTO_ENGINE_VERSION}"
+    if state_name == "degraded":
+        return True, f"사진 연결 지연 · 업로드가 늦어지거나 실패할 수 있습니다. ({message})"
+    return False, message
 
 
 def _worklog_process_photo_submission(
@@ -4591,47 +6518,158 @@ def _worklog_render_photo_pipeline_status(
 
 
 
-def _photo_capture_timestamp(uploaded_file, fallback_dt: datetime.datetime | None = None) -> str:
-    """사진 EXIF 촬영시각을 우선 사용하고, 없으면 현재 한국시간을 파일명용 시각으로 반환합니다."""
-    fallback_dt = fallback_dt or _korea_now()
-    queued_stamp = str(getattr(uploaded_file, "_worklog_capture_stamp", "") or "").strip()
-    if re.fullmatch(r"\d{8}_\d{6}", queued_stamp):
-        return queued_stamp
+def _worklog_exif_capture_stamp(image) -> str:
+    """열린 이미지의 EXIF 촬영시각을 파일명용 YYYYmmdd_HHMMSS로 반환합니다. 없으면 빈 문자열입니다."""
     try:
-        from io import BytesIO
-        from PIL import Image
-
-        if _worklog_is_heif_file(uploaded_file):
-            _worklog_register_mobile_image_support()
-
-        raw = uploaded_file.getvalue() if uploaded_file is not None else b""
-        if raw:
-            image = Image.open(BytesIO(raw))
-            exif = image.getexif()
-            # DateTimeOriginal(36867) → DateTimeDigitized(36868) → DateTime(306) 순서
-            for tag_id in (36867, 36868, 306):
-                value = str(exif.get(tag_id, "") or "").strip()
-                if not value:
-                    continue
-                for fmt in ("%Y:%m:%d %H:%M:%S", "%Y-%m-%d %H:%M:%S"):
-                    try:
-                        captured = datetime.datetime.strptime(value[:19], fmt)
-                        return captured.strftime("%Y%m%d_%H%M%S")
-                    except Exception:
-                        continue
+        exif = image.getexif()
     except Exception:
-        pass
-    return fallback_dt.strftime("%Y%m%d_%H%M%S")
+        return ""
+    # DateTimeOriginal(36867) → DateTimeDigitized(36868) → DateTime(306) 순서
+    for tag_id in (36867, 36868, 306):
+        value = str(exif.get(tag_id, "") or "").strip()
+        if not value:
+            continue
+        for fmt in ("%Y:%m:%d %H:%M:%S", "%Y-%m-%d %H:%M:%S"):
+            try:
+                captured = datetime.datetime.strptime(value[:19], fmt)
+                return captured.strftime("%Y%m%d_%H%M%S")
+            except Exception:
+                continue
+    return ""
 
 
-def _worklog_compress_image(uploaded_file) -> tuple[bytes | None, str, str, str]:
-    """현장 사진을 방향보정하고 1600px/약 450KB 수준 JPEG로 최적화합니다."""
+WORK_LOG_JPEG_QUALITY_MAX = 84
+WORK_LOG_JPEG_QUALITY_MIN = 48
+WORK_LOG_JPEG_MIN_SCALE = 0.35
+
+
+def _worklog_encode_jpeg(image, quality: int, final: bool = False, stats: dict | None = None) -> bytes:
+    from io import BytesIO
+
+    if stats is not None:
+        stats["final" if final else "fast"] = stats.get("final" if final else "fast", 0) + 1
+    buffer = BytesIO()
+    if final:
+        image.save(buffer, format="JPEG", quality=quality, optimize=True, progressive=True)
+    else:
+        # 크기 추정용: optimize/progressive 없이 빠르게 인코딩합니다. 최종본은 이보다 작거나 같습니다.
+        image.save(buffer, format="JPEG", quality=quality)
+    return buffer.getvalue()
+
+
+def _worklog_search_jpeg_quality(image, target_bytes: int, stats: dict | None = None) -> tuple[int, int]:
+    """빠른 추정 인코딩으로 target_bytes 이하가 되는 가장 높은 품질을 이분 탐색합니다.
+
+    (품질, 해당 품질의 추정 크기)를 반환하며, 최저 품질로도 넘치면 최저 품질과 그 크기를 반환합니다.
+    """
+    size_at_max = len(_worklog_encode_jpeg(image, WORK_LOG_JPEG_QUALITY_MAX, stats=stats))
+    if size_at_max <= target_bytes:
+        return WORK_LOG_JPEG_QUALITY_MAX, size_at_max
+    size_at_min = len(_worklog_encode_jpeg(image, WORK_LOG_JPEG_QUALITY_MIN, stats=stats))
+    if size_at_min > target_bytes:
+        return WORK_LOG_JPEG_QUALITY_MIN, size_at_min
+
+    low, high = WORK_LOG_JPEG_QUALITY_MIN, WORK_LOG_JPEG_QUALITY_MAX
+    best_quality, best_size = low, size_at_min
+    while high - low > 2:
+        middle = (low + high) // 2
+        size = len(_worklog_encode_jpeg(image, middle, stats=stats))
+        if size <= target_bytes:
+            low, best_quality, best_size = middle, middle, size
+        else:
+            high = middle
+    return best_quality, best_size
+
+
+def _worklog_encode_jpeg_to_target(image, stats: dict | None = None) -> bytes:
+    """이미지를 WORK_LOG_IMAGE_TARGET_BYTES 이하 JPEG로 인코딩합니다.
+
+    품질은 84~48 사이에서 이분 탐색하고, 최저 품질로도 넘치면 초과 비율로 축소 배율을 한 번에 계산합니다.
+    (JPEG 크기는 대략 화소 수에 비례하므로 배율 ≈ √(목표 / 추정 크기))
+    최종본만 optimize/progressive로 인코딩합니다. stats를 주면 빠른/최종 인코딩 횟수를 누적합니다.
+    """
+    from PIL import Image
+
+    target = WORK_LOG_IMAGE_TARGET_BYTES
+    working = image
+    quality, estimated = _worklog_search_jpeg_quality(working, target, stats)
+    for _resize_round in range(2):
+        if estimated <= target:
+            break
+        scale = max(WORK_LOG_JPEG_MIN_SCALE, min(0.95, (target / float(estimated)) ** 0.5 * 0.95))
+        working = working.resize(
+            (max(1, int(working.width * scale)), max(1, int(working.height * scale))),
+            Image.Resampling.LANCZOS,
+        )
+        quality, estimated = _worklog_search_jpeg_quality(working, target, stats)
+
+    data = _worklog_encode_jpeg(working, quality, final=True, stats=stats)
+    if len(data) > target and quality > WORK_LOG_JPEG_QUALITY_MIN:
+        data = _worklog_encode_jpeg(working, max(WORK_LOG_JPEG_QUALITY_MIN, quality - 6), final=True, stats=stats)
+    return data
+
+
+def _worklog_reducible_image(image):
+    """reduce()가 지원하지 않는 팔레트(P)·1비트·16비트 이미지를 축소 전에 RGB(A)/L/I로 바꿉니다."""
+    if image.mode in ("L", "LA", "RGB", "RGBA", "RGBX", "CMYK", "YCbCr", "I", "F"):
+        return image
+    if image.mode == "1":
+        return image.convert("L")
+    if image.mode == "P":
+        return image.convert("RGBA" if "transparency" in image.info else "RGB")
+    if image.mode == "PA":
+        return image.convert("RGBA")
+    if image.mode.startswith("I;16"):
+        return image.convert("I")
+    return image.convert("RGBA" if "A" in image.getbands() else "RGB")
+
+
+def _worklog_ingest_photo(uploaded_file, fallback_dt: datetime.datetime | None = None, known_digests: set | None = None) -> dict:
+    """현장 사진을 한 번만 디코딩해 촬영시각·방향보정·축소·JPEG 압축·원본 해시를 함께 구합니다.
+
+    반환 dict: ok, duplicate, data, name, type, digest, capture_stamp, width, height, source_bytes, error
+    known_digests에 원본 SHA-256이 있으면 디코딩 없이 duplicate=True로 돌려줍니다.
+    JPEG는 draft()로 목표 해상도 근처에서 바로 디코딩하고, 그 밖의 형식은 reduce()로 정수배 축소한 뒤
+    마지막 한 번만 LANCZOS로 맞춥니다.
+    """
+    fallback_dt = fallback_dt or _korea_now()
+    result = {
+        "ok": False, "duplicate": False, "data": None, "name": "", "type": "", "digest": "",
+        "capture_stamp": "", "width": 0, "height": 0, "source_bytes": 0, "error": "",
+    }
     if uploaded_file is None:
-        return None, "", "", "사진이 없습니다."
-    if bool(getattr(uploaded_file, "_worklog_precompressed", False)):
+        result["error"] = "사진이 없습니다."
+        return result
+
+    original_name = str(getattr(uploaded_file, "name", "field_photo") or "field_photo")
+    safe_stem = re.sub(r"[^0-9A-Za-z가-힣_-]", "_", os.path.splitext(os.path.basename(original_name))[0])[:60] or "field_photo"
+    try:
         raw = uploaded_file.getvalue()
-        safe_name = str(getattr(uploaded_file, "_worklog_safe_name", "") or getattr(uploaded_file, "name", "field_photo.jpg"))
-        return raw, safe_name, "image/jpeg", ""
+    except Exception as error:
+        result["error"] = f"사진을 읽지 못했습니다: {error}"
+        return result
+    if not raw:
+        result["error"] = "사진 데이터가 비어 있습니다."
+        return result
+
+    result["source_bytes"] = len(raw)
+    queued_stamp = str(getattr(uploaded_file, "_worklog_capture_stamp", "") or "").strip()
+    if bool(getattr(uploaded_file, "_worklog_precompressed", False)):
+        # 세션 큐에서 이미 압축된 사진은 다시 디코딩하지 않습니다.
+        result.update({
+            "ok": True,
+            "data": raw,
+            "name": str(getattr(uploaded_file, "_worklog_safe_name", "") or original_name),
+            "type": "image/jpeg",
+            "capture_stamp": queued_stamp if re.fullmatch(r"\d{8}_\d{6}", queued_stamp) else fallback_dt.strftime("%Y%m%d_%H%M%S"),
+        })
+        return result
+
+    result["digest"] = hashlib.sha256(raw).hexdigest()
+    if known_digests is not None and result["digest"] in known_digests:
+        result["duplicate"] = True
+        return result
+
     try:
         from io import BytesIO
         from PIL import Image, ImageOps
@@ -4639,10 +6677,26 @@ def _worklog_compress_image(uploaded_file) -> tuple[bytes | None, str, str, str]
         if _worklog_is_heif_file(uploaded_file):
             heif_ok, heif_error = _worklog_register_mobile_image_support()
             if not heif_ok:
-                return None, "", "", heif_error
+                result["error"] = heif_error
+                return result
 
-        raw = uploaded_file.getvalue()
         image = Image.open(BytesIO(raw))
+        capture_stamp = _worklog_exif_capture_stamp(image)
+
+        max_side = max(image.size)
+        if max_side > WORK_LOG_IMAGE_MAX_SIDE:
+            ratio = WORK_LOG_IMAGE_MAX_SIDE / float(max_side)
+            target_size = (max(1, int(image.width * ratio)), max(1, int(image.height * ratio)))
+            if image.format == "JPEG":
+                # 디코더가 1/2·1/4·1/8 배율 중 목표 크기 이상인 가장 작은 크기로 바로 디코딩합니다.
+                image.draft("RGB", target_size)
+            else:
+                factor = int(max(image.size) // WORK_LOG_IMAGE_MAX_SIDE)
+                if factor >= 2:
+                    image = _worklog_reducible_image(image).reduce(factor)
+            if max(image.size) > WORK_LOG_IMAGE_MAX_SIDE:
+                image = image.resize(target_size, Image.Resampling.LANCZOS)
+
         image = ImageOps.exif_transpose(image)
         if image.mode not in ("RGB", "L"):
             # 투명 PNG/WebP는 흰 배경으로 합성해 현장 문서 가독성을 유지합니다.
@@ -4656,47 +6710,37 @@ def _worklog_compress_image(uploaded_file) -> tuple[bytes | None, str, str, str]
         elif image.mode == "L":
             image = image.convert("RGB")
 
-        max_side = max(image.size)
-        if max_side > WORK_LOG_IMAGE_MAX_SIDE:
-            ratio = WORK_LOG_IMAGE_MAX_SIDE / float(max_side)
-            image = image.resize(
-                (max(1, int(image.width * ratio)), max(1, int(image.height * ratio))),
-                Image.Resampling.LANCZOS,
-            )
-
-        best = None
-        working = image
-        for _resize_round in range(4):
-            for quality in (84, 78, 72, 66, 60, 54, 48):
-                buffer = BytesIO()
-                working.save(
-                    buffer,
-                    format="JPEG",
-                    quality=quality,
-                    optimize=True,
-                    progressive=True,
-                )
-                data = buffer.getvalue()
-                best = data
-                if len(data) <= WORK_LOG_IMAGE_TARGET_BYTES:
-                    break
-            if best is not None and len(best) <= WORK_LOG_IMAGE_TARGET_BYTES:
-                break
-            working = working.resize(
-                (max(1, int(working.width * 0.86)), max(1, int(working.height * 0.86))),
-                Image.Resampling.LANCZOS,
-            )
-
-        original_name = str(getattr(uploaded_file, "name", "field_photo") or "field_photo")
-        safe_stem = re.sub(r"[^0-9A-Za-z가-힣_-]", "_", os.path.splitext(os.path.basename(original_name))[0])[:60] or "field_photo"
-        return best, f"{safe_stem}.jpg", "image/jpeg", ""
+        data = _worklog_encode_jpeg_to_target(image)
+        result.update({
+            "ok": bool(data),
+            "data": data,
+            "name": f"{safe_stem}.jpg",
+            "type": "image/jpeg",
+            "capture_stamp": (
+                queued_stamp if re.fullmatch(r"\d{8}_\d{6}", queued_stamp)
+                else capture_stamp or fallback_dt.strftime("%Y%m%d_%H%M%S")
+            ),
+            "width": image.width,
+            "height": image.height,
+        })
+        return result
     except ImportError:
-        return None, "", "", "사진 자동 압축을 위해 Pillow 패키지가 필요합니다. requirements.txt에 Pillow를 추가해 주세요."
+        result["error"] = "사진 자동 압축을 위해 Pillow 패키지가 필요합니다. requirements.txt에 Pillow를 추가해 주세요."
+        return result
     except Exception as error:
-        return None, "", "", f"사진 처리 실패: {error}"
+        result["error"] = f"사진 처리 실패: {error}"
+        return result
 
 
-def _worklog_upload_drive_image(image_bytes: bytes, file_name: str, mime_type: str) -> tuple[bool, dict, str]:
+def _worklog_compress_image(uploaded_file) -> tuple[bytes | None, str, str, str]:
+    """현장 사진을 방향보정하고 1600px/약 450KB 수준 JPEG로 최적화합니다."""
+    ingested = _worklog_ingest_photo(uploaded_file)
+    if not ingested["ok"]:
+        return None, "", "", ingested["error"]
+    return ingested["data"], ingested["name"], ingested["type"], ""
+
+
+def _worklog_upload_drive_image(image_bytes: bytes | memoryview, file_name: str, mime_type: str) -> tuple[bool, dict, str]:
     """압축 사진 1장을 Apps Script로 저장합니다.
 
     JSON을 application/json으로 직접 보내지 않고 text/plain JSON으로 전송해 Apps Script 웹앱의
@@ -4718,8 +6762,10 @@ def _worklog_upload_drive_image(image_bytes: bytes, file_name: str, mime_type: s
         }
         payload_bytes = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
 
-        first = requests.post(
+        first = http_request(
+            "POST",
             upload_url,
+            "apps_script.upload",
             data=payload_bytes,
             headers={
                 "Content-Type": "text/plain; charset=utf-8",
@@ -4735,6 +6781,10 @@ def _worklog_upload_drive_image(image_bytes: bytes, file_name: str, mime_type: s
             return False, {}, redirect_error
         if response is None:
             return False, {}, "Apps Script 응답을 받지 못했습니다."
+        if response.status_code == 429:
+            return False, {}, (
+                f"PHOTO ENGINE {WORK_LOG_PHOTO_ENGINE_VERSION} · Apps Script 요청 한도 초과(429) · {WORK_LOG_PHOTO_NOT_SAVED_MARKER}"
+            )
         if response.status_code != 200:
             return False, {}, (
                 f"PHOTO ENGINE {WORK_LOG_PHOTO_ENGINE_VERSION} · Apps Script POST 실패 ({response.status_code}). "
@@ -4765,8 +6815,14 @@ def _worklog_upload_drive_image(image_bytes: bytes, file_name: str, mime_type: s
             "webViewLink": str(result.get("fileUrl", "") or ""),
             "mimeType": mime_type or "image/jpeg",
         }, ""
+    except requests.ConnectTimeout:
+        return False, {}, f"Apps Script 서버에 연결하지 못했습니다 · {WORK_LOG_PHOTO_NOT_SAVED_MARKER}"
     except requests.Timeout:
-        return False, {}, "Apps Script 사진 저장 시간이 초과되었습니다."
+        return False, {}, "Apps Script 사진 저장 시간이 초과되었습니다. 저장 여부를 알 수 없어 자동으로 다시 보내지 않습니다."
+    except requests.ConnectionError as error:
+        if any(name in str(error) for name in ("NewConnectionError", "NameResolutionError", "Failed to resolve")):
+            return False, {}, f"Apps Script 서버에 연결하지 못했습니다 · {WORK_LOG_PHOTO_NOT_SAVED_MARKER}"
+        return False, {}, f"Apps Script 사진 저장 중 연결이 끊겼습니다. 저장 여부를 알 수 없어 자동으로 다시 보내지 않습니다: {error}"
     except Exception as error:
         return False, {}, f"Apps Script 사진 저장 오류: {error}"
 
@@ -4791,8 +6847,10 @@ def _worklog_apps_script_file_action(action: str, file_ids: list[str]) -> tuple[
         "fileIds": normalized_ids,
     }
     try:
-        first = requests.post(
+        first = http_request(
+            "POST",
             upload_url,
+            "apps_script.file_action",
             data=json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8"),
             headers={
                 "Content-Type": "text/plain; charset=utf-8",
@@ -4844,51 +6902,976 @@ def _worklog_trash_drive_files(file_ids: list[str]) -> tuple[bool, list[str], st
     if ok:
         return True, processed, ""
 
-    # 부분 처리된 경우 로그 삭제를 중단하고 이미 휴지통으로 간 파일은 되돌립니다.
-    if processed:
-        _worklog_apps_script_file_action("restore_files", processed)
-    return False, [], error
+    # 부분 처리된 경우 로그 삭제를 중단하고 이미 휴지통으로 간 파일은 되돌립니다.
+    if processed:
+        _worklog_apps_script_file_action("restore_files", processed)
+    return False, [], error
+
+
+def _worklog_restore_drive_files(file_ids: list[str]) -> None:
+    normalized_ids = [str(value or "").strip() for value in file_ids if str(value or "").strip()]
+    if normalized_ids:
+        _worklog_apps_script_file_action("restore_files", normalized_ids)
+
+
+# ------------------------------------------
+# 현장사진 병렬 처리 파이프라인
+#   - 압축(방향보정·EXIF 포함)과 업로드를 서로 다른 크기 제한 스레드풀에서 겹쳐 실행합니다.
+#   - 결과는 선택 순서대로 돌려주므로 사진파일ID목록의 순서가 기존과 같습니다.
+#   - 업로드 POST는 멱등하지 않으므로 서버에 닿지 않았거나 429로 거절된 것이 확실할 때만 다시 보냅니다.
+#     시간초과·연결 끊김·5xx는 이미 저장됐을 수 있어 중복 파일을 막기 위해 최종 실패로 돌려줍니다.
+# ------------------------------------------
+WORK_LOG_PHOTO_COMPRESS_WORKERS = 3
+WORK_LOG_PHOTO_UPLOAD_WORKERS = 3
+WORK_LOG_PHOTO_UPLOAD_ATTEMPTS = 3
+WORK_LOG_PHOTO_PERMANENT_ERROR_MARKERS = ("UPLOAD_TOKEN", "upload_token", "Secrets", "HTML", "doPost 오류", "fileId가 없습니다")
+WORK_LOG_PHOTO_NOT_SAVED_MARKER = "서버에 저장되지 않았습니다."
+
+
+def _worklog_photo_upload_retry_safe(error: str) -> bool:
+    """업로드 실패가 서버에 반영되지 않은 것이 확실해 다시 보내도 중복이 생기지 않는지 판단합니다."""
+    return WORK_LOG_PHOTO_NOT_SAVED_MARKER in str(error or "")
+
+
+def _worklog_upload_drive_image_with_retry(image_bytes: bytes | memoryview, file_name: str, mime_type: str) -> tuple[bool, dict, str]:
+    last_error = ""
+    for attempt in range(WORK_LOG_PHOTO_UPLOAD_ATTEMPTS):
+        ok, drive_meta, upload_error = _worklog_upload_drive_image(image_bytes, file_name, mime_type)
+        _worklog_photo_health_record_upload(ok, upload_error)
+        if ok:
+            return True, drive_meta, ""
+        last_error = upload_error
+        if not _worklog_photo_upload_retry_safe(upload_error):
+            break
+        if attempt + 1 < WORK_LOG_PHOTO_UPLOAD_ATTEMPTS:
+            time.sleep(0.8 * (attempt + 1))
+    return False, {}, last_error
+
+
+def _worklog_prepare_photo(photo, fallback_dt: datetime.datetime) -> tuple[bytes | None, str, str, str]:
+    """사진 1장을 압축하고 파일명용 촬영시각을 구합니다. (압축본, MIME, 촬영시각, 오류)"""
+    ingested = _worklog_ingest_photo(photo, fallback_dt=fallback_dt)
+    if not ingested["ok"]:
+        return None, "", "", ingested["error"]
+    return ingested["data"], ingested["type"], ingested["capture_stamp"], ""
+
+
+def _worklog_process_and_upload_photos(photos, drive_name_for, fallback_dt: datetime.datetime) -> tuple[list[str], list[str], list[str]]:
+    """사진 목록을 병렬로 압축·업로드하고 (파일ID 목록, 파일명 목록, 실패 사유 목록)을 선택 순서대로 반환합니다.
+
+    drive_name_for(순번, 촬영시각)는 Drive 저장 파일명을 만듭니다. 순번은 1부터 시작합니다.
+    """
+    photos = list(photos or [])
+    if not photos:
+        return [], [], []
+    # HEIC 디코더 등록은 전역 상태이므로 작업 스레드를 띄우기 전에 한 번만 합니다.
+    if any(_worklog_is_heif_file(photo) for photo in photos):
+        _worklog_register_mobile_image_support()
+
+    outcomes: list[tuple[str, str, str] | None] = [None] * len(photos)
+    with ThreadPoolExecutor(
+        max_workers=min(WORK_LOG_PHOTO_COMPRESS_WORKERS, len(photos)), thread_name_prefix="worklog-photo-compress"
+    ) as compress_pool, ThreadPoolExecutor(
+        max_workers=min(WORK_LOG_PHOTO_UPLOAD_WORKERS, len(photos)), thread_name_prefix="worklog-photo-upload"
+    ) as upload_pool:
+        prepared = {
+            compress_pool.submit(_worklog_prepare_photo, photo, fallback_dt): position
+            for position, photo in enumerate(photos)
+        }
+        uploads = {}
+        for future in as_completed(prepared):
+            position = prepared[future]
+            try:
+                compressed, mime_type, capture_stamp, error = future.result()
+            except Exception as prepare_error:
+                compressed, mime_type, capture_stamp, error = None, "", "", f"사진 처리 실패: {prepare_error}"
+            if not compressed:
+                outcomes[position] = ("", "", f"{position + 1}번째 사진 처리 실패: {error}")
+                continue
+            drive_name = drive_name_for(position + 1, capture_stamp)
+            upload_future = upload_pool.submit(_worklog_upload_drive_image_with_retry, compressed, drive_name, mime_type)
+            uploads[upload_future] = (position, drive_name)
+
+        for future in as_completed(uploads):
+            position, drive_name = uploads[future]
+            try:
+                ok, drive_meta, upload_error = future.result()
+            except Exception as upload_exception:
+                ok, drive_meta, upload_error = False, {}, f"Apps Script 사진 저장 오류: {upload_exception}"
+            if ok:
+                outcomes[position] = (
+                    str(drive_meta.get("id", "") or ""),
+                    str(drive_meta.get("name", drive_name) or drive_name),
+                    "",
+                )
+            else:
+                outcomes[position] = ("", "", f"{position + 1}번째 사진 저장 실패: {upload_error}")
+
+    photo_ids: list[str] = []
+    photo_names: list[str] = []
+    failures: list[str] = []
+    for outcome in outcomes:
+        if outcome is None:
+            continue
+        file_id, file_name, failure = outcome
+        if file_id:
+            photo_ids.append(file_id)
+            photo_names.append(file_name)
+        elif failure:
+            failures.append(failure)
+    return photo_ids, photo_names, failures
+
+
+# ------------------------------------------
+# 현장사진 업로드 대기함(outbox)
+#   - 저장 시 사진은 압축만 해서 서버 로컬 디렉터리에 보관하고, 시트에는 "pending-..." 자리표시 ID를 먼저 기록합니다.
+#   - 백그라운드 업로더가 대기함을 비우며 Drive에 올리고, 끝나면 사진파일ID목록의 자리표시를 실제 ID로 바꿉니다.
+#   - manifest.json에 사진별 진행 상태를 남기므로 프로세스가 재시작돼도 이어서 올립니다.
+#   - 끝내 올리지 못한 사진은 버리지 않고 압축본과 함께 실패(failed) 작업으로 남겨 작성자가 MY WORK LOG에서
+#     다시 보낼 수 있게 합니다. 로컬 압축본은 해당 사진의 업로드가 성공한 뒤에만 지웁니다.
+# ------------------------------------------
+WORK_LOG_PHOTO_OUTBOX_DIR = os.path.join(APP_TEMP_ROOT, "photo_outbox")
+WORK_LOG_PHOTO_PENDING_PREFIX = "pending-"
+WORK_LOG_PHOTO_OUTBOX_MAX_ATTEMPTS = 8
+WORK_LOG_PHOTO_OUTBOX_STAGED_TTL_SECONDS = 3600
+
+
+@contextmanager
+def _worklog_mapped_file(path: str):
+    """파일을 복사하지 않고 읽도록 mmap한 memoryview를 빌려줍니다. with 블록 안에서만 쓸 수 있습니다.
+
+    빈 파일은 mmap할 수 없으므로 b""를 돌려줍니다. 블록을 나가면 memoryview와 mmap을 함께 닫습니다.
+    """
+    with open(path, "rb") as mapped_source:
+        if os.fstat(mapped_source.fileno()).st_size == 0:
+            yield b""
+            return
+        with mmap.mmap(mapped_source.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            view = memoryview(mapped)
+            try:
+                yield view
+            finally:
+                view.release()
+
+
+def _worklog_is_pending_photo_id(value) -> bool:
+    return str(value or "").strip().startswith(WORK_LOG_PHOTO_PENDING_PREFIX)
+
+
+def _worklog_split_photo_ids(ids_value, names_value="") -> tuple[list[str], list[str], int]:
+    """사진파일ID목록을 (업로드 완료 ID 목록, 같은 순서의 파일명 목록, 업로드 대기 수)로 나눕니다."""
+    ids = [value.strip() for value in str(ids_value or "").split("|") if value.strip()]
+    names = [value.strip() for value in str(names_value or "").split("|") if value.strip()]
+    ready_ids: list[str] = []
+    ready_names: list[str] = []
+    pending = 0
+    for position, value in enumerate(ids):
+        if _worklog_is_pending_photo_id(value):
+            pending += 1
+            continue
+        ready_ids.append(value)
+        ready_names.append(names[position] if position < len(names) else "")
+    return ready_ids, ready_names, pending
+
+
+def _worklog_outbox_write_manifest(job_dir: str, manifest: dict) -> None:
+    temp_path = os.path.join(job_dir, f"manifest.{threading.get_ident()}.tmp")
+    with open(temp_path, "w", encoding="utf-8") as manifest_file:
+        json.dump(manifest, manifest_file, ensure_ascii=False)
+    os.replace(temp_path, os.path.join(job_dir, "manifest.json"))
+
+
+def _worklog_outbox_read_manifest(job_dir: str) -> dict | None:
+    try:
+        with open(os.path.join(job_dir, "manifest.json"), "r", encoding="utf-8") as manifest_file:
+            return json.load(manifest_file)
+    except (OSError, ValueError):
+        return None
+
+
+def _worklog_outbox_stage(
+    kind: str,
+    record_id: str,
+    spreadsheet_name: str,
+    sheet_name: str,
+    id_header: str,
+    photos: list,
+    drive_name_for,
+    fallback_dt: datetime.datetime,
+) -> tuple[str, list[str], list[str], list[str]]:
+    """사진을 압축해 대기함에 보관하고 (작업 경로, 자리표시 ID 목록, 파일명 목록, 실패 사유 목록)을 반환합니다.
+
+    아직 커밋 전(staged) 상태이므로 업로더는 건드리지 않습니다. 디스크를 쓸 수 없으면 OSError를 올립니다.
+    """
+    photos = list(photos or [])
+    job_dir = os.path.join(_ensure_private_dir(WORK_LOG_PHOTO_OUTBOX_DIR), f"{kind}_{record_id}_{os.urandom(4).hex()}")
+    os.makedirs(job_dir, mode=0o700, exist_ok=False)
+
+    if any(_worklog_is_heif_file(photo) for photo in photos):
+        _worklog_register_mobile_image_support()
+    with ThreadPoolExecutor(
+        max_workers=max(1, min(WORK_LOG_PHOTO_COMPRESS_WORKERS, len(photos))), thread_name_prefix="worklog-photo-compress"
+    ) as compress_pool:
+        prepared = list(compress_pool.map(lambda photo: _worklog_prepare_photo(photo, fallback_dt), photos))
+
+    tokens: list[str] = []
+    names: list[str] = []
+    failures: list[str] = []
+    slots: list[dict] = []
+    for position, (compressed, mime_type, capture_stamp, error) in enumerate(prepared):
+        index = position + 1
+        if not compressed:
+            failures.append(f"{index}번째 사진 처리 실패: {error}")
+            continue
+        file_name = f"photo_{index:02d}.jpg"
+        with open(os.path.join(job_dir, file_name), "wb") as photo_file:
+            photo_file.write(compressed)
+        token = f"{WORK_LOG_PHOTO_PENDING_PREFIX}{record_id}-{index:02d}"
+        drive_name = drive_name_for(index, capture_stamp)
+        slots.append({
+            "token": token,
+            "file": file_name,
+            "drive_name": drive_name,
+            "mime": mime_type or "image/jpeg",
+            "status": "pending",
+            "file_id": "",
+            "file_name": "",
+            "attempts": 0,
+            "last_error": "",
+        })
+        tokens.append(token)
+        names.append(drive_name)
+
+    _worklog_outbox_write_manifest(job_dir, {
+        "kind": kind,
+        "record_id": record_id,
+        "spreadsheet": spreadsheet_name,
+        "sheet": sheet_name,
+        "id_header": id_header,
+        "status": "staged",
+        "created_at": time.time(),
+        "attempts": 0,
+        "next_attempt_at": 0.0,
+        "slots": slots,
+    })
+    return job_dir, tokens, names, failures
+
+
+def _worklog_stage_or_upload_photos(
+    kind: str,
+    record_id: str,
+    spreadsheet_name: str,
+    sheet_name: str,
+    id_header: str,
+    photos: list,
+    drive_name_for,
+    fallback_dt: datetime.datetime,
+) -> tuple[str, list[str], list[str], list[str]]:
+    """사진을 대기함에 넣고, 로컬 보관이 불가능할 때만 기존처럼 즉시 업로드합니다.
+
+    (대기함 작업 경로 또는 "", 사진 ID 목록, 파일명 목록, 실패 사유 목록)을 반환합니다.
+    작업 경로가 있으면 ID 목록은 자리표시 ID이며, 시트 저장 후 _worklog_outbox_commit을 호출해야 합니다.
+    """
+    try:
+        return _worklog_outbox_stage(
+            kind, record_id, spreadsheet_name, sheet_name, id_header, photos, drive_name_for, fallback_dt
+        )
+    except OSError:
+        pass
+
+    preflight_ok, preflight_message = _worklog_photo_upload_gate()
+    if not preflight_ok:
+        return "", [], [], [f"사진 연결 사전진단 실패: {preflight_message}"]
+    photo_ids, photo_names, failures = _worklog_process_and_upload_photos(photos, drive_name_for, fallback_dt)
+    return "", photo_ids, photo_names, failures
+
+
+def _worklog_outbox_commit(job_dir: str) -> None:
+    """시트 행 저장이 끝난 작업을 업로드 대상으로 넘깁니다."""
+    manifest = _worklog_outbox_read_manifest(job_dir)
+    if manifest is None:
+        return
+    if not manifest.get("slots"):
+        _worklog_outbox_discard(job_dir)
+        return
+    manifest["status"] = "ready"
+    _worklog_outbox_write_manifest(job_dir, manifest)
+    _worklog_photo_outbox_worker()["wake"].set()
+
+
+def _worklog_outbox_discard(job_dir: str) -> None:
+    shutil.rmtree(job_dir, ignore_errors=True)
+
+
+def _worklog_outbox_cancel_record(record_id: str) -> list[str]:
+    """기록 삭제 시 대기 중인 사진 작업을 지우고, 이미 올라간 사진은 휴지통으로 보냅니다.
+
+    휴지통으로 보낸 Drive ID 목록을 반환합니다. 잠금은 작업 디렉터리를 지우는 동안만 잡고, Drive 호출은
+    잠금 밖에서 합니다. 업로더가 그 사이 올린 사진은 업로더가 작업이 사라진 것을 보고 직접 정리합니다.
+    """
+    record_id = str(record_id or "").strip()
+    if not record_id or not os.path.isdir(WORK_LOG_PHOTO_OUTBOX_DIR):
+        return []
+    worker = _worklog_photo_outbox_worker()
+    uploaded: list[str] = []
+    with worker["lock"]:
+        for entry in os.scandir(WORK_LOG_PHOTO_OUTBOX_DIR):
+            manifest = _worklog_outbox_read_manifest(entry.path) if entry.is_dir() else None
+            if not manifest or str(manifest.get("record_id", "")) != record_id:
+                continue
+            uploaded.extend(slot.get("file_id", "") for slot in manifest.get("slots", []) if slot.get("file_id"))
+            _worklog_outbox_discard(entry.path)
+    if uploaded:
+        _worklog_trash_drive_files(uploaded)
+    return uploaded
+
+
+def _worklog_outbox_record_failures() -> dict[str, int]:
+    """업로드에 실패해 압축본을 보관 중인 사진 수를 기록ID별로 반환합니다."""
+    failures: dict[str, int] = {}
+    if not os.path.isdir(WORK_LOG_PHOTO_OUTBOX_DIR):
+        return failures
+    for entry in os.scandir(WORK_LOG_PHOTO_OUTBOX_DIR):
+        manifest = _worklog_outbox_read_manifest(entry.path) if entry.is_dir() else None
+        if not manifest or manifest.get("status") != "failed":
+            continue
+        failed = sum(1 for slot in manifest.get("slots", []) if slot.get("status") == "failed")
+        if failed:
+            record_id = str(manifest.get("record_id", ""))
+            failures[record_id] = failures.get(record_id, 0) + failed
+    return failures
+
+
+def worklog_photo_outbox_retry(record_id: str) -> int:
+    """실패로 보관 중인 기록의 사진을 다시 전송 대상으로 돌리고, 다시 보낼 사진 수를 반환합니다."""
+    record_id = str(record_id or "").strip()
+    if not record_id or not os.path.isdir(WORK_LOG_PHOTO_OUTBOX_DIR):
+        return 0
+    worker = _worklog_photo_outbox_worker()
+    retried = 0
+    with worker["lock"]:
+        for entry in os.scandir(WORK_LOG_PHOTO_OUTBOX_DIR):
+            manifest = _worklog_outbox_read_manifest(entry.path) if entry.is_dir() else None
+            if not manifest or manifest.get("status") != "failed" or str(manifest.get("record_id", "")) != record_id:
+                continue
+            for slot in manifest.get("slots", []):
+                if slot.get("status") == "failed":
+                    slot.update({"status": "pending", "attempts": 0})
+                    retried += 1
+            manifest.update({"status": "ready", "attempts": 0, "next_attempt_at": 0.0})
+            _worklog_outbox_write_manifest(entry.path, manifest)
+    if retried:
+        worker["wake"].set()
+    return retried
+
+
+@st.cache_resource
+def _worklog_record_lock_state() -> dict:
+    return {"lock": threading.Lock(), "locks": {}}
+
+
+def _worklog_record_lock(spreadsheet_name: str, sheet_name: str, record_id: str) -> threading.Lock:
+    """기록 1건의 사진 목록을 읽고-고쳐-쓰는 구간을 이 프로세스 안에서 한 번에 하나씩만 실행하게 하는 잠금입니다."""
+    state = _worklog_record_lock_state()
+    key = (str(spreadsheet_name), str(sheet_name), str(record_id))
+    with state["lock"]:
+        return state["locks"].setdefault(key, threading.Lock())
+
+
+def _worklog_outbox_patch_sheet(manifest: dict) -> bool:
+    """업로드된 사진의 자리표시 ID를 실제 Drive ID로 바꿉니다. 대상 행이 없으면 False를 반환합니다."""
+    client = init_google_sheet_connection()
+    if not client:
+        raise RuntimeError("구글 시트 연결 실패")
+    spreadsheet = _open_spreadsheet_cached(client, manifest["spreadsheet"])
+    ws = _get_worksheet_cached(spreadsheet, manifest["sheet"])
+    headers = [str(value).strip() for value in ws.row_values(1)]
+    id_header = manifest["id_header"]
+    if id_header not in headers or "사진파일ID목록" not in headers:
+        return False
+    record_id = str(manifest["record_id"])
+    # 사진 추가(append_work_log_photos)와 같은 잠금 안에서 행을 다시 읽고 이 작업의 자리표시만 바꿔 씁니다.
+    with _worklog_record_lock(manifest["spreadsheet"], manifest["sheet"], record_id):
+        updates = _worklog_outbox_patch_row(ws, headers, id_header, record_id, manifest)
+    if updates is None:
+        return False
+    if manifest.get("kind") == "worklog":
+        _worklog_table_note_patch(record_id, updates)
+    return True
+
+
+def _worklog_outbox_patch_row(ws, headers: list[str], id_header: str, record_id: str, manifest: dict) -> dict | None:
+    id_values = ws.col_values(headers.index(id_header) + 1)
+    row_no = next(
+        (position + 1 for position, value in enumerate(id_values) if position > 0 and str(value).strip() == record_id),
+        None,
+    )
+    if row_no is None:
+        return None
+
+    row = ws.row_values(row_no)
+    current = {header: (row[index] if index < len(row) else "") for index, header in enumerate(headers)}
+    ids = [value.strip() for value in str(current.get("사진파일ID목록", "") or "").split("|") if value.strip()]
+    names = [value.strip() for value in str(current.get("사진파일명목록", "") or "").split("|") if value.strip()]
+    slots = {slot["token"]: slot for slot in manifest.get("slots", [])}
+    new_ids: list[str] = []
+    new_names: list[str] = []
+    for position, value in enumerate(ids):
+        slot = slots.get(value)
+        if slot is not None and slot.get("status") == "done":
+            new_ids.append(slot["file_id"])
+            new_names.append(slot.get("file_name") or slot["drive_name"])
+        else:
+            # 실패한 사진은 자리표시 ID를 그대로 두어 다시 보낸 뒤 같은 자리에 반영합니다.
+            new_ids.append(value)
+            new_names.append(names[position] if position < len(names) else "")
+    updates = {
+        "사진수": len(new_ids),
+        "사진파일ID목록": "|".join(new_ids),
+        "사진파일명목록": "|".join(new_names),
+    }
+    if "최근수정일시" in headers:
+        updates["최근수정일시"] = _korea_now().strftime("%Y-%m-%d %H:%M:%S")
+    _sheet_patch_rows(ws, headers, {row_no: updates})
+    return updates
+
+
+def _worklog_outbox_backoff(manifest: dict) -> None:
+    manifest["attempts"] = int(manifest.get("attempts", 0)) + 1
+    manifest["next_attempt_at"] = time.time() + min(600, 15 * (2 ** min(manifest["attempts"], 6)))
+
+
+def _worklog_photo_outbox_process_job(worker: dict, job_dir: str, health_state: str) -> None:
+    """작업 1건을 올리고 시트에 반영합니다.
+
+    대기 사진은 WORK_LOG_PHOTO_UPLOAD_WORKERS개까지 동시에 올리고, 사진마다 끝나는 대로 manifest에 기록합니다.
+    worker["lock"]은 manifest를 읽고 고치는 동안만 잡고, Drive 업로드·시트 반영 같은 네트워크 호출은
+    잠금 밖에서 합니다. 잠금을 다시 잡았을 때 작업이 사라졌으면(기록 삭제) 방금 올린 사진을 휴지통으로 보냅니다.
+    """
+    with worker["lock"]:
+        manifest = _worklog_outbox_read_manifest(job_dir)
+        if manifest is None:
+            return
+        now_ts = time.time()
+        if manifest.get("status") == "staged":
+            # 시트 저장 전에 중단된 작업은 일정 시간이 지나면 정리합니다.
+            if now_ts - float(manifest.get("created_at", now_ts)) > WORK_LOG_PHOTO_OUTBOX_STAGED_TTL_SECONDS:
+                _worklog_outbox_discard(job_dir)
+            return
+        if manifest.get("status") != "ready":
+            # 실패(failed) 작업은 작성자가 다시 보내기를 누를 때까지 그대로 보관합니다.
+            return
+        if float(manifest.get("next_attempt_at", 0) or 0) > now_ts:
+            return
+        if health_state == "down":
+            manifest["next_attempt_at"] = now_ts + 60
+            _worklog_outbox_write_manifest(job_dir, manifest)
+            return
+        pending_slots = [dict(slot) for slot in manifest.get("slots", []) if slot.get("status") == "pending"]
+
+    def _upload_one(claimed: dict) -> tuple[bool, dict, str]:
+        # 압축본을 bytes로 복사하지 않고 mmap 그대로 base64 인코딩에 넘깁니다(업로드 오류는 안에서 처리됨).
+        try:
+            with _worklog_mapped_file(os.path.join(job_dir, claimed["file"])) as data:
+                return _worklog_upload_drive_image_with_retry(data, claimed["drive_name"], claimed["mime"])
+        except (OSError, ValueError) as read_error:
+            return False, {}, f"대기 사진을 읽지 못했습니다: {read_error}"
+
+    cancelled = False
+    orphaned_uploads: list[str] = []
+    if pending_slots:
+        with ThreadPoolExecutor(
+            max_workers=min(WORK_LOG_PHOTO_UPLOAD_WORKERS, len(pending_slots)), thread_name_prefix="worklog-photo-outbox-upload"
+        ) as upload_pool:
+            futures = {upload_pool.submit(_upload_one, claimed): claimed for claimed in pending_slots}
+            for future in as_completed(futures):
+                claimed = futures[future]
+                try:
+                    ok, drive_meta, upload_error = future.result()
+                except Exception as upload_exception:
+                    ok, drive_meta, upload_error = False, {}, f"Apps Script 사진 저장 오류: {upload_exception}"
+                uploaded_id = str(drive_meta.get("id", "") or "") if ok else ""
+
+                # 사진마다 끝나는 즉시 manifest에 반영해 중간에 멈춰도 완료된 사진을 다시 올리지 않습니다.
+                with worker["lock"]:
+                    manifest = _worklog_outbox_read_manifest(job_dir)
+                    slot = next(
+                        (item for item in (manifest or {}).get("slots", []) if item.get("token") == claimed["token"]),
+                        None,
+                    )
+                    if slot is not None:
+                        slot["attempts"] = int(slot.get("attempts", 0)) + 1
+                        if ok:
+                            slot.update({
+                                "status": "done",
+                                "file_id": uploaded_id,
+                                "file_name": str(drive_meta.get("name", slot["drive_name"]) or slot["drive_name"]),
+                                "last_error": "",
+                            })
+                            try:
+                                os.remove(os.path.join(job_dir, claimed["file"]))
+                            except OSError:
+                                pass
+                        else:
+                            slot["last_error"] = upload_error
+                            # 저장 여부가 불확실한 실패는 자동 재전송하지 않고 실패로 남겨 중복 파일을 막습니다.
+                            retry_safe = _worklog_photo_upload_retry_safe(upload_error)
+                            if not retry_safe or slot["attempts"] >= WORK_LOG_PHOTO_OUTBOX_MAX_ATTEMPTS:
+                                slot["status"] = "failed"
+                            worker["last_error"] = upload_error
+                        _worklog_outbox_write_manifest(job_dir, manifest)
+                if slot is None:
+                    # 업로드하는 사이 기록이 삭제됐습니다. 이 작업에서 올린 사진이 남지 않게 모아서 정리합니다.
+                    cancelled = True
+                    if uploaded_id:
+                        orphaned_uploads.append(uploaded_id)
+    if orphaned_uploads:
+        _worklog_trash_drive_files(orphaned_uploads)
+    if cancelled:
+        return
+
+    with worker["lock"]:
+        manifest = _worklog_outbox_read_manifest(job_dir)
+        if manifest is None:
+            return
+        slots = manifest.get("slots", [])
+        if any(slot.get("status") == "pending" for slot in slots):
+            _worklog_outbox_backoff(manifest)
+            _worklog_outbox_write_manifest(job_dir, manifest)
+            return
+        needs_patch = any(slot.get("status") == "done" and not slot.get("patched") for slot in slots)
+
+    found = True
+    if needs_patch:
+        try:
+            found = _worklog_outbox_patch_sheet(manifest)
+        except Exception as patch_error:
+            _forget_stale_sheet_handles(patch_error, spreadsheet_name=manifest.get("spreadsheet"))
+            worker["last_error"] = f"사진 ID 반영 실패: {patch_error}"
+            with worker["lock"]:
+                current = _worklog_outbox_read_manifest(job_dir)
+                if current is not None:
+                    _worklog_outbox_backoff(current)
+                    _worklog_outbox_write_manifest(job_dir, current)
+            return
+
+    orphaned: list[str] = []
+    with worker["lock"]:
+        current = _worklog_outbox_read_manifest(job_dir)
+        if current is None:
+            return
+        if not found:
+            # 그 사이 기록이 삭제된 경우 올린 사진을 휴지통으로 보내 orphan을 남기지 않습니다.
+            orphaned = [slot["file_id"] for slot in current.get("slots", []) if slot.get("file_id")]
+            _worklog_outbox_discard(job_dir)
+        else:
+            for slot in current.get("slots", []):
+                if slot.get("status") == "done":
+                    slot["patched"] = True
+            failed = [slot for slot in current.get("slots", []) if slot.get("status") == "failed"]
+            if failed:
+                current["status"] = "failed"
+                _worklog_outbox_write_manifest(job_dir, current)
+                worker["last_error"] = f"기록 {current.get('record_id', '')}: 사진 {len(failed)}장 업로드 실패 · 작성자 재시도 대기"
+            else:
+                _worklog_outbox_discard(job_dir)
+            worker["last_flush_at"] = _korea_now().strftime("%Y-%m-%d %H:%M:%S")
+    if orphaned:
+        _worklog_trash_drive_files(orphaned)
+
+
+def _worklog_photo_outbox_drain_once(worker: dict) -> None:
+    if not os.path.isdir(WORK_LOG_PHOTO_OUTBOX_DIR):
+        return
+    health_state, _health_message = _worklog_photo_health()
+    for entry in sorted(os.scandir(WORK_LOG_PHOTO_OUTBOX_DIR), key=lambda item: item.name):
+        if entry.is_dir():
+            _worklog_photo_outbox_process_job(worker, entry.path, health_state)
+
+
+def _worklog_photo_outbox_loop(worker: dict) -> None:
+    while True:
+        worker["wake"].wait(timeout=15)
+        worker["wake"].clear()
+        try:
+            _worklog_photo_outbox_drain_once(worker)
+        except Exception as error:
+            worker["last_error"] = str(error)
+
+
+@st.cache_resource
+def _worklog_photo_outbox_worker() -> dict:
+    """프로세스당 1개의 사진 업로더를 띄웁니다. 재시작 시 남은 대기함부터 이어서 올립니다."""
+    worker = {"wake": threading.Event(), "lock": threading.RLock(), "last_error": "", "last_flush_at": ""}
+    thread = threading.Thread(target=_worklog_photo_outbox_loop, args=(worker,), name="worklog-photo-outbox", daemon=True)
+    thread.start()
+    worker["thread"] = thread
+    worker["wake"].set()
+    return worker
+
+
+def worklog_photo_outbox_status() -> dict:
+    """관리자 화면용 사진 대기함 요약입니다."""
+    worker = _worklog_photo_outbox_worker()
+    status = {"jobs": 0, "pending_photos": 0, "failed_photos": 0, "last_error": worker.get("last_error", ""), "last_flush_at": worker.get("last_flush_at", "")}
+    if not os.path.isdir(WORK_LOG_PHOTO_OUTBOX_DIR):
+        return status
+    for entry in os.scandir(WORK_LOG_PHOTO_OUTBOX_DIR):
+        manifest = _worklog_outbox_read_manifest(entry.path) if entry.is_dir() else None
+        if not manifest or manifest.get("status") not in ("ready", "failed"):
+            continue
+        status["jobs"] += 1
+        for slot in manifest.get("slots", []):
+            if slot.get("status") == "pending":
+                status["pending_photos"] += 1
+            elif slot.get("status") == "failed":
+                status["failed_photos"] += 1
+    return status
+
+
+# ------------------------------------------
+# Drive 사진 디스크 캐시
+#   - Drive 파일ID별 원본과 미리보기용 썸네일을 로컬 디스크에 보관합니다(파일ID의 내용은 바뀌지 않음).
+#   - 전체 용량 한도를 넘으면 가장 오래 사용하지 않은 파일부터 지웁니다(LRU).
+#   - 목록·상세 화면은 썸네일만 쓰고, 원본은 다운로드를 요청할 때만 읽습니다.
+# ------------------------------------------
+WORK_LOG_PHOTO_CACHE_DIR = os.path.join(APP_TEMP_ROOT, "photo_cache")
+WORK_LOG_PHOTO_CACHE_MAX_BYTES = 512 * 1024 * 1024
+WORK_LOG_PHOTO_THUMB_MAX_SIDE = 480
+WORK_LOG_PHOTO_DOWNLOAD_MAX_BYTES = 8 * 1024 * 1024
+
+
+@st.cache_resource
+def _worklog_photo_cache_state() -> dict:
+    """캐시 파일 목록(경로 → 크기)을 최근 사용 순서로 보관합니다. 최초 1회 디렉터리를 훑어 복원합니다."""
+    entries: dict[str, int] = {}
+    try:
+        _ensure_private_dir(WORK_LOG_PHOTO_CACHE_DIR)
+        existing = []
+        for entry in os.scandir(WORK_LOG_PHOTO_CACHE_DIR):
+            if entry.is_file() and entry.name.endswith(".jpg"):
+                stat = entry.stat()
+                existing.append((stat.st_mtime, entry.path, stat.st_size))
+        for _mtime, path, size in sorted(existing):
+            entries[path] = size
+    except Exception:
+        pass
+    return {"lock": threading.RLock(), "entries": entries, "total": sum(entries.values())}
+
+
+def _worklog_photo_cache_path(file_id: str, variant: str) -> str:
+    digest = hashlib.sha256(str(file_id).encode("utf-8")).hexdigest()[:40]
+    return os.path.join(WORK_LOG_PHOTO_CACHE_DIR, f"{digest}.{variant}.jpg")
+
+
+def _worklog_photo_cache_evict(state: dict) -> None:
+    """state["lock"]을 잡은 상태에서 호출합니다. 합계가 한도 아래로 내려갈 때까지 가장 오래된 파일부터 지웁니다."""
+    while state["total"] > WORK_LOG_PHOTO_CACHE_MAX_BYTES and len(state["entries"]) > 1:
+        oldest_path = next(iter(state["entries"]))
+        state["total"] -= state["entries"].pop(oldest_path)
+        try:
+            os.remove(oldest_path)
+        except OSError:
+            pass
+
+
+def _worklog_photo_cache_get(file_id: str, variant: str) -> bytes | None:
+    path = _worklog_photo_cache_path(file_id, variant)
+    state = _worklog_photo_cache_state()
+    try:
+        with open(path, "rb") as cached_file:
+            data = cached_file.read()
+    except OSError:
+        with state["lock"]:
+            size = state["entries"].pop(path, None)
+            if size is not None:
+                state["total"] -= size
+        return None
+    with state["lock"]:
+        size = state["entries"].pop(path, None)
+        if size is None:
+            # 다른 프로세스가 쓴 파일을 처음 만나면 용량 합계에도 넣고 한도를 다시 맞춥니다.
+            size = len(data)
+            state["total"] += size
+        state["entries"][path] = size
+        _worklog_photo_cache_evict(state)
+    try:
+        os.utime(path, None)
+    except OSError:
+        pass
+    return data
+
+
+def _worklog_photo_cache_put(file_id: str, variant: str, data: bytes) -> None:
+    if not data:
+        return
+    path = _worklog_photo_cache_path(file_id, variant)
+    state = _worklog_photo_cache_state()
+    try:
+        os.makedirs(WORK_LOG_PHOTO_CACHE_DIR, mode=0o700, exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, "wb") as cached_file:
+            cached_file.write(data)
+        os.replace(temp_path, path)
+    except OSError:
+        return
+    with state["lock"]:
+        previous = state["entries"].pop(path, 0)
+        state["entries"][path] = len(data)
+        state["total"] += len(data) - previous
+        _worklog_photo_cache_evict(state)
+
+
+def _worklog_make_thumbnail(image_bytes: bytes) -> bytes | None:
+    try:
+        from io import BytesIO
+        from PIL import Image
+
+        image = Image.open(BytesIO(image_bytes))
+        image.draft("RGB", (WORK_LOG_PHOTO_THUMB_MAX_SIDE, WORK_LOG_PHOTO_THUMB_MAX_SIDE))
+        image = image.convert("RGB")
+        image.thumbnail((WORK_LOG_PHOTO_THUMB_MAX_SIDE, WORK_LOG_PHOTO_THUMB_MAX_SIDE), Image.Resampling.LANCZOS)
+        buffer = BytesIO()
+        image.save(buffer, format="JPEG", quality=76, optimize=True)
+        return buffer.getvalue()
+    except Exception:
+        return None
+
+
+WORK_LOG_PHOTO_FETCH_WORKERS = 4
+
+
+def _worklog_fetch_drive_image(file_id: str, token: str) -> bytes | None:
+    try:
+        response = http_request(
+            "GET",
+            f"https://www.googleapis.com/drive/v3/files/{file_id}",
+            "drive.download",
+            params={"alt": "media", "supportsAllDrives": "true"},
+            headers={"Authorization": f"Bearer {token}"},
+            timeout=25,
+        )
+        if response.status_code == 200 and len(response.content) <= WORK_LOG_PHOTO_DOWNLOAD_MAX_BYTES:
+            return response.content
+    except Exception:
+        pass
+    return None
+
+
+def _worklog_download_drive_image(file_id: str) -> bytes | None:
+    """비공개 Drive 사진 원본을 서비스 계정으로 읽습니다. 디스크 캐시에 있으면 Drive를 호출하지 않습니다."""
+    file_id = str(file_id or "").strip()
+    if not file_id:
+        return None
+    cached = _worklog_photo_cache_get(file_id, "orig")
+    if cached:
+        return cached
+    token = _worklog_drive_access_token()
+    if not token:
+        return None
+    photo_bytes = _worklog_fetch_drive_image(file_id, token)
+    if photo_bytes:
+        _worklog_photo_cache_put(file_id, "orig", photo_bytes)
+    return photo_bytes
+
+
+def _worklog_thumbnail_from_original(file_id: str, original: bytes | None) -> bytes | None:
+    if not original:
+        return None
+    thumbnail = _worklog_make_thumbnail(original)
+    if not thumbnail:
+        return original
+    _worklog_photo_cache_put(file_id, "thumb", thumbnail)
+    return thumbnail
+
+
+def _worklog_iter_drive_photos(file_ids: list[str], variant: str = "thumb"):
+    """여러 사진을 (순번, 파일ID, bytes 또는 None) 형태로 도착하는 대로 내보냅니다.
+
+    디스크 캐시에 있는 사진을 먼저 내보내고, 나머지는 액세스 토큰 1개와 공유 연결 풀로 동시에 받습니다.
+    variant는 "thumb"(미리보기) 또는 "orig"(원본)입니다.
+    """
+    missing: list[tuple[int, str]] = []
+    for position, file_id in enumerate(file_ids):
+        file_id = str(file_id or "").strip()
+        cached = _worklog_photo_cache_get(file_id, variant) if file_id else None
+        if cached or not file_id:
+            yield position, file_id, cached
+        else:
+            missing.append((position, file_id))
+    if not missing:
+        return
+
+    token = _worklog_drive_access_token()
+    if not token:
+        for position, file_id in missing:
+            yield position, file_id, None
+        return
+
+    def _fetch(file_id: str) -> bytes | None:
+        original = _worklog_photo_cache_get(file_id, "orig") or _worklog_fetch_drive_image(file_id, token)
+        if not original:
+            return None
+        _worklog_photo_cache_put(file_id, "orig", original)
+        if variant == "thumb":
+            return _worklog_thumbnail_from_original(file_id, original)
+        return original
+
+    with ThreadPoolExecutor(
+        max_workers=min(WORK_LOG_PHOTO_FETCH_WORKERS, len(missing)), thread_name_prefix="worklog-photo-fetch"
+    ) as pool:
+        futures = {pool.submit(_fetch, file_id): (position, file_id) for position, file_id in missing}
+        for future in as_completed(futures):
+            position, file_id = futures[future]
+            try:
+                yield position, file_id, future.result()
+            except Exception:
+                yield position, file_id, None
+
+
+def _worklog_render_original_download(file_id: str, file_name: str, key: str) -> None:
+    """사진 원본은 사용자가 다운로드를 요청한 뒤에만 읽어 download_button에 싣습니다."""
+    ready_key = f"{key}_ready"
+    if st.session_state.get(ready_key):
+        original = _worklog_download_drive_image(file_id)
+        if original:
+            st.download_button(
+                "📥 사진 다운로드",
+                data=original,
+                file_name=file_name,
+                mime="image/jpeg",
+                use_container_width=True,
+                key=key,
+            )
+        else:
+            st.caption("원본 사진을 읽지 못했습니다.")
+    elif st.button("📥 원본 다운로드 준비", key=f"{key}_prepare", use_container_width=True):
+        st.session_state[ready_key] = True
+        st.rerun()
+
 
+WORK_LOG_PHOTO_ZIP_DIR = os.path.join(APP_TEMP_ROOT, "photo_zip")
+WORK_LOG_PHOTO_ZIP_MAX_BYTES = 150 * 1024 * 1024
+WORK_LOG_PHOTO_ZIP_TTL_SECONDS = 3600
 
-def _worklog_restore_drive_files(file_ids: list[str]) -> None:
-    normalized_ids = [str(value or "").strip() for value in file_ids if str(value or "").strip()]
-    if normalized_ids:
-        _worklog_apps_script_file_action("restore_files", normalized_ids)
 
+def _worklog_build_photo_zip(record_key: str, entries: list[tuple[str, str]], rebuild: bool = False) -> tuple[str | None, int, str]:
+    """(파일ID, 압축파일 내 이름) 목록으로 사진 ZIP을 임시 파일에 만들고 (경로, 사진 수, 오류)를 반환합니다.
 
-@st.cache_data(ttl=300, show_spinner=False)
-def _worklog_download_drive_image(file_id: str) -> bytes | None:
-    """비공개 Drive 사진을 서비스 계정으로 읽어 최근 기록 썸네일에 사용합니다."""
-    file_id = str(file_id or "").strip()
-    if not file_id:
-        return None
-    token = _worklog_drive_access_token()
-    if not token:
-        return None
+    JPEG는 다시 압축해도 줄지 않으므로 ZIP_STORED로 사진을 받는 대로 한 장씩 기록합니다.
+    같은 기록·같은 사진 목록이면 만들어 둔 파일을 재사용하며(rebuild=True면 새로 만듦), 용량 한도를 넘으면 중단합니다.
+    """
+    import zipfile
+
+    entries = [(str(file_id).strip(), str(name)) for file_id, name in entries if str(file_id).strip()]
+    if not entries:
+        return None, 0, "ZIP으로 묶을 사진이 없습니다."
+    list_digest = hashlib.sha256(
+        json.dumps([record_key, entries], ensure_ascii=False).encode("utf-8")
+    ).hexdigest()[:32]
+    _ensure_private_dir(WORK_LOG_PHOTO_ZIP_DIR)
+    zip_path = os.path.join(WORK_LOG_PHOTO_ZIP_DIR, f"{list_digest}.zip")
+    count_path = f"{zip_path}.count"
+    if not rebuild and os.path.exists(zip_path) and os.path.exists(count_path):
+        try:
+            with open(count_path, "r", encoding="utf-8") as count_file:
+                zip_count = int(count_file.read().strip() or 0)
+            # 재사용하는 ZIP은 수정시각을 갱신해 다른 세션의 정리 대상에서 늦춥니다.
+            os.utime(zip_path)
+            os.utime(count_path)
+            return zip_path, zip_count, ""
+        except (OSError, ValueError):
+            pass
+
+    # 오래된 ZIP은 새로 만들 때 함께 정리합니다.
+    now_ts = time.time()
+    for entry in os.scandir(WORK_LOG_PHOTO_ZIP_DIR):
+        try:
+            if entry.is_file() and now_ts - entry.stat().st_mtime > WORK_LOG_PHOTO_ZIP_TTL_SECONDS:
+                os.remove(entry.path)
+        except OSError:
+            continue
+
+    names = {file_id: name for file_id, name in entries}
+    written = 0
+    total_bytes = 0
+    temp_file = tempfile.NamedTemporaryFile(dir=WORK_LOG_PHOTO_ZIP_DIR, suffix=".part", delete=False)
     try:
-        response = requests.get(
-            f"https://www.googleapis.com/drive/v3/files/{file_id}",
-            params={"alt": "media", "supportsAllDrives": "true"},
-            headers={"Authorization": f"Bearer {token}"},
-            timeout=25,
+        with temp_file, zipfile.ZipFile(temp_file, "w", compression=zipfile.ZIP_STORED) as photo_zip:
+            for _position, file_id, original in _worklog_iter_drive_photos([file_id for file_id, _ in entries], variant="orig"):
+                if not original:
+                    continue
+                total_bytes += len(original)
+                if total_bytes > WORK_LOG_PHOTO_ZIP_MAX_BYTES:
+                    raise ValueError(f"사진 용량이 ZIP 한도({WORK_LOG_PHOTO_ZIP_MAX_BYTES // (1024 * 1024)}MB)를 넘습니다.")
+                with photo_zip.open(names[file_id], "w") as member:
+                    member.write(original)
+                written += 1
+        if not written:
+            os.remove(temp_file.name)
+            return None, 0, "사진 파일을 읽을 수 없습니다."
+        os.replace(temp_file.name, zip_path)
+        with open(count_path, "w", encoding="utf-8") as count_file:
+            count_file.write(str(written))
+        return zip_path, written, ""
+    except Exception as error:
+        try:
+            os.remove(temp_file.name)
+        except OSError:
+            pass
+        return None, 0, str(error)
+
+
+def _worklog_render_photo_zip_download(record_key: str, entries: list[tuple[str, str]], zip_name: str, key: str, primary: bool = False) -> None:
+    """전체 ZIP은 사용자가 요청했을 때만 만들고 download_button에 싣습니다.
+
+    download_button은 전달한 파일을 끝까지 읽어 Streamlit 미디어 저장소에 올리므로, 요청한 동안에는
+    ZIP 한 벌이 메모리에 올라갑니다. 임시 파일은 사진을 받는 동안 메모리에 쌓지 않고 재실행 때 다시
+    만들지 않기 위한 것입니다. 다른 세션의 정리로 파일이 사라졌으면 한 번 새로 만듭니다.
+    """
+    ready_key = f"{key}_ready"
+    button_type = "primary" if primary else "secondary"
+    if st.session_state.get(ready_key):
+        zip_data = None
+        zip_count, zip_error = 0, ""
+        for rebuild in (False, True):
+            zip_path, zip_count, zip_error = _worklog_build_photo_zip(record_key, entries, rebuild=rebuild)
+            if not zip_path:
+                break
+            try:
+                with open(zip_path, "rb") as zip_file:
+                    zip_data = zip_file.read()
+                break
+            except FileNotFoundError:
+                zip_error = "임시 ZIP 파일이 다른 세션의 정리로 삭제되었습니다."
+                continue
+        if zip_data is None:
+            st.warning(f"사진 ZIP 파일을 만들지 못했습니다. 개별 다운로드를 이용해 주세요. ({zip_error})")
+            return
+        st.download_button(
+            f"📦 사진 {zip_count}장 전체 ZIP 다운로드",
+            data=zip_data,
+            file_name=zip_name.replace("{count}", str(zip_count)),
+            mime="application/zip",
+            use_container_width=True,
+            type=button_type,
+            key=key,
         )
-        if response.status_code == 200 and len(response.content) <= 8 * 1024 * 1024:
-            return response.content
-    except Exception:
-        pass
-    return None
+    elif st.button(f"📦 사진 {len(entries)}장 ZIP 만들기", key=f"{key}_prepare", use_container_width=True, type=button_type):
+        st.session_state[ready_key] = True
+        st.rerun()
 
 
 def _render_power_photo_download(record, key_prefix: str) -> None:
     """정밀점검 1건에 연결된 비공개 Drive 사진을 전체보기/개별/ZIP 다운로드로 제공합니다."""
-    photo_ids = [
-        value.strip() for value in str(record.get("사진파일ID목록", "") or "").split("|") if value.strip()
-    ]
-    photo_names = [
-        value.strip() for value in str(record.get("사진파일명목록", "") or "").split("|") if value.strip()
-    ]
+    photo_ids, photo_names, pending_photo_count = _worklog_split_photo_ids(
+        record.get("사진파일ID목록", ""), record.get("사진파일명목록", "")
+    )
+    if pending_photo_count:
+        st.info(f"📤 현장사진 {pending_photo_count}장은 업로드 대기 중입니다. 전송이 끝나면 이곳에 표시됩니다.")
     if not photo_ids:
-        st.info("이 정밀점검 기록에는 첨부된 사진이 없습니다.")
+        if not pending_photo_count:
+            st.info("이 정밀점검 기록에는 첨부된 사진이 없습니다.")
         return
 
     payloads = []
@@ -4896,85 +7879,174 @@ def _render_power_photo_download(record, key_prefix: str) -> None:
     saved_stamp = re.sub(r"[^0-9]", "", str(record.get("저장일시", "") or ""))[:14] or _korea_now().strftime("%Y%m%d%H%M%S")
     safe_local = re.sub(r"[^0-9A-Za-z가-힣_-]", "_", str(record.get("국소", "") or "정밀점검"))[:40] or "정밀점검"
 
-    for index, file_id in enumerate(photo_ids, 1):
-        photo_bytes = _worklog_download_drive_image(file_id)
-        if not photo_bytes:
+    caption_slot = st.empty()
+    photo_cols = st.columns(2)
+    # 자리를 먼저 잡아 두고, 사진이 도착하는 대로 원래 순서의 칸에 채웁니다.
+    slots = [photo_cols[pos % 2].empty() for pos in range(len(photo_ids))]
+    for position, file_id, thumbnail in _worklog_iter_drive_photos(photo_ids, variant="thumb"):
+        index = position + 1
+        if not thumbnail:
             failed_count += 1
             continue
-        stored_name = photo_names[index - 1] if index - 1 < len(photo_names) else f"정밀점검_{saved_stamp}_{index:02d}.jpg"
+        stored_name = photo_names[position] or f"정밀점검_{saved_stamp}_{index:02d}.jpg"
         download_name = stored_name if stored_name.lower().endswith(".jpg") else f"{stored_name}.jpg"
-        payloads.append({"index": index, "bytes": photo_bytes, "name": download_name})
+        payloads.append({"index": index, "id": file_id, "name": download_name})
+        with slots[position].container():
+            st.image(thumbnail, caption=f"사진 {index} / {len(photo_ids)}", use_container_width=True)
+            _worklog_render_original_download(file_id, download_name, f"{key_prefix}_photo_{index}")
+    payloads.sort(key=lambda payload: payload["index"])
 
     if not payloads:
-        st.warning("사진 정보는 있으나 현재 파일을 읽을 수 없습니다. Drive 읽기 권한을 확인해 주세요.")
+        caption_slot.warning("사진 정보는 있으나 현재 파일을 읽을 수 없습니다. Drive 읽기 권한을 확인해 주세요.")
         return
 
-    st.caption(f"첨부사진 {len(photo_ids)}장 · Drive 폴더는 공개하지 않고 이 화면에서만 조회·다운로드합니다.")
-    photo_cols = st.columns(2)
-    for pos, payload in enumerate(payloads):
-        with photo_cols[pos % 2]:
-            st.image(payload["bytes"], caption=f"사진 {payload['index']} / {len(photo_ids)}", use_container_width=True)
-            st.download_button(
-                "📥 사진 다운로드",
-                data=payload["bytes"],
-                file_name=payload["name"],
-                mime="image/jpeg",
-                use_container_width=True,
-                key=f"{key_prefix}_photo_{payload['index']}",
-            )
-
-    try:
-        from io import BytesIO
-        import zipfile
+    caption_slot.caption(f"첨부사진 {len(photo_ids)}장 · Drive 폴더는 공개하지 않고 이 화면에서만 조회·다운로드합니다.")
 
-        zip_buffer = BytesIO()
-        with zipfile.ZipFile(zip_buffer, "w", compression=zipfile.ZIP_DEFLATED) as photo_zip:
-            for payload in payloads:
-                photo_zip.writestr(payload["name"], payload["bytes"])
-        zip_name = f"{safe_local}_정밀점검_{saved_stamp}_사진{len(payloads)}장.zip"
-        st.download_button(
-            f"📦 사진 {len(payloads)}장 전체 ZIP 다운로드",
-            data=zip_buffer.getvalue(),
-            file_name=zip_name,
-            mime="application/zip",
-            use_container_width=True,
-            key=f"{key_prefix}_zip",
-        )
-    except Exception as zip_error:
-        st.warning(f"사진 ZIP 파일을 만들지 못했습니다. 개별 다운로드를 이용해 주세요. ({zip_error})")
+    _worklog_render_photo_zip_download(
+        f"power:{record.get('점검ID', '') or saved_stamp}",
+        [(payload["id"], payload["name"]) for payload in payloads],
+        f"{safe_local}_정밀점검_{saved_stamp}_사진{{count}}장.zip",
+        f"{key_prefix}_zip",
+    )
 
     if failed_count:
         st.warning(f"첨부사진 중 {failed_count}장은 현재 읽을 수 없어 표시하지 못했습니다.")
 
 
 
+# ------------------------------------------
+# 사진 대기열 스필 저장소
+#   - 압축된 대기 사진은 세션 상태가 아닌 세션별 임시 디렉터리에 보관하고, 세션 상태에는 경로·메타데이터만 둡니다.
+#   - 세션이 사진을 쓰거나 읽을 때마다 .last_used 표시 파일의 시각을 갱신하고, 그 시각(없으면 가장 최근 파일 시각)
+#     으로부터 WORK_LOG_PHOTO_SPILL_TTL_SECONDS가 지난 세션 디렉터리는 정리합니다. 전체 용량이 예산을 넘으면
+#     오래된 세션부터 비웁니다.
+# ------------------------------------------
+WORK_LOG_PHOTO_SPILL_DIR = os.path.join(APP_TEMP_ROOT, "photo_spill")
+WORK_LOG_PHOTO_SPILL_TTL_SECONDS = 6 * 3600
+WORK_LOG_PHOTO_SPILL_MAX_BYTES = 1024 * 1024 * 1024
+WORK_LOG_PHOTO_SPILL_SWEEP_SECONDS = 600
+WORK_LOG_PHOTO_SPILL_MARKER = ".last_used"
+
+
+@st.cache_resource
+def _worklog_photo_spill_state() -> dict:
+    return {"lock": threading.Lock(), "last_sweep": 0.0}
+
+
+def _worklog_photo_spill_session_dir() -> str:
+    """현재 브라우저 세션의 스필 디렉터리를 만들고 사용 시각을 갱신합니다."""
+    session_id = str(st.session_state.get("_worklog_photo_spill_id", "") or "")
+    if not re.fullmatch(r"[0-9a-f]{32}", session_id):
+        session_id = os.urandom(16).hex()
+        st.session_state["_worklog_photo_spill_id"] = session_id
+    session_dir = _ensure_private_dir(os.path.join(WORK_LOG_PHOTO_SPILL_DIR, session_id))
+    _worklog_photo_spill_touch(session_dir)
+    _worklog_photo_spill_sweep(keep=session_id)
+    return session_dir
+
+
+def _worklog_photo_spill_touch(session_dir: str) -> None:
+    """세션의 마지막 사용 시각을 표시 파일에 남깁니다. 디렉터리 시각은 파일 추가·삭제에도 바뀌므로 쓰지 않습니다."""
+    marker = os.path.join(session_dir, WORK_LOG_PHOTO_SPILL_MARKER)
+    try:
+        with open(marker, "a", encoding="utf-8"):
+            pass
+        os.utime(marker, None)
+    except OSError:
+        pass
+
+
+def _worklog_photo_spill_sweep(keep: str = "") -> None:
+    """만료된 세션 디렉터리를 지우고, 용량 예산을 넘으면 오래된 세션부터 정리합니다."""
+    state = _worklog_photo_spill_state()
+    now_ts = time.time()
+    with state["lock"]:
+        if now_ts - state["last_sweep"] < WORK_LOG_PHOTO_SPILL_SWEEP_SECONDS:
+            return
+        state["last_sweep"] = now_ts
+    sessions = []
+    try:
+        entries = list(os.scandir(WORK_LOG_PHOTO_SPILL_DIR))
+    except OSError:
+        return
+    for entry in entries:
+        if not entry.is_dir():
+            continue
+        try:
+            children = [child.stat() for child in os.scandir(entry.path) if child.is_file()]
+            # 표시 파일과 사진 파일 중 가장 최근 시각을 마지막 사용 시각으로 봅니다.
+            touched = max((child.st_mtime for child in children), default=entry.stat().st_mtime)
+            size = sum(child.st_size for child in children)
+        except OSError:
+            continue
+        if entry.name != keep and now_ts - touched > WORK_LOG_PHOTO_SPILL_TTL_SECONDS:
+            shutil.rmtree(entry.path, ignore_errors=True)
+            continue
+        sessions.append((touched, entry.name, entry.path, size))
+    total = sum(size for _touched, _name, _path, size in sessions)
+    for _touched, name, path, size in sorted(sessions):
+        if total <= WORK_LOG_PHOTO_SPILL_MAX_BYTES:
+            break
+        if name == keep:
+            continue
+        shutil.rmtree(path, ignore_errors=True)
+        total -= size
+
+
+def _worklog_photo_spill_write(data: bytes) -> str:
+    session_dir = _worklog_photo_spill_session_dir()
+    path = os.path.join(session_dir, f"{os.urandom(8).hex()}.jpg")
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "wb") as spill_file:
+        spill_file.write(data)
+    os.replace(temp_path, path)
+    return path
+
+
+def _worklog_photo_spill_path_ok(path: str) -> bool:
+    spill_root = os.path.realpath(WORK_LOG_PHOTO_SPILL_DIR)
+    return bool(path) and os.path.realpath(path).startswith(spill_root + os.sep) and os.path.isfile(path)
+
+
 class _WorklogQueuedPhoto:
-    """압축된 사진 bytes를 기존 UploadedFile 호환 객체처럼 제공합니다."""
+    """스필 저장소에 보관된 압축 사진을 기존 UploadedFile 호환 객체처럼 제공합니다.
+
+    bytes는 실제로 저장할 때 getvalue()에서 한 번만 읽습니다.
+    """
     def __init__(
         self,
-        data: bytes,
+        path: str,
         name: str = "field_photo.jpg",
         mime_type: str = "image/jpeg",
         capture_stamp: str = "",
+        size: int = 0,
     ):
-        self._data = bytes(data or b"")
+        self._path = str(path or "")
         self.name = str(name or "field_photo.jpg")
         self.type = str(mime_type or "image/jpeg")
+        self.size = int(size or 0)
         self._worklog_precompressed = True
         self._worklog_safe_name = self.name
         self._worklog_capture_stamp = str(capture_stamp or "")
 
     def getvalue(self) -> bytes:
-        return self._data
+        try:
+            with open(self._path, "rb") as spill_file:
+                return spill_file.read()
+        except OSError:
+            return b""
 
 
 def _worklog_queue_selected_photos(queue_key: str, uploaded_files) -> tuple[int, int, list[str]]:
-    """선택 즉시 압축 후 세션 큐에 누적합니다. 모바일 원본 대용량 bytes는 세션에 남기지 않습니다."""
-    queue = list(st.session_state.get(queue_key, []) or [])
+    """선택 즉시 압축 후 스필 저장소에 보관하고, 세션 큐에는 경로와 메타데이터만 누적합니다."""
+    queue = [
+        item for item in list(st.session_state.get(queue_key, []) or [])
+        if isinstance(item, dict) and _worklog_photo_spill_path_ok(str(item.get("path", "") or ""))
+    ]
     seen = {
         str(item.get("digest", "") or "")
         for item in queue
-        if isinstance(item, dict) and str(item.get("digest", "") or "")
+        if str(item.get("digest", "") or "")
     }
 
     added = 0
@@ -4983,35 +8055,33 @@ def _worklog_queue_selected_photos(queue_key: str, uploaded_files) -> tuple[int,
         if len(queue) >= WORK_LOG_MAX_PHOTOS:
             failures.append(f"최대 {WORK_LOG_MAX_PHOTOS}장까지만 추가할 수 있습니다.")
             break
-        try:
-            raw = file_obj.getvalue()
-        except Exception as error:
-            failures.append(f"{file_index}번째 사진을 읽지 못했습니다: {error}")
-            continue
-        if not raw:
-            failures.append(f"{file_index}번째 사진 데이터가 비어 있습니다.")
+        ingested = _worklog_ingest_photo(file_obj, fallback_dt=_korea_now(), known_digests=seen)
+        if ingested["duplicate"]:
             continue
-
-        original_digest = hashlib.sha256(raw).hexdigest()
-        if original_digest in seen:
+        if not ingested["source_bytes"]:
+            failures.append(f"{file_index}번째 {ingested['error']}")
             continue
-
-        capture_stamp = _photo_capture_timestamp(file_obj, fallback_dt=_korea_now())
-        compressed, safe_name, mime_type, compress_error = _worklog_compress_image(file_obj)
-        if not compressed:
+        if not ingested["ok"]:
             meta = _worklog_uploaded_file_meta(file_obj)
             fmt_text = meta.get("ext") or meta.get("mime") or "형식 미확인"
             failures.append(
-                f"{file_index}번째 사진 처리 실패 · {meta.get('name')} · {fmt_text}: {compress_error}"
+                f"{file_index}번째 사진 처리 실패 · {meta.get('name')} · {fmt_text}: {ingested['error']}"
             )
             continue
 
+        compressed = ingested["data"]
+        original_digest = ingested["digest"]
+        try:
+            spill_path = _worklog_photo_spill_write(compressed)
+        except OSError as spill_error:
+            failures.append(f"{file_index}번째 사진 임시 보관 실패: {spill_error}")
+            continue
         queue.append({
-            "data": compressed,
-            "name": safe_name or "field_photo.jpg",
-            "type": mime_type or "image/jpeg",
+            "path": spill_path,
+            "name": ingested["name"] or "field_photo.jpg",
+            "type": ingested["type"] or "image/jpeg",
             "digest": original_digest,
-            "capture_stamp": capture_stamp,
+            "capture_stamp": ingested["capture_stamp"],
             "bytes": len(compressed),
         })
         seen.add(original_digest)
@@ -5022,27 +8092,42 @@ def _worklog_queue_selected_photos(queue_key: str, uploaded_files) -> tuple[int,
 
 
 def _worklog_queued_photo_objects(queue_key: str) -> list:
-    """세션 사진 큐를 기존 저장 함수가 그대로 사용할 수 있는 객체 목록으로 변환합니다."""
+    """세션 사진 큐를 기존 저장 함수가 그대로 사용할 수 있는 객체 목록으로 변환합니다. 사진 bytes는 복사하지 않습니다."""
     result = []
     for item in list(st.session_state.get(queue_key, []) or [])[:WORK_LOG_MAX_PHOTOS]:
         if not isinstance(item, dict):
             continue
-        raw = item.get("data", b"")
-        if not raw:
+        spill_path = str(item.get("path", "") or "")
+        if not _worklog_photo_spill_path_ok(spill_path):
             continue
         result.append(
             _WorklogQueuedPhoto(
-                raw,
+                spill_path,
                 str(item.get("name", "") or "field_photo.jpg"),
                 str(item.get("type", "") or "image/jpeg"),
                 str(item.get("capture_stamp", "") or ""),
+                int(item.get("bytes", 0) or 0),
             )
         )
+    if result:
+        _worklog_photo_spill_touch(os.path.dirname(result[0]._path))
     return result
 
 
-def _worklog_clear_photo_queue(queue_key: str, nonce_key: str) -> None:
+def _worklog_drop_photo_queue(queue_key: str) -> None:
+    """세션 사진 큐를 비우고 스필 파일도 함께 지웁니다."""
+    for item in list(st.session_state.get(queue_key, []) or []):
+        spill_path = str(item.get("path", "") or "") if isinstance(item, dict) else ""
+        if _worklog_photo_spill_path_ok(spill_path):
+            try:
+                os.remove(spill_path)
+            except OSError:
+                pass
     st.session_state[queue_key] = []
+
+
+def _worklog_clear_photo_queue(queue_key: str, nonce_key: str) -> None:
+    _worklog_drop_photo_queue(queue_key)
     st.session_state[nonce_key] = int(st.session_state.get(nonce_key, 0) or 0) + 1
 
 
@@ -5074,24 +8159,25 @@ def _worklog_get_record_row(worksheet, record_id: str) -> tuple[dict, int | None
     """기록ID로 시트의 실제 행/레코드를 찾습니다."""
     record_id = str(record_id or "").strip()
     try:
-        values = worksheet.get_all_values()
+        # 시트 전체 대신 헤더와 기록ID 열만 읽고, 찾은 행 1개만 다시 읽습니다.
+        headers = [str(value).strip() for value in worksheet.row_values(1)]
+        if "기록ID" not in headers:
+            return {}, None, headers
+        id_values = worksheet.col_values(headers.index("기록ID") + 1)
+        row_no = next(
+            (position + 1 for position, value in enumerate(id_values) if position > 0 and str(value).strip() == record_id),
+            None,
+        )
+        if row_no is None:
+            return {}, None, headers
+        row = worksheet.row_values(row_no)
     except Exception:
         return {}, None, []
-    if not values:
-        return {}, None, []
-    headers = [str(value).strip() for value in values[0]]
-    if "기록ID" not in headers:
-        return {}, None, headers
-    id_index = headers.index("기록ID")
-    for row_no, row in enumerate(values[1:], start=2):
-        current_id = str(row[id_index] if id_index < len(row) else "").strip()
-        if current_id == record_id:
-            record = {
-                header: (row[index] if index < len(row) else "")
-                for index, header in enumerate(headers)
-            }
-            return record, row_no, headers
-    return {}, None, headers
+    record = {
+        header: (row[index] if index < len(row) else "")
+        for index, header in enumerate(headers)
+    }
+    return record, row_no, headers
 
 
 def _worklog_can_access_record(record: dict, auth_user: dict) -> bool:
@@ -5153,30 +8239,24 @@ def save_work_log(record: dict, photos: list) -> tuple[bool, str, str, str]:
         photo_failures.append(f"사진 업로드 설정 확인 필요: {issue_text}")
         photo_upload_allowed = False
 
-    if photos and photo_upload_allowed:
-        preflight_ok, preflight_message = _worklog_apps_script_healthcheck()
-        if not preflight_ok:
-            photo_failures.append(f"사진 연결 사전진단 실패: {preflight_message}")
-            photo_upload_allowed = False
-
+    photo_job_dir = ""
     if photo_upload_allowed:
-        for index, photo in enumerate(photos[:WORK_LOG_MAX_PHOTOS], 1):
-            compressed, _safe_name, mime_type, error = _worklog_compress_image(photo)
-            if not compressed:
-                photo_failures.append(f"{index}번째 사진 처리 실패: {error}")
-                continue
-            capture_stamp = _photo_capture_timestamp(photo, fallback_dt=now)
-            # 기록ID + 순번을 포함하여 폴더 전체에서 파일명이 중복되지 않도록 합니다.
-            drive_name = f"WORK LOG_{capture_stamp}_{record_id}_{index:02d}.jpg"
-            ok, drive_meta, upload_error = _worklog_upload_drive_image(compressed, drive_name, mime_type)
-            if not ok:
-                photo_failures.append(f"{index}번째 사진 저장 실패: {upload_error}")
-                continue
-            photo_ids.append(str(drive_meta.get("id", "")))
-            photo_names.append(str(drive_meta.get("name", drive_name)))
+        # 기록ID + 순번을 포함하여 폴더 전체에서 파일명이 중복되지 않도록 합니다.
+        # Drive 전송은 대기함을 통해 백그라운드에서 진행되므로 저장 버튼이 업로드를 기다리지 않습니다.
+        photo_job_dir, photo_ids, photo_names, upload_failures = _worklog_stage_or_upload_photos(
+            "worklog",
+            record_id,
+            WORK_LOG_SPREADSHEET_NAME,
+            WORK_LOG_SHEET_NAME,
+            "기록ID",
+            photos[:WORK_LOG_MAX_PHOTOS],
+            lambda index, capture_stamp: f"WORK LOG_{capture_stamp}_{record_id}_{index:02d}.jpg",
+            now,
+        )
+        photo_failures.extend(upload_failures)
 
     try:
-        spreadsheet = client.open(WORK_LOG_SPREADSHEET_NAME)
+        spreadsheet = _open_spreadsheet_cached(client, WORK_LOG_SPREADSHEET_NAME)
         ws, history_ws = _worklog_ensure_sheets(spreadsheet)
         saved_at = now.strftime("%Y-%m-%d %H:%M:%S")
         row_map = {
@@ -5201,6 +8281,7 @@ def save_work_log(record: dict, photos: list) -> tuple[bool, str, str, str]:
         }
         actual_headers = [str(value).strip() for value in ws.row_values(1)]
         ws.append_row([row_map.get(header, "") for header in actual_headers], value_input_option="USER_ENTERED")
+        _worklog_table_note_append(row_map)
 
         history_headers = [str(value).strip() for value in history_ws.row_values(1)]
         history_map = {
@@ -5219,8 +8300,14 @@ def save_work_log(record: dict, photos: list) -> tuple[bool, str, str, str]:
             value_input_option="USER_ENTERED",
         )
 
+        if photo_job_dir:
+            _worklog_outbox_commit(photo_job_dir)
+
         scope_text = "팀 공유" if visibility == "공개" else "나만 보기"
-        photo_summary = f"사진 {len(photo_ids)}/{len(photos)}장" if photos else "사진 없음"
+        if photo_job_dir and photo_ids:
+            photo_summary = f"사진 {len(photo_ids)}/{len(photos)}장 업로드 대기(자동 전송)"
+        else:
+            photo_summary = f"사진 {len(photo_ids)}/{len(photos)}장" if photos else "사진 없음"
         warning_text = ""
         if photo_failures:
             first_reason = photo_failures[0]
@@ -5231,8 +8318,12 @@ def save_work_log(record: dict, photos: list) -> tuple[bool, str, str, str]:
         return True, f"MY WORK LOG가 저장되었습니다. · {scope_text} · {photo_summary}", record_id, warning_text
 
     except Exception as error:
+        _forget_stale_sheet_handles(error, spreadsheet_name=WORK_LOG_SPREADSHEET_NAME)
         # 사진은 올라갔는데 Sheet 본문 저장이 실패한 경우 orphan 파일을 휴지통으로 되돌립니다.
-        if photo_ids:
+        # 대기함에만 있던 사진은 아직 Drive에 없으므로 로컬 작업만 지웁니다.
+        if photo_job_dir:
+            _worklog_outbox_discard(photo_job_dir)
+        elif photo_ids:
             try:
                 _worklog_trash_drive_files(photo_ids)
             except Exception:
@@ -5253,7 +8344,7 @@ def append_work_log_photos(record_id: str, auth_user: dict, photos: list) -> tup
     if not client:
         return False, "Google Sheets 연결 실패"
     try:
-        spreadsheet = client.open(WORK_LOG_SPREADSHEET_NAME)
+        spreadsheet = _open_spreadsheet_cached(client, WORK_LOG_SPREADSHEET_NAME)
         ws, history_ws = _worklog_ensure_sheets(spreadsheet)
         record, row_no, headers = _worklog_get_record_row(ws, record_id)
         if not record or row_no is None:
@@ -5269,46 +8360,40 @@ def append_work_log_photos(record_id: str, auth_user: dict, photos: list) -> tup
 
         if not _worklog_photo_upload_ready():
             return False, "현재 사진 저장 연결을 사용할 수 없습니다. 기록 본문은 유지되어 있으므로 잠시 후 다시 시도해 주세요."
-        preflight_ok, preflight_message = _worklog_apps_script_healthcheck()
+        preflight_ok, preflight_message = _worklog_photo_upload_gate()
         if not preflight_ok:
             return False, f"사진 연결 확인 실패: {preflight_message}"
 
         now = _korea_now()
-        new_ids: list[str] = []
-        new_names: list[str] = []
-        failures: list[str] = []
-        for offset, photo in enumerate(photos[:available], 1):
-            compressed, _safe_name, mime_type, error = _worklog_compress_image(photo)
-            if not compressed:
-                failures.append(f"{offset}번째 사진 처리 실패: {error}")
-                continue
-            capture_stamp = _photo_capture_timestamp(photo, fallback_dt=now)
-            seq = len(existing_ids) + offset
-            drive_name = f"WORK LOG_{capture_stamp}_{record_id}_{seq:02d}.jpg"
-            ok, drive_meta, upload_error = _worklog_upload_drive_image(compressed, drive_name, mime_type)
-            if not ok:
-                failures.append(f"{offset}번째 사진 저장 실패: {upload_error}")
-                continue
-            new_ids.append(str(drive_meta.get("id", "") or ""))
-            new_names.append(str(drive_meta.get("name", drive_name) or drive_name))
+        new_ids, new_names, failures = _worklog_process_and_upload_photos(
+            photos[:available],
+            lambda offset, capture_stamp: f"WORK LOG_{capture_stamp}_{record_id}_{len(existing_ids) + offset:02d}.jpg",
+            now,
+        )
 
         if not new_ids:
             reason = failures[0] if failures else "사진 저장에 성공한 파일이 없습니다."
             return False, reason
 
-        all_ids = existing_ids + new_ids
-        all_names = existing_names + new_names
         now_text = now.strftime("%Y-%m-%d %H:%M:%S")
-        updates = {
-            "사진수": len(all_ids),
-            "사진파일ID목록": "|".join(all_ids),
-            "사진파일명목록": "|".join(all_names),
-            "최근수정일시": now_text,
-        }
         try:
-            for header, value in updates.items():
-                if header in headers:
-                    ws.update_cell(row_no, headers.index(header) + 1, value)
+            with _worklog_record_lock(WORK_LOG_SPREADSHEET_NAME, WORK_LOG_SHEET_NAME, record_id):
+                # 업로드하는 동안 사진 대기함이 자리표시를 실제 ID로 바꿨을 수 있으므로 쓰기 직전에 다시 읽어 합칩니다.
+                record, row_no, headers = _worklog_get_record_row(ws, record_id)
+                if not record or row_no is None:
+                    raise RuntimeError("기록을 찾지 못했습니다.")
+                existing_ids = [v.strip() for v in str(record.get("사진파일ID목록", "") or "").split("|") if v.strip()]
+                existing_names = [v.strip() for v in str(record.get("사진파일명목록", "") or "").split("|") if v.strip()]
+                all_ids = existing_ids + new_ids
+                all_names = existing_names + new_names
+                updates = {
+                    "사진수": len(all_ids),
+                    "사진파일ID목록": "|".join(all_ids),
+                    "사진파일명목록": "|".join(all_names),
+                    "최근수정일시": now_text,
+                }
+                _sheet_patch_rows(ws, headers, {row_no: updates})
+            _worklog_table_note_patch(record_id, updates)
 
             history_headers = [str(value).strip() for value in history_ws.row_values(1)]
             history_map = {
@@ -5338,11 +8423,175 @@ def append_work_log_photos(record_id: str, auth_user: dict, photos: list) -> tup
             message += f" · {len(failures)}장은 실패하여 제외되었습니다."
         return True, message
     except Exception as error:
+        _forget_stale_sheet_handles(error, spreadsheet_name=WORK_LOG_SPREADSHEET_NAME)
         return False, f"현장사진 추가 실패: {error}"
 
 
-def load_work_logs(auth_user: dict | None = None) -> pd.DataFrame:
-    """누적 WORK LOG를 읽은 뒤 공개 기록 + 로그인 사용자의 비공개 기록만 반환합니다."""
+# ------------------------------------------
+# MY WORK LOG 증분 캐시
+#   - 최초 1회만 시트 전체를 읽고, 이후에는 기록ID·최근수정일시·저장일시 3개 열만 읽어 바뀐 행을 찾습니다.
+#   - (기록ID, 최근수정일시)가 캐시와 같은 행은 그대로 쓰고, 새 행·수정된 행만 batch_get으로 다시 읽습니다.
+#   - 이 프로세스의 저장·수정·삭제는 성공 직후 캐시에 바로 반영하므로 저장 후 새로고침은 API를 호출하지 않습니다.
+#   - 같은 초 안의 재수정이나 최근수정일시를 바꾸지 않은 외부 편집은 증분 확인으로 잡히지 않으므로
+#     WORK_LOG_TABLE_FULL_RELOAD_SECONDS마다 시트 전체를 다시 읽습니다.
+# ------------------------------------------
+WORK_LOG_TABLE_REFRESH_SECONDS = 20
+WORK_LOG_TABLE_FULL_RELOAD_SECONDS = 600
+
+
+@st.cache_resource
+def _worklog_table_state() -> dict:
+    return {
+        "lock": threading.RLock(),
+        "ws_key": None,
+        "headers": [],
+        "rows": [],
+        "loaded_at": 0.0,
+        "synced_at": 0.0,
+    }
+
+
+def _worklog_table_row_key(headers: list[str], row: list[str]) -> tuple[str, str]:
+    def cell(header: str) -> str:
+        if header not in headers:
+            return ""
+        index = headers.index(header)
+        return str(row[index] if index < len(row) else "").strip()
+
+    return cell("기록ID"), cell("최근수정일시")
+
+
+def _worklog_table_full_load(state: dict, ws) -> None:
+    values = ws.get_all_values()
+    headers = [str(value).strip() for value in (values[0] if values else [])]
+    state["headers"] = headers
+    state["rows"] = [
+        [row[index] if index < len(row) else "" for index in range(len(headers))]
+        for row in values[1:]
+    ]
+    state["ws_key"] = _worksheet_key(ws)
+    state["loaded_at"] = time.time()
+
+
+def _worklog_table_sync(ws, force: bool = False) -> dict:
+    """캐시를 시트와 맞춥니다. 새로고침 주기 안에서는 force가 아니면 API를 호출하지 않습니다."""
+    state = _worklog_table_state()
+    with state["lock"]:
+        ws_key = _worksheet_key(ws)
+        headers = state["headers"]
+        now_ts = time.time()
+        if (
+            state["ws_key"] != ws_key
+            or not headers
+            or "기록ID" not in headers
+            or now_ts - state["loaded_at"] >= WORK_LOG_TABLE_FULL_RELOAD_SECONDS
+        ):
+            _worklog_table_full_load(state, ws)
+        elif force or now_ts - state["synced_at"] >= WORK_LOG_TABLE_REFRESH_SECONDS:
+            probe_headers = [header for header in ("기록ID", "최근수정일시", "저장일시") if header in headers]
+            probe_ranges = ["1:1"] + [
+                f"{_column_letter(headers.index(header) + 1)}2:{_column_letter(headers.index(header) + 1)}"
+                for header in probe_headers
+            ]
+            probe = ws.batch_get(probe_ranges)
+            current_headers = [str(value).strip() for value in (probe[0][0] if probe and probe[0] else [])]
+            if current_headers != headers:
+                _worklog_table_full_load(state, ws)
+            else:
+                columns = {
+                    header: [str(cells[0] if cells else "").strip() for cells in probe[position + 1]]
+                    for position, header in enumerate(probe_headers)
+                }
+                row_total = max((len(values) for values in columns.values()), default=0)
+                cached_by_key = {}
+                for position, row in enumerate(state["rows"]):
+                    record_id, modified = _worklog_table_row_key(headers, row)
+                    cached_by_key.setdefault((record_id or f"@{position}", modified), row)
+
+                rows: list = []
+                stale_positions: list[int] = []
+                for position in range(row_total):
+                    record_id = columns.get("기록ID", [])[position] if position < len(columns.get("기록ID", [])) else ""
+                    modified = columns.get("최근수정일시", [])[position] if position < len(columns.get("최근수정일시", [])) else ""
+                    cached = cached_by_key.get((record_id or f"@{position}", modified))
+                    rows.append(cached)
+                    if cached is None:
+                        stale_positions.append(position)
+
+                if stale_positions:
+                    last_letter = _column_letter(len(headers))
+                    spans: list[list[int]] = []
+                    for position in stale_positions:
+                        if spans and spans[-1][1] + 1 == position:
+                            spans[-1][1] = position
+                        else:
+                            spans.append([position, position])
+                    fetched = ws.batch_get([f"A{start + 2}:{last_letter}{end + 2}" for start, end in spans])
+                    for (start, end), values in zip(spans, fetched):
+                        for offset in range(end - start + 1):
+                            row = values[offset] if offset < len(values) else []
+                            rows[start + offset] = [row[index] if index < len(row) else "" for index in range(len(headers))]
+                state["rows"] = rows
+        else:
+            return state
+
+        state["synced_at"] = time.time()
+        return state
+
+
+def _worklog_table_note_append(row_map: dict) -> None:
+    """이 프로세스에서 추가한 행을 캐시에 바로 반영합니다."""
+    state = _worklog_table_state()
+    with state["lock"]:
+        if not state["headers"]:
+            return
+        state["rows"].append([str(row_map.get(header, "") or "") for header in state["headers"]])
+
+
+def _worklog_table_note_patch(record_id: str, updates: dict) -> None:
+    """이 프로세스에서 수정한 값을 캐시의 해당 기록에 바로 반영합니다."""
+    state = _worklog_table_state()
+    with state["lock"]:
+        headers = state["headers"]
+        if "기록ID" not in headers:
+            return
+        id_index = headers.index("기록ID")
+        for row in state["rows"]:
+            if row and id_index < len(row) and str(row[id_index]).strip() == str(record_id):
+                for header, value in updates.items():
+                    if header in headers:
+                        row[headers.index(header)] = str(value if value is not None else "")
+                break
+
+
+def _worklog_table_note_delete(record_id: str) -> None:
+    state = _worklog_table_state()
+    with state["lock"]:
+        headers = state["headers"]
+        if "기록ID" not in headers:
+            return
+        id_index = headers.index("기록ID")
+        state["rows"] = [
+            row for row in state["rows"]
+            if not (row and id_index < len(row) and str(row[id_index]).strip() == str(record_id))
+        ]
+
+
+def _invalidate_worklog_table() -> None:
+    state = _worklog_table_state()
+    with state["lock"]:
+        state["ws_key"] = None
+        state["headers"] = []
+        state["rows"] = []
+        state["loaded_at"] = 0.0
+        state["synced_at"] = 0.0
+
+
+def load_work_logs(auth_user: dict | None = None, force: bool = False) -> pd.DataFrame:
+    """누적 WORK LOG를 증분 캐시로 읽은 뒤 공개 기록 + 로그인 사용자의 비공개 기록만 반환합니다.
+
+    force=True이면 새로고침 주기와 관계없이 시트의 변경분을 확인합니다.
+    """
     auth_user = auth_user or _worklog_current_user()
     if not auth_user:
         return pd.DataFrame(columns=WORK_LOG_HEADERS)
@@ -5350,22 +8599,23 @@ def load_work_logs(auth_user: dict | None = None) -> pd.DataFrame:
     client = init_google_sheet_connection()
     if not client:
         raise RuntimeError("Google Sheets 연결 실패")
-    spreadsheet = client.open(WORK_LOG_SPREADSHEET_NAME)
+    spreadsheet = _open_spreadsheet_cached(client, WORK_LOG_SPREADSHEET_NAME)
     try:
-        ws = spreadsheet.worksheet(WORK_LOG_SHEET_NAME)
+        ws = _get_worksheet_cached(spreadsheet, WORK_LOG_SHEET_NAME)
     except Exception:
         return pd.DataFrame(columns=WORK_LOG_HEADERS)
 
-    values = ws.get_all_values()
-    if not values:
+    try:
+        table = _worklog_table_sync(ws, force=force)
+    except Exception:
+        _invalidate_worklog_table()
+        raise
+    with table["lock"]:
+        headers = list(table["headers"])
+        rows = [list(row) for row in table["rows"] if row and any(str(cell or "").strip() for cell in row)]
+    if not headers:
         return pd.DataFrame(columns=WORK_LOG_HEADERS)
 
-    headers = [str(v).strip() for v in values[0]]
-    rows = [
-        [row[i] if i < len(row) else "" for i in range(len(headers))]
-        for row in values[1:]
-        if any(str(cell or "").strip() for cell in row)
-    ]
     df = pd.DataFrame(rows, columns=headers).fillna("")
     for required in WORK_LOG_HEADERS:
         if required not in df.columns:
@@ -5388,7 +8638,7 @@ def load_work_log_history(record_id: str, auth_user: dict | None = None) -> pd.D
     if not client:
         return pd.DataFrame(columns=WORK_LOG_HISTORY_HEADERS)
     try:
-        spreadsheet = client.open(WORK_LOG_SPREADSHEET_NAME)
+        spreadsheet = _open_spreadsheet_cached(client, WORK_LOG_SPREADSHEET_NAME)
         main_ws, history_ws = _worklog_ensure_sheets(spreadsheet)
         record, _, _ = _worklog_get_record_row(main_ws, record_id)
         if not record or not _worklog_can_access_record(record, auth_user):
@@ -5399,7 +8649,8 @@ def load_work_log_history(record_id: str, auth_user: dict | None = None) -> pd.D
         if not df.empty and "기록ID" in df.columns:
             df = df[df["기록ID"].astype(str) == str(record_id)]
         return df
-    except Exception:
+    except Exception as error:
+        _forget_stale_sheet_handles(error, spreadsheet_name=WORK_LOG_SPREADSHEET_NAME)
         return pd.DataFrame(columns=WORK_LOG_HISTORY_HEADERS)
 
 
@@ -5432,7 +8683,7 @@ def update_work_log(
     if not client:
         return False, "Google Sheets 연결 실패"
     try:
-        spreadsheet = client.open(WORK_LOG_SPREADSHEET_NAME)
+        spreadsheet = _open_spreadsheet_cached(client, WORK_LOG_SPREADSHEET_NAME)
         ws, history_ws = _worklog_ensure_sheets(spreadsheet)
         record, target_row, headers = _worklog_get_record_row(ws, record_id)
         if not record or target_row is None:
@@ -5448,9 +8699,8 @@ def update_work_log(
             "비고": str(remark or "").strip(),
             "최근수정일시": now_text,
         }
-        for header, value in updates.items():
-            if header in headers:
-                ws.update_cell(target_row, headers.index(header) + 1, value)
+        _sheet_patch_rows(ws, headers, {target_row: updates})
+        _worklog_table_note_patch(record_id, updates)
 
         history_headers = [str(value).strip() for value in history_ws.row_values(1)]
         history_map = {
@@ -5470,6 +8720,7 @@ def update_work_log(
         )
         return True, "상태이력과 조치내용이 업데이트되었습니다."
     except Exception as error:
+        _forget_stale_sheet_handles(error, spreadsheet_name=WORK_LOG_SPREADSHEET_NAME)
         return False, f"WORK LOG 업데이트 실패: {error}"
 
 
@@ -5504,7 +8755,7 @@ def update_work_log_visibility(
         return False, "Google Sheets 연결 실패"
 
     try:
-        spreadsheet = client.open(WORK_LOG_SPREADSHEET_NAME)
+        spreadsheet = _open_spreadsheet_cached(client, WORK_LOG_SPREADSHEET_NAME)
         ws, history_ws = _worklog_ensure_sheets(spreadsheet)
         record, target_row, headers = _worklog_get_record_row(ws, record_id)
         if not record or target_row is None:
@@ -5522,9 +8773,8 @@ def update_work_log_visibility(
             "공개범위": new_visibility,
             "최근수정일시": now_text,
         }
-        for header, value in updates.items():
-            if header in headers:
-                ws.update_cell(target_row, headers.index(header) + 1, value)
+        _sheet_patch_rows(ws, headers, {target_row: updates})
+        _worklog_table_note_patch(record_id, updates)
 
         if old_visibility != new_visibility:
             history_headers = [str(value).strip() for value in history_ws.row_values(1)]
@@ -5549,23 +8799,121 @@ def update_work_log_visibility(
         scope_text = "🌐 공개 · 팀 공유" if new_visibility == "공개" else "🔒 비공개 · 나만 보기"
         return True, f"공개범위를 {scope_text}(으)로 변경했습니다. 사진 열람 권한도 같은 범위를 따릅니다."
     except Exception as error:
+        _forget_stale_sheet_handles(error, spreadsheet_name=WORK_LOG_SPREADSHEET_NAME)
         return False, f"공개범위 변경 실패: {error}"
 
 
 def _worklog_ensure_delete_audit_sheet(spreadsheet):
     try:
-        ws = spreadsheet.worksheet(WORK_LOG_DELETE_AUDIT_SHEET_NAME)
+        ws = _get_worksheet_cached(spreadsheet, WORK_LOG_DELETE_AUDIT_SHEET_NAME)
     except Exception:
         ws = spreadsheet.add_worksheet(
             title=WORK_LOG_DELETE_AUDIT_SHEET_NAME,
             rows=5000,
             cols=max(len(WORK_LOG_DELETE_AUDIT_HEADERS) + 2, 12),
         )
+        _remember_worksheet_handle(spreadsheet, ws)
         ws.append_row(WORK_LOG_DELETE_AUDIT_HEADERS, value_input_option="USER_ENTERED")
     _worklog_ensure_headers(ws, WORK_LOG_DELETE_AUDIT_HEADERS)
     return ws
 
 
+# ------------------------------------------
+# MY_WORK_LOG_HISTORY 기록ID별 행 색인
+#   - 기록ID 1개 열만 읽어 프로세스 공용 색인을 만들고, 이후에는 새로 늘어난 행만 따라잡습니다.
+#   - 삭제 전에는 대상 행의 기록ID만 다시 확인하고, 어긋나면 1회 재구성합니다.
+# ------------------------------------------
+@st.cache_resource
+def _worklog_history_index_state() -> dict:
+    return {"lock": threading.RLock(), "ws_key": None, "id_col": "", "next_row": 2, "last_id": "", "rows_by_id": {}}
+
+
+def _invalidate_worklog_history_index() -> None:
+    state = _worklog_history_index_state()
+    with state["lock"]:
+        state["ws_key"] = None
+        state["id_col"] = ""
+        state["next_row"] = 2
+        state["last_id"] = ""
+        state["rows_by_id"] = {}
+
+
+def _sync_worklog_history_index(history_ws) -> dict:
+    """색인을 이력 시트의 마지막 행까지 따라잡게 합니다."""
+    state = _worklog_history_index_state()
+    with state["lock"]:
+        ws_key = _worksheet_key(history_ws)
+        if state["ws_key"] != ws_key or not state["id_col"]:
+            headers = [str(value or "").strip() for value in history_ws.row_values(1)]
+            if "기록ID" not in headers:
+                return state
+            state["ws_key"] = ws_key
+            state["id_col"] = _column_letter(headers.index("기록ID") + 1)
+            state["next_row"] = 2
+            state["last_id"] = ""
+            state["rows_by_id"] = {}
+
+        # 마지막으로 색인한 행을 1행 겹쳐 읽어, 다른 곳에서 행이 지워져 밀렸는지도 함께 확인합니다.
+        start_row = max(2, state["next_row"] - 1)
+        column = history_ws.get(f"{state['id_col']}{start_row}:{state['id_col']}")
+        if start_row < state["next_row"]:
+            overlap = str(column[0][0]).strip() if column and column[0] else ""
+            if overlap != state["last_id"]:
+                state["ws_key"] = None
+                state["id_col"] = ""
+                return _sync_worklog_history_index(history_ws)
+            column = column[1:]
+            start_row += 1
+        for offset, cell in enumerate(column):
+            value = str(cell[0]).strip() if cell else ""
+            if value:
+                state["rows_by_id"].setdefault(value, []).append(start_row + offset)
+            state["last_id"] = value
+        state["next_row"] = start_row + len(column)
+        return state
+
+
+def _worklog_history_index_forget(record_id: str, deleted_rows: list[int]) -> None:
+    """삭제한 행을 색인에서 빼고, 그 아래 행번호를 삭제된 행 수만큼 당깁니다."""
+    state = _worklog_history_index_state()
+    removed = sorted(deleted_rows)
+    if not removed:
+        return
+    with state["lock"]:
+        state["rows_by_id"].pop(record_id, None)
+        for key, rows in state["rows_by_id"].items():
+            state["rows_by_id"][key] = [row - bisect.bisect_left(removed, row) for row in rows]
+        last_row = state["next_row"] - 1
+        state["next_row"] = max(2, state["next_row"] - len(removed))
+        if last_row in removed:
+            # 마지막 행이 지워졌으면 겹침 확인값을 알 수 없으므로 다음 조회에서 다시 만듭니다.
+            state["ws_key"] = None
+
+
+def _worklog_delete_history_rows(history_ws, record_id: str) -> int:
+    """기록ID의 변경이력 행을 전체 시트 조회 없이 일괄 삭제하고 삭제한 행 수를 반환합니다."""
+    for attempt in range(2):
+        state = _sync_worklog_history_index(history_ws)
+        with state["lock"]:
+            id_col = state["id_col"]
+            rows = list(state["rows_by_id"].get(record_id, []))
+        if not id_col or not rows:
+            return 0
+
+        fetched = history_ws.batch_get([f"{id_col}{row}" for row in rows])
+        consistent = all(
+            value_range and value_range[0] and str(value_range[0][0]).strip() == record_id
+            for value_range in fetched
+        )
+        if consistent:
+            deleted = _sheet_delete_rows_bulk(history_ws, rows)
+            _worklog_history_index_forget(record_id, rows)
+            return deleted
+        # 다른 프로세스나 관리자가 행을 지워 색인이 어긋났습니다.
+        _invalidate_worklog_history_index()
+    raise RuntimeError("변경이력 색인이 시트와 일치하지 않습니다. 잠시 후 다시 삭제해 주세요.")
+
+
 def delete_work_log(record_id: str, auth_user: dict | None = None) -> tuple[bool, str]:
     """작성자 본인의 WORK LOG 1건과 연결 사진을 함께 삭제합니다. 사진은 Drive 휴지통으로 이동합니다."""
     auth_user = auth_user or _worklog_current_user()
@@ -5581,7 +8929,7 @@ def delete_work_log(record_id: str, auth_user: dict | None = None) -> tuple[bool
 
     trashed_photo_ids: list[str] = []
     try:
-        spreadsheet = client.open(WORK_LOG_SPREADSHEET_NAME)
+        spreadsheet = _open_spreadsheet_cached(client, WORK_LOG_SPREADSHEET_NAME)
         ws, history_ws = _worklog_ensure_sheets(spreadsheet)
         record, target_row, headers = _worklog_get_record_row(ws, record_id)
         if not record or target_row is None:
@@ -5589,11 +8937,14 @@ def delete_work_log(record_id: str, auth_user: dict | None = None) -> tuple[bool
         if not _worklog_record_owned_by(record, auth_user):
             return False, "본인이 작성한 기록만 삭제할 수 있습니다."
 
-        photo_ids = [
-            value.strip()
-            for value in str(record.get("사진파일ID목록", "") or "").split("|")
-            if value.strip()
-        ]
+        # 아직 업로드 대기 중인 사진은 대기함에서 지우고, 이미 올라간 것은 휴지통으로 보냅니다.
+        cancelled_photo_ids = set(_worklog_outbox_cancel_record(record_id))
+        # 취소 직전에 업로더가 실제 ID를 반영했을 수 있으므로 사진 목록은 취소 뒤에 다시 읽습니다.
+        record, target_row, headers = _worklog_get_record_row(ws, record_id)
+        if not record or target_row is None:
+            return False, "삭제할 기록을 찾지 못했습니다."
+        photo_ids, _photo_names, _pending_photo_count = _worklog_split_photo_ids(record.get("사진파일ID목록", ""))
+        photo_ids = [photo_id for photo_id in photo_ids if photo_id not in cancelled_photo_ids]
         if photo_ids:
             photo_ok, trashed_photo_ids, photo_error = _worklog_trash_drive_files(photo_ids)
             if not photo_ok:
@@ -5609,24 +8960,14 @@ def delete_work_log(record_id: str, auth_user: dict | None = None) -> tuple[bool
             "삭제자ID": str(auth_user.get("user_id", "") or "").strip(),
             "삭제자": str(auth_user.get("name", "") or "").strip(),
             "공개범위": _worklog_record_visibility(record),
-            "사진수": len(photo_ids),
+            "사진수": len(photo_ids) + len(cancelled_photo_ids),
         }
 
-        # 이력은 아래 행부터 지워 행번호 변화를 방지합니다.
-        history_values = history_ws.get_all_values()
-        if history_values:
-            history_headers = [str(value).strip() for value in history_values[0]]
-            if "기록ID" in history_headers:
-                id_index = history_headers.index("기록ID")
-                delete_rows = [
-                    row_no
-                    for row_no, row in enumerate(history_values[1:], start=2)
-                    if id_index < len(row) and str(row[id_index]).strip() == record_id
-                ]
-                for row_no in reversed(delete_rows):
-                    history_ws.delete_rows(row_no)
+        # 이력은 기록ID 색인으로 찾은 행을 연속 구간별로 묶어 한 번에 지웁니다.
+        _worklog_delete_history_rows(history_ws, record_id)
 
         ws.delete_rows(target_row)
+        _worklog_table_note_delete(record_id)
 
         audit_warning = ""
         try:
@@ -5639,8 +8980,12 @@ def delete_work_log(record_id: str, auth_user: dict | None = None) -> tuple[bool
         except Exception as audit_error:
             audit_warning = f" · 삭제 감사기록 저장 경고: {audit_error}"
 
-        return True, f"WORK LOG 1건을 삭제했습니다. 연결 사진 {len(photo_ids)}장은 Drive 휴지통으로 이동했습니다.{audit_warning}"
+        return True, (
+            f"WORK LOG 1건을 삭제했습니다. 연결 사진 {len(photo_ids) + len(cancelled_photo_ids)}장은 "
+            f"Drive 휴지통으로 이동했습니다.{audit_warning}"
+        )
     except Exception as error:
+        _forget_stale_sheet_handles(error, spreadsheet_name=WORK_LOG_SPREADSHEET_NAME)
         # 본문 삭제가 실패했는데 사진만 휴지통으로 간 경우 자동 복원합니다.
         if trashed_photo_ids:
             _worklog_restore_drive_files(trashed_photo_ids)
@@ -5657,6 +9002,9 @@ def _worklog_reset_entry_widgets() -> None:
         "worklog_station_search_notice", "worklog_station_search_applied",
         "worklog_items_confirmed_notice", "worklog_visibility",
     ]
+    for key in list(st.session_state.keys()):
+        if str(key).startswith("worklog_photo_queue_") and isinstance(st.session_state.get(key), list):
+            _worklog_drop_photo_queue(key)
     for key in keys:
         if key in st.session_state:
             del st.session_state[key]
@@ -5682,6 +9030,10 @@ def _worklog_reset_entry_widgets() -> None:
             del st.session_state[key]
 
 
+# 재시작 전에 남은 제출 대기열과 사진 대기함은 첫 화면 요청과 함께 바로 이어서 전송합니다.
+_write_behind_worker()
+_worklog_photo_outbox_worker()
+
 # ==========================================
 # 9. 메인 화면 및 탭 구성
 # ==========================================
@@ -6847,7 +10199,7 @@ with tab_worklog:
         if refresh_worklog:
             with st.spinner("Google Sheets에서 MY WORK LOG를 불러오는 중입니다..."):
                 try:
-                    st.session_state["worklog_df"] = load_work_logs(auth_user)
+                    st.session_state["worklog_df"] = load_work_logs(auth_user, force=True)
                     st.session_state["worklog_loaded_at"] = _korea_now().strftime("%Y-%m-%d %H:%M:%S")
                     st.session_state["worklog_selected_id"] = ""
                     st.session_state["worklog_selected_ui_key"] = ""
@@ -7146,7 +10498,7 @@ with tab_worklog:
                         key=entry_key("photo_queue_clear"),
                         use_container_width=True,
                     ):
-                        st.session_state[worklog_photo_queue_key] = []
+                        _worklog_drop_photo_queue(worklog_photo_queue_key)
                         st.session_state.pop(worklog_raw_receipt_key, None)
                         st.session_state.pop(worklog_health_key, None)
                         st.rerun()
@@ -7234,12 +10586,11 @@ with tab_worklog:
                 "Drive 폴더는 공개하지 않고 이 화면에서만 조회·다운로드합니다."
             )
 
-            selected_photo_ids = [
-                v.strip() for v in str(selected.get("사진파일ID목록", "") or "").split("|") if v.strip()
-            ]
-            selected_photo_names = [
-                v.strip() for v in str(selected.get("사진파일명목록", "") or "").split("|") if v.strip()
-            ]
+            selected_photo_ids, selected_photo_names, selected_pending_count = _worklog_split_photo_ids(
+                selected.get("사진파일ID목록", ""), selected.get("사진파일명목록", "")
+            )
+            if selected_pending_count:
+                st.info(f"📤 사진 {selected_pending_count}장은 업로드 대기 중입니다. 전송이 끝나면 이곳에 표시됩니다.")
 
             photo_payloads = []
             failed_photo_count = 0
@@ -7252,67 +10603,53 @@ with tab_worklog:
             safe_writer = re.sub(r"[^0-9A-Za-z가-힣_-]", "_", writer_for_name)[:30] or "현장"
             safe_item = re.sub(r"[^0-9A-Za-z가-힣_-]", "_", item_for_name)[:30] or "현장사진"
 
-            for photo_index, file_id in enumerate(selected_photo_ids, 1):
-                photo_bytes = _worklog_download_drive_image(file_id)
-                if not photo_bytes:
-                    failed_photo_count += 1
-                    continue
-                download_name = f"{safe_local}_{safe_item}_{safe_writer}_{saved_for_name}_{photo_index:02d}.jpg"
-                stored_name = selected_photo_names[photo_index - 1] if photo_index - 1 < len(selected_photo_names) else download_name
-                photo_payloads.append({
-                    "index": photo_index,
-                    "id": file_id,
-                    "bytes": photo_bytes,
-                    "download_name": download_name,
-                    "stored_name": stored_name,
-                })
-
-            if photo_payloads:
-                st.caption(f"첨부사진 {len(selected_photo_ids)}장 · 전체 보기 및 개별/일괄 다운로드")
+            photo_caption_slot = st.empty()
+            if selected_photo_ids:
                 photo_cols = st.columns(2)
-                for payload_pos, payload in enumerate(photo_payloads):
-                    with photo_cols[payload_pos % 2]:
+                photo_slots = [photo_cols[pos % 2].empty() for pos in range(len(selected_photo_ids))]
+                for position, file_id, thumbnail in _worklog_iter_drive_photos(selected_photo_ids, variant="thumb"):
+                    photo_index = position + 1
+                    if not thumbnail:
+                        failed_photo_count += 1
+                        continue
+                    download_name = f"{safe_local}_{safe_item}_{safe_writer}_{saved_for_name}_{photo_index:02d}.jpg"
+                    stored_name = selected_photo_names[position] or download_name
+                    photo_payloads.append({
+                        "index": photo_index,
+                        "id": file_id,
+                        "download_name": download_name,
+                        "stored_name": stored_name,
+                    })
+                    with photo_slots[position].container():
                         st.image(
-                            payload["bytes"],
-                            caption=f"사진 {payload['index']} / {len(selected_photo_ids)}",
+                            thumbnail,
+                            caption=f"사진 {photo_index} / {len(selected_photo_ids)}",
                             use_container_width=True,
                         )
-                        st.download_button(
-                            "📥 사진 다운로드",
-                            data=payload["bytes"],
-                            file_name=payload["download_name"],
-                            mime="image/jpeg",
-                            use_container_width=True,
-                            key=f"worklog_photo_download_{selected_id}_{payload['index']}",
+                        _worklog_render_original_download(
+                            file_id,
+                            download_name,
+                            f"worklog_photo_download_{selected_id}_{photo_index}",
                         )
+                photo_payloads.sort(key=lambda payload: payload["index"])
 
-                try:
-                    from io import BytesIO
-                    import zipfile
-
-                    zip_buffer = BytesIO()
-                    with zipfile.ZipFile(zip_buffer, "w", compression=zipfile.ZIP_DEFLATED) as photo_zip:
-                        for payload in photo_payloads:
-                            photo_zip.writestr(payload["download_name"], payload["bytes"])
-                    zip_file_name = f"{safe_local}_WORK_LOG_{saved_for_name}_사진{len(photo_payloads)}장.zip"
-                    st.download_button(
-                        f"📦 사진 {len(photo_payloads)}장 전체 ZIP 다운로드",
-                        data=zip_buffer.getvalue(),
-                        file_name=zip_file_name,
-                        mime="application/zip",
-                        use_container_width=True,
-                        type="primary",
-                        key=f"worklog_photo_zip_{selected_id}",
-                    )
-                except Exception as zip_error:
-                    st.warning(f"사진 ZIP 파일을 만들지 못했습니다. 개별 다운로드를 이용해 주세요. ({zip_error})")
+            if photo_payloads:
+                photo_caption_slot.caption(f"첨부사진 {len(selected_photo_ids)}장 · 전체 보기 및 개별/일괄 다운로드")
+
+                _worklog_render_photo_zip_download(
+                    f"worklog:{selected_id}",
+                    [(payload["id"], payload["download_name"]) for payload in photo_payloads],
+                    f"{safe_local}_WORK_LOG_{saved_for_name}_사진{{count}}장.zip",
+                    f"worklog_photo_zip_{selected_id}",
+                    primary=True,
+                )
 
                 if failed_photo_count:
                     st.warning(f"첨부사진 중 {failed_photo_count}장은 현재 읽을 수 없어 표시하지 못했습니다.")
             elif selected_photo_ids:
-                st.warning("첨부사진 정보는 있으나 현재 사진 파일을 읽을 수 없습니다. Drive 읽기 권한을 확인해 주세요.")
+                photo_caption_slot.warning("첨부사진 정보는 있으나 현재 사진 파일을 읽을 수 없습니다. Drive 읽기 권한을 확인해 주세요.")
             else:
-                st.info("이 기록에는 첨부된 현장사진이 없습니다.")
+                photo_caption_slot.info("이 기록에는 첨부된 현장사진이 없습니다.")
 
             # V22 FIELD-SAFE: 기록 소유자는 현장에서 누락된 사진을 나중에 상세·조치에서 추가할 수 있습니다.
             is_owner = _worklog_record_owned_by(selected, auth_user)
@@ -7393,7 +10730,7 @@ with tab_worklog:
                             key=f"worklog_detail_photo_clear_{selected_id}",
                             use_container_width=True,
                         ):
-                            st.session_state[detail_queue_key] = []
+                            _worklog_drop_photo_queue(detail_queue_key)
                             st.session_state.pop(detail_raw_receipt_key, None)
                             st.session_state.pop(detail_health_key, None)
                             st.rerun()
@@ -7406,7 +10743,7 @@ with tab_worklog:
                         with st.spinner("기존 기록에 현장사진을 추가하고 있습니다..."):
                             add_ok, add_message = append_work_log_photos(selected_id, auth_user, detail_photos)
                         if add_ok:
-                            st.session_state[detail_queue_key] = []
+                            _worklog_drop_photo_queue(detail_queue_key)
                             st.session_state.pop(detail_raw_receipt_key, None)
                             st.session_state.pop(detail_health_key, None)
                             st.session_state["worklog_df"] = load_work_logs(auth_user)
@@ -7617,6 +10954,7 @@ with tab_worklog:
                     if display_logs.empty:
                         st.warning("조건에 맞는 WORK LOG가 없습니다.")
                     else:
+                        outbox_failures = _worklog_outbox_record_failures()
                         for display_pos, (_, log) in enumerate(display_logs.head(12).iterrows(), start=1):
                             record_id = str(log.get("기록ID", "")).strip()
                             saved_for_key = str(log.get("저장일시", "") or "").strip()
@@ -7637,7 +10975,7 @@ with tab_worklog:
                             privacy_value = _worklog_record_visibility(log)
                             privacy_class = "private" if privacy_value == "비공개" else "public"
                             privacy_text = "🔒 나만 보기" if privacy_value == "비공개" else "🌐 팀 공유"
-                            photo_ids = [v for v in str(log.get("사진파일ID목록", "")).split("|") if v.strip()]
+                            photo_ids, _photo_names, pending_photo_count = _worklog_split_photo_ids(log.get("사진파일ID목록", ""))
 
                             st.markdown(
                                 f'<div class="worklog-card">'
@@ -7654,13 +10992,25 @@ with tab_worklog:
                             if photo_ids:
                                 thumbnail_ids = photo_ids[:4]
                                 thumb_cols = st.columns(len(thumbnail_ids))
-                                for photo_index, file_id in enumerate(thumbnail_ids):
-                                    with thumb_cols[photo_index]:
-                                        photo_bytes = _worklog_download_drive_image(file_id)
-                                        if photo_bytes:
-                                            st.image(photo_bytes, use_container_width=True)
+                                thumb_slots = [thumb_col.empty() for thumb_col in thumb_cols]
+                                for photo_index, _file_id, photo_bytes in _worklog_iter_drive_photos(thumbnail_ids, variant="thumb"):
+                                    if photo_bytes:
+                                        thumb_slots[photo_index].image(photo_bytes, use_container_width=True)
                                 if len(photo_ids) > 4:
                                     st.caption(f"📷 사진 {len(photo_ids)}장 · 화면에는 처음 4장만 미리보기")
+                            failed_photo_count = outbox_failures.get(record_id, 0) if record_id else 0
+                            if pending_photo_count > failed_photo_count:
+                                st.caption(f"📤 사진 {pending_photo_count - failed_photo_count}장 업로드 대기(자동 전송)")
+                            if failed_photo_count and _worklog_record_owned_by(log, auth_user):
+                                fail_c1, fail_c2 = st.columns([3, 1])
+                                fail_c1.warning(
+                                    f"⚠️ 사진 {failed_photo_count}장을 Drive에 올리지 못했습니다. "
+                                    "사진은 서버에 보관 중이며 다시 보낼 수 있습니다."
+                                )
+                                if fail_c2.button("다시 보내기", key=f"worklog_photo_retry_{ui_record_key}", use_container_width=True):
+                                    # 다시 보낼 사진은 대기 상태로 돌아가 다음 화면부터 '업로드 대기'로 표시됩니다.
+                                    worklog_photo_outbox_retry(record_id)
+                                    st.rerun()
 
                             action_c1, action_c2 = st.columns(2)
                             with action_c1:
@@ -8697,7 +12047,7 @@ with tab_power:
                     key="power_photo_queue_clear",
                     use_container_width=True,
                 ):
-                    st.session_state[power_photo_queue_key] = []
+                    _worklog_drop_photo_queue(power_photo_queue_key)
                     st.session_state.pop(power_raw_receipt_key, None)
                     st.session_state.pop(power_health_key, None)
                     st.rerun()
@@ -8887,6 +12237,13 @@ with tab_doc:
                 help="Gemini API의 Google Search Grounding을 우선 시도합니다. 패키지/계정에서 지원되지 않으면 일반 분석으로 대체됩니다."
             )
 
+            regenerate_legal = st.checkbox(
+                "♻️ 이전 분석 결과를 쓰지 않고 새로 생성",
+                value=False,
+                key="cur1_regenerate",
+                help="같은 파일·옵션으로 분석한 결과가 있으면 기본적으로 재사용합니다. 검색 보강을 켜면 항상 새로 분석합니다."
+            )
+
             if st.button("🚀 법률 리스크 분석 시작", use_container_width=True, key="cur1_run"):
                 if not uploaded_file:
                     st.warning("⚠️ 먼저 파일을 업로드해주세요.")
@@ -8895,14 +12252,29 @@ with tab_doc:
                     if not content:
                         st.error("❌ 파일에서 텍스트를 추출하지 못했습니다. 스캔 PDF인 경우 OCR 처리 후 다시 업로드해 주세요.")
                     else:
-                        with st.spinner("🧠 법률·컴플라이언스 관점에서 심층 분석 중입니다..."):
-                            try:
-                                prompt = build_legal_review_prompt(content, analysis_depth, doc_type, focus_area, company_position)
-                                response, grounded, warning = generate_ai_response(prompt, task="legal", use_search=use_search, temperature=0.15)
-                                st.success("✅ 분석 완료")
-                                render_ai_response(response, grounded=grounded, warning=warning)
-                            except Exception as e:
-                                st.error(f"오류: {e}")
+                        try:
+                            with st.spinner("🧠 법률·컴플라이언스 관점에서 심층 분석 중입니다..."):
+                                content, _chunk_count = condense_long_document(
+                                    content, "legal", 55000, task="legal",
+                                    context=f"문서 유형: {doc_type} / 회사 입장: {company_position} / 중점 검토: {focus_area}",
+                                    refresh_cache=regenerate_legal,
+                                )
+                                fitted, budget_decisions = assemble_prompt_sections(
+                                    "legal",
+                                    [{"name": "content", "label": "검토 문서", "text": content, "priority": 1}],
+                                    fixed_text=build_legal_review_prompt("", analysis_depth, doc_type, focus_area, company_position),
+                                    model=get_model(task="legal", temperature=0.15),
+                                )
+                                prompt = build_legal_review_prompt(fitted["content"], analysis_depth, doc_type, focus_area, company_position)
+                                response, grounded, warning = generate_ai_response(
+                                    prompt, task="legal", use_search=use_search, temperature=0.15, stream=True,
+                                    use_cache=True, refresh_cache=regenerate_legal,
+                                )
+                            render_prompt_budget("legal", budget_decisions)
+                            render_ai_response(response, grounded=grounded, warning=warning, stream=True)
+                            st.success("✅ 분석 완료")
+                        except Exception as e:
+                            st.error(f"오류: {e}")
 
         with cur2:
             st.markdown("#### 🔍 감사보고서 작성·검증")
@@ -8979,6 +12351,12 @@ with tab_doc:
                     key="cur2_tone"
                 )
             case_scope = st.text_area("사건 개요 요약 — 무엇을/언제/누가/어떤 경위로", height=120, key="cur2_scope")
+            regenerate_report = st.checkbox(
+                "♻️ 이전 결과를 쓰지 않고 새로 생성",
+                value=False,
+                key="cur2_regenerate",
+                help="같은 자료·옵션으로 처리한 결과가 있으면 기본적으로 재사용합니다."
+            )
 
             if st.button("🧠 감사보고서 AI 실행", use_container_width=True, key="cur2_run"):
                 materials = []
@@ -8989,11 +12367,10 @@ with tab_doc:
                         if transcript_text:
                             materials.append(f"[면담 녹취/메모]\n{transcript_text}")
                     if evidence_files:
-                        materials.append("[조사·증거 자료]\n" + read_multiple_files(evidence_files))
+                        materials.append("[조사·증거 자료]\n" + read_multiple_files(evidence_files, max_each=None))
                     if interview_audio:
-                        audio_file = process_media_file(interview_audio)
-                        if audio_file:
-                            materials.append("[면담 음성 파일]\nAI 업로드 파일이 함께 전달됩니다.")
+                        # 음성 업로드는 캐시를 확인한 뒤 생성 직전에 한 번만 합니다.
+                        materials.append("[면담 음성 파일]\nAI 업로드 파일이 함께 전달됩니다.")
                 else:
                     if draft_text.strip():
                         materials.append("[검증 대상 보고서 - 붙여넣기]\n" + draft_text.strip())
@@ -9002,8 +12379,8 @@ with tab_doc:
                         if extracted:
                             materials.append("[검증 대상 보고서 - 파일]\n" + extracted)
 
-                regulations_text = read_multiple_files(regulations) if regulations else ""
-                refs_text = read_multiple_files(reference_reports) if reference_reports else ""
+                regulations_text = read_multiple_files(regulations, max_each=None) if regulations else ""
+                refs_text = read_multiple_files(reference_reports, max_each=12000) if reference_reports else ""
                 materials_text = "\n\n".join(materials).strip()
 
                 if not case_title.strip():
@@ -9011,22 +12388,51 @@ with tab_doc:
                 elif not case_scope.strip() and not materials_text:
                     st.warning("⚠️ 사건 개요 또는 감사 자료 중 하나 이상은 입력해야 합니다.")
                 else:
-                    with st.spinner("📑 감사보고서 품질 기준에 맞춰 처리 중입니다..."):
-                        try:
-                            prompt = build_audit_report_prompt(mode, case_title, case_scope, report_tone, materials_text, regulations_text, refs_text)
+                    try:
+                        with st.spinner("📑 감사보고서 품질 기준에 맞춰 처리 중입니다..."):
+                            report_context = f"작업 모드: {mode} / 사건명: {case_title}"
+                            materials_text, _chunk_count = condense_long_document(
+                                materials_text, "report", 50000, task="report",
+                                context=report_context, refresh_cache=regenerate_report,
+                            )
+                            regulations_text, _chunk_count = condense_long_document(
+                                regulations_text, "regulation", 25000, task="report",
+                                context=report_context, refresh_cache=regenerate_report,
+                            )
+                            fitted, budget_decisions = assemble_prompt_sections(
+                                "report",
+                                [
+                                    {"name": "materials", "label": "감사 자료", "text": materials_text, "priority": 1, "min_tokens": 24000},
+                                    {"name": "regulations", "label": "회사 규정/판단 기준", "text": regulations_text, "priority": 2, "min_tokens": 8000},
+                                    {"name": "refs", "label": "참고 보고서 형식", "text": refs_text, "priority": 3, "min_tokens": 3000},
+                                ],
+                                fixed_text=build_audit_report_prompt(mode, case_title, case_scope, report_tone, "", "", ""),
+                                model=get_model(task="report", temperature=0.12),
+                            )
+                            prompt = build_audit_report_prompt(
+                                mode, case_title, case_scope, report_tone,
+                                fitted["materials"], fitted["regulations"], fitted["refs"],
+                            )
                             if is_draft_mode and interview_audio:
-                                # 음성 파일이 있는 경우 멀티모달 입력을 시도합니다.
-                                audio_file = process_media_file(interview_audio)
-                                if audio_file:
-                                    response, grounded, warning = generate_ai_response([prompt, audio_file], task="report", use_search=False, temperature=0.12)
+                                # 같은 자료·음성으로 만든 결과가 있으면 음성을 올리지 않고 재사용합니다.
+                                audio_ref = _AIMediaRef(interview_audio)
+                                cached_report = None if regenerate_report else lookup_ai_response_cache(
+                                    [prompt, audio_ref], task="report", temperature=0.12
+                                )
+                                audio_file = None if cached_report else process_media_file(interview_audio)
+                                if cached_report:
+                                    response, grounded, warning = cached_report, False, None
+                                elif audio_file:
+                                    response, grounded, warning = generate_ai_response([prompt, audio_file], task="report", use_search=False, temperature=0.12, stream=True, use_cache=True, refresh_cache=regenerate_report, cache_content=[prompt, audio_ref])
                                 else:
-                                    response, grounded, warning = generate_ai_response(prompt, task="report", use_search=False, temperature=0.12)
+                                    response, grounded, warning = generate_ai_response(prompt, task="report", use_search=False, temperature=0.12, stream=True, use_cache=True, refresh_cache=regenerate_report)
                             else:
-                                response, grounded, warning = generate_ai_response(prompt, task="report", use_search=False, temperature=0.12)
-                            st.success("✅ 처리 완료")
-                            render_ai_response(response, grounded=grounded, warning=warning)
-                        except Exception as e:
-                            st.error(f"오류: {e}")
+                                response, grounded, warning = generate_ai_response(prompt, task="report", use_search=False, temperature=0.12, stream=True, use_cache=True, refresh_cache=regenerate_report)
+                        render_prompt_budget("report", budget_decisions)
+                        render_ai_response(response, grounded=grounded, warning=warning, stream=True)
+                        st.success("✅ 처리 완료")
+                    except Exception as e:
+                        st.error(f"오류: {e}")
 
 # --- [Tab 3: AI 에이전트] ---
 with tab_chat:
@@ -9066,20 +12472,26 @@ with tab_chat:
         if send_btn and user_input:
             history_before = st.session_state.messages.copy()
             st.session_state.messages.append({"role": "user", "content": user_input})
-            with st.spinner("답변 생성 중..."):
-                try:
+            try:
+                with st.spinner("답변 생성 중..."):
                     prompt = build_chat_prompt(user_input, history_before, chat_mode)
-                    response, grounded, warning = generate_ai_response(prompt, task="chat", use_search=use_chat_search, temperature=0.2)
-                    answer = _extract_response_text(response) or "응답을 생성하지 못했습니다."
-                    sources = _extract_grounding_sources(response)
-                    if grounded and sources:
-                        src_text = "\n\n---\n**참고 출처**\n" + "\n".join([f"- [{s['title']}]({s['uri']})" for s in sources])
-                        answer += src_text
-                    elif warning:
-                        answer += "\n\nℹ️ 검색 보강 호출이 실패하여 일반 AI 답변으로 대체되었습니다."
-                    st.session_state.messages.append({"role": "assistant", "content": answer})
-                except Exception as e:
-                    st.error(f"오류: {e}")
+                    response, grounded, warning = generate_ai_response(prompt, task="chat", use_search=use_chat_search, temperature=0.2, stream=True)
+                # 생성 중에는 임시 말풍선에 조각을 표시하고, 완료 후에는 대화 목록이 같은 답변을 다시 그립니다.
+                live_answer = st.empty()
+                sources: list[dict] = []
+                with live_answer.container():
+                    with st.chat_message("assistant"):
+                        answer = _stream_ai_response(response, sources)
+                live_answer.empty()
+                answer = answer or "응답을 생성하지 못했습니다."
+                if grounded and sources:
+                    src_text = "\n\n---\n**참고 출처**\n" + "\n".join([f"- [{s['title']}]({s['uri']})" for s in sources])
+                    answer += src_text
+                elif warning:
+                    answer += "\n\nℹ️ 검색 보강 호출이 실패하여 일반 AI 답변으로 대체되었습니다."
+                st.session_state.messages.append({"role": "assistant", "content": answer})
+            except Exception as e:
+                st.error(f"오류: {e}")
 
         for msg in reversed(st.session_state.messages):
             with st.chat_message(msg["role"]):
@@ -9116,9 +12528,16 @@ with tab_summary:
             value=("URL" in st_type),
             key="summary_search"
         )
+        regenerate_summary = st.checkbox(
+            "♻️ 이전 요약을 쓰지 않고 새로 생성",
+            value=False,
+            key="summary_regenerate",
+            help="같은 자료·옵션으로 요약한 결과가 있으면 기본적으로 재사용합니다. 검색 보강을 켜면 항상 새로 요약합니다."
+        )
 
         final_input = None
         is_multimodal = False
+        media_upload = None
         source_hint = "직접 입력"
 
         if "URL" in st_type:
@@ -9142,7 +12561,8 @@ with tab_summary:
             mf = st.file_uploader("파일 업로드", type=["mp3", "wav", "mp4"])
             source_hint = getattr(mf, "name", "미디어 파일") if mf else "미디어 파일"
             if mf:
-                final_input = process_media_file(mf)
+                # 업로드는 요약 실행 시 캐시를 확인한 뒤에만 합니다(재실행마다 올리지 않음).
+                final_input = media_upload = mf
                 is_multimodal = True
         else:
             final_input = st.text_area("텍스트 입력", height=230)
@@ -9150,18 +12570,45 @@ with tab_summary:
 
         if st.button("⚡ 요약 실행", use_container_width=True):
             if final_input:
-                with st.spinner("요약 중..."):
-                    try:
+                try:
+                    budget_decisions = []
+                    with st.spinner("요약 중..."):
                         if is_multimodal:
                             prompt = build_summary_prompt(summary_mode, output_style, source_hint, "첨부된 미디어 파일의 내용을 분석하세요.")
-                            response, grounded, warning = generate_ai_response([prompt, final_input], task="summary", use_search=False, temperature=0.18)
+                            if media_upload is not None:
+                                # 같은 파일·옵션으로 만든 요약이 있으면 파일을 올리지 않고 재사용합니다.
+                                media_ref = _AIMediaRef(media_upload)
+                                cached_summary = None if regenerate_summary else lookup_ai_response_cache(
+                                    [prompt, media_ref], task="summary", temperature=0.18
+                                )
+                                media_file = None if cached_summary else process_media_file(media_upload)
+                                if cached_summary:
+                                    response, grounded, warning = cached_summary, False, None
+                                elif media_file:
+                                    response, grounded, warning = generate_ai_response([prompt, media_file], task="summary", use_search=False, temperature=0.18, stream=True, use_cache=True, refresh_cache=regenerate_summary, cache_content=[prompt, media_ref])
+                                else:
+                                    raise RuntimeError("미디어 파일을 AI에 전달하지 못했습니다. 잠시 후 다시 시도해 주세요.")
+                            else:
+                                response, grounded, warning = generate_ai_response([prompt, final_input], task="summary", use_search=False, temperature=0.18, stream=True, use_cache=True, refresh_cache=regenerate_summary)
                         else:
-                            prompt = build_summary_prompt(summary_mode, output_style, source_hint, str(final_input))
-                            response, grounded, warning = generate_ai_response(prompt, task="summary", use_search=use_summary_search, temperature=0.18)
-                        st.success("✅ 요약 완료")
-                        render_ai_response(response, grounded=grounded, warning=warning)
-                    except Exception as e:
-                        st.error(f"오류: {e}")
+                            summary_body, _chunk_count = condense_long_document(
+                                str(final_input), "summary", 55000, task="summary",
+                                context=f"요약 모드: {summary_mode} / 출처: {source_hint}",
+                                refresh_cache=regenerate_summary,
+                            )
+                            fitted, budget_decisions = assemble_prompt_sections(
+                                "summary",
+                                [{"name": "body", "label": "요약 대상", "text": summary_body, "priority": 1}],
+                                fixed_text=build_summary_prompt(summary_mode, output_style, source_hint, ""),
+                                model=get_model(task="summary", temperature=0.18),
+                            )
+                            prompt = build_summary_prompt(summary_mode, output_style, source_hint, fitted["body"])
+                            response, grounded, warning = generate_ai_response(prompt, task="summary", use_search=use_summary_search, temperature=0.18, stream=True, use_cache=True, refresh_cache=regenerate_summary)
+                    render_prompt_budget("summary", budget_decisions)
+                    render_ai_response(response, grounded=grounded, warning=warning, stream=True)
+                    st.success("✅ 요약 완료")
+                except Exception as e:
+                    st.error(f"오류: {e}")
             else:
                 st.warning("⚠️ 요약할 URL, 파일 또는 텍스트를 입력해 주세요.")
 
@@ -9184,6 +12631,53 @@ with tab_admin:
     </div>
     """, unsafe_allow_html=True)
 
+    with st.expander("🛠 정밀점검 시트 스키마 점검 (배포 후 1회)", expanded=False):
+        st.caption(
+            "열 순서 재배열·헤더 서식 적용은 저장할 때마다 하지 않고 이 버튼 또는 첫 저장 시 1회만 실행합니다. "
+            f"현재 스키마 버전: v{POWER_INSPECTION_SCHEMA_VERSION}"
+        )
+        if st.button("스키마 점검·재배열 실행", use_container_width=True, key="power_admin_schema_migrate"):
+            with st.spinner("정밀점검 시트의 열 순서와 헤더를 점검하는 중입니다..."):
+                schema_ok, schema_message = migrate_power_inspection_sheet_schema()
+            if schema_ok:
+                st.success(schema_message)
+            else:
+                st.error(schema_message)
+
+    with st.expander("📮 서약·교육 제출 대기열", expanded=False):
+        queue_status = write_behind_queue_status()
+        if queue_status["pending"]:
+            for queued_sheet, queued_count in queue_status["pending"].items():
+                st.write(f"- {queued_sheet}: 시트 반영 대기 {queued_count:,}건")
+        else:
+            st.caption("시트에 반영되지 않은 제출 건이 없습니다.")
+        if queue_status["last_flush_at"]:
+            st.caption(f"마지막 반영: {queue_status['last_flush_at']} · 재시도 중 {queue_status['retrying']:,}건")
+        if queue_status["last_error"]:
+            st.warning(f"최근 전송 오류: {queue_status['last_error']}")
+
+    with st.expander("📤 현장사진 업로드 대기함", expanded=False):
+        outbox_status = worklog_photo_outbox_status()
+        if outbox_status["jobs"]:
+            st.write(
+                f"- 대기 기록 {outbox_status['jobs']:,}건 · 전송 대기 사진 {outbox_status['pending_photos']:,}장"
+                f" · 전송 실패 사진 {outbox_status['failed_photos']:,}장"
+            )
+        else:
+            st.caption("Drive 전송을 기다리는 사진이 없습니다.")
+        if outbox_status["last_flush_at"]:
+            st.caption(f"마지막 완료: {outbox_status['last_flush_at']}")
+        if outbox_status["last_error"]:
+            st.warning(f"최근 전송 오류: {outbox_status['last_error']}")
+
+    with st.expander("🌐 외부 연결 지연 현황 (Apps Script · Drive)", expanded=False):
+        latency_rows = http_latency_snapshot()
+        if latency_rows:
+            st.dataframe(pd.DataFrame(latency_rows), use_container_width=True, hide_index=True)
+            st.caption("이 서버 프로세스가 시작된 이후의 누적값이며, p50/p95는 엔드포인트별 최근 50회 기준입니다.")
+        else:
+            st.caption("아직 기록된 외부 연결 호출이 없습니다.")
+
     if "power_admin_df" not in st.session_state:
         st.session_state["power_admin_df"] = None
     if "power_admin_loaded_at" not in st.session_state:
@@ -9197,9 +12691,9 @@ with tab_admin:
         if not client:
             raise RuntimeError("Google Sheets 연결 실패: Streamlit Secrets와 서비스 계정 권한을 확인하세요.")
 
-        spreadsheet = client.open(POWER_INSPECTION_SPREADSHEET_NAME)
+        spreadsheet = _open_spreadsheet_cached(client, POWER_INSPECTION_SPREADSHEET_NAME)
         try:
-            worksheet = spreadsheet.worksheet(POWER_INSPECTION_SHEET_NAME)
+            worksheet = _get_worksheet_cached(spreadsheet, POWER_INSPECTION_SHEET_NAME)
         except Exception:
             return pd.DataFrame(columns=POWER_INSPECTION_HEADERS)
 
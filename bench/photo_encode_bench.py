@@ -0,0 +1,144 @@
+"""현장사진 JPEG 인코더 마이크로 벤치마크.
+
+app.py의 현재 인코더(_worklog_encode_jpeg_to_target: 품질 이분 탐색 + 초과 비율 기반 1회 축소)와
+이전 방식(품질 7단계 × 0.86배 축소 4회를 모두 optimize/progressive로 인코딩)을 같은 샘플 사진으로 비교합니다.
+
+app.py는 Streamlit 스크립트라 import하면 화면 코드까지 실행되므로, 인코더 함수와 관련 상수만 소스에서
+읽어 와 실행합니다. 따라서 app.py의 인코더를 고치면 별도 수정 없이 바뀐 코드가 측정됩니다.
+
+사용법:
+    python bench/photo_encode_bench.py                 # bench/samples/의 사진 (없으면 assets/*.png)
+    python bench/photo_encode_bench.py a.jpg b.heic    # 지정한 사진
+    python bench/photo_encode_bench.py --repeat 5
+
+휴대폰 원본 사진을 bench/samples/에 넣어 두면 같은 사진 묶음으로 변경 전후를 비교할 수 있습니다.
+"""
+
+import argparse
+import ast
+import glob
+import os
+import statistics
+import time
+from io import BytesIO
+
+from PIL import Image, ImageOps
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_PATH = os.path.join(REPO_ROOT, "app.py")
+SAMPLE_DIR = os.path.join(REPO_ROOT, "bench", "samples")
+SAMPLE_PATTERNS = ("*.jpg", "*.jpeg", "*.png", "*.heic", "*.heif", "*.webp")
+
+APP_FUNCTIONS = ("_worklog_encode_jpeg", "_worklog_search_jpeg_quality", "_worklog_encode_jpeg_to_target")
+APP_CONSTANT_PREFIXES = ("WORK_LOG_JPEG_", "WORK_LOG_IMAGE_")
+
+
+def load_app_encoder() -> dict:
+    """app.py에서 인코더 함수와 WORK_LOG_JPEG_*/WORK_LOG_IMAGE_* 상수만 골라 실행한 이름공간을 반환합니다."""
+    with open(APP_PATH, "r", encoding="utf-8") as app_file:
+        source = app_file.read()
+    namespace: dict = {}
+    for node in ast.parse(source).body:
+        if isinstance(node, ast.Assign) and any(
+            isinstance(target, ast.Name) and target.id.startswith(APP_CONSTANT_PREFIXES) for target in node.targets
+        ):
+            exec(compile(ast.Module([node], []), APP_PATH, "exec"), namespace)
+        elif isinstance(node, ast.FunctionDef) and node.name in APP_FUNCTIONS:
+            exec(compile(ast.Module([node], []), APP_PATH, "exec"), namespace)
+    missing = [name for name in APP_FUNCTIONS if name not in namespace]
+    if missing:
+        raise SystemExit(f"app.py에서 인코더 함수를 찾지 못했습니다: {', '.join(missing)}")
+    return namespace
+
+
+def encode_legacy_loop(image, target_bytes: int, stats: dict) -> bytes:
+    """비교용 이전 방식입니다."""
+    working = image
+    best = b""
+    for _resize_round in range(4):
+        for quality in (84, 78, 72, 66, 60, 54, 48):
+            buffer = BytesIO()
+            working.save(buffer, format="JPEG", quality=quality, optimize=True, progressive=True)
+            stats["final"] = stats.get("final", 0) + 1
+            best = buffer.getvalue()
+            if len(best) <= target_bytes:
+                return best
+        working = working.resize(
+            (max(1, int(working.width * 0.86)), max(1, int(working.height * 0.86))),
+            Image.Resampling.LANCZOS,
+        )
+    return best
+
+
+def sample_paths(paths: list[str]) -> list[str]:
+    if paths:
+        return paths
+    found = sorted(path for pattern in SAMPLE_PATTERNS for path in glob.glob(os.path.join(SAMPLE_DIR, pattern)))
+    return found or sorted(glob.glob(os.path.join(REPO_ROOT, "assets", "*.png")))
+
+
+def prepare_image(path: str, max_side: int):
+    """app.py 수집 단계처럼 방향을 보정하고 긴 변을 max_side로 맞춘 RGB 이미지를 만듭니다."""
+    if path.lower().endswith((".heic", ".heif")):
+        from pillow_heif import register_heif_opener
+
+        register_heif_opener()
+    image = ImageOps.exif_transpose(Image.open(path))
+    if image.mode != "RGB":
+        image = image.convert("RGB")
+    if max(image.size) > max_side:
+        ratio = max_side / float(max(image.size))
+        image = image.resize((max(1, int(image.width * ratio)), max(1, int(image.height * ratio))), Image.Resampling.LANCZOS)
+    image.load()
+    return image
+
+
+def measure(encoder, image, repeat: int) -> tuple[dict, float, int]:
+    timings = []
+    stats: dict = {}
+    data = b""
+    for _ in range(repeat):
+        stats = {}
+        started = time.perf_counter()
+        data = encoder(image, stats)
+        timings.append((time.perf_counter() - started) * 1000.0)
+    return stats, statistics.median(timings), len(data or b"")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("paths", nargs="*", help="측정할 사진 경로 (기본: bench/samples/, 없으면 assets/*.png)")
+    parser.add_argument("--repeat", type=int, default=3, help="사진별 반복 횟수 (중앙값 사용)")
+    args = parser.parse_args()
+
+    app = load_app_encoder()
+    target = app["WORK_LOG_IMAGE_TARGET_BYTES"]
+    max_side = app["WORK_LOG_IMAGE_MAX_SIDE"]
+    encoders = (
+        ("현재", lambda image, stats: app["_worklog_encode_jpeg_to_target"](image, stats=stats)),
+        ("이전", lambda image, stats: encode_legacy_loop(image, target, stats)),
+    )
+
+    paths = sample_paths(args.paths)
+    if not paths:
+        raise SystemExit("측정할 사진이 없습니다. bench/samples/에 사진을 넣거나 경로를 지정해 주세요.")
+
+    print(f"목표 {target // 1024}KB · 긴 변 {max_side}px · 반복 {args.repeat}회(중앙값)")
+    print(f"{'사진':<32} {'방식':<4} {'인코딩(빠른/최종)':>16} {'시간(ms)':>10} {'크기(KB)':>10}")
+    totals = {label: [0.0, 0] for label, _encoder in encoders}
+    for path in paths:
+        image = prepare_image(path, max_side)
+        for label, encoder in encoders:
+            stats, elapsed_ms, size = measure(encoder, image, max(1, args.repeat))
+            totals[label][0] += elapsed_ms
+            totals[label][1] += stats.get("fast", 0) + stats.get("final", 0)
+            print(
+                f"{os.path.basename(path)[:32]:<32} {label:<4} "
+                f"{stats.get('fast', 0):>8}/{stats.get('final', 0):<7} {elapsed_ms:>10.1f} {size / 1024.0:>10.1f}"
+            )
+    for label, (elapsed_ms, encode_count) in totals.items():
+        print(f"[{label}] 사진당 평균 {elapsed_ms / len(paths):.1f}ms · 인코딩 {encode_count / len(paths):.1f}회")
+
+
+if __name__ == "__main__":
+    main()